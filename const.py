@@ -1,9 +1,45 @@
+import numpy as np
+
 from scipy.signal.windows import hann, hamming, bartlett, blackman
 from PySide6.QtCore import QSize
 
 
 TMP = '.tmp'
+SPILL = '.spill'
+MEMORY_BUDGET = 1024 * 2 ** 20
+EXPORT_FORMATS = ['png', 'svg', 'pdf', 'jpg']
+CATALOG = '.catalog.sqlite'
+CATALOG_EXTENSIONS = ['.csv', '.xlsx']
+CACHE_BYTES = 64 * 2 ** 20
+PRECISIONS = {
+    'Double': np.float64,
+    'Single': np.float32
+}
+FILTER_BLOCK = 2 ** 16
+ENVELOPE_BLOCK = 2 ** 20
+ORDER_CHUNK = 2 ** 20
+EVENT_CHUNK = 2 ** 20
+EVENT_DETECTION = {
+    'sta': 0.05,
+    'lta': 1.,
+    'on': 4.,
+    'off': 1.5,
+    'gap': 1.
+}
+FILTER_TYPES = {
+    'Low-pass': 'lowpass',
+    'High-pass': 'highpass',
+    'Band-pass': 'bandpass',
+    'Band-stop': 'bandstop'
+}
+FILTER_DESIGNS = {
+    'FIR': 'fir',
+    'Butterworth': 'butter',
+    'Chebyshev I': 'cheby1',
+    'Bessel': 'bessel'
+}
 SIZE = QSize(128, 24)
+STREAM_SOURCES = ['Generator', 'Stdin', 'Named pipe', 'TCP socket']
 
 
 WINDOWS = {
@@ -23,6 +59,31 @@ SPECTRAL_ANALYSIS = {
 }
 
 
+SELECTIVE_ANALYSIS = {
+    'Selective Amplitude': Input.get_selective_amplitude
+}
+
+
+CORRELATION_ANALYSIS = {
+    'Autocorrelation': Input.get_autocorrelation,
+    'Cepstrum': Input.get_cepstrum
+}
+
+
+ENVELOPE_ANALYSIS = {
+    'Envelope Spectrum': Input.envelope_spectrum
+}
+
+
+CROSS_ANALYSIS = {
+    'Cross Spectral Density': 'Pxy',
+    'Coherence': 'coherence',
+    'Phase': 'phase',
+    'H1 Transfer Function': 'H1',
+    'H2 Transfer Function': 'H2'
+}
+
+
 SOUND_ANALYSIS = {
     'Sound Pressure Level': Input.get_sound_pressure_level,
     'Sound Amplitude': Input.get_sound_amplitude
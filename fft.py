@@ -1,10 +1,12 @@
-from PySide6.QtWidgets import QApplication
-
-from gui.view import View
+import argparse
+import multiprocessing
 
 
 
 def gui():
+
+    from PySide6.QtWidgets import QApplication
+    from gui.view import View
     
     fft_app = QApplication()
 
@@ -14,6 +16,22 @@ def gui():
     fft_app.exec()
 
 
+def serve(host: str, port: int):
+
+    from server import AnalysisServer
+
+    AnalysisServer().run(host=host, port=port)
+
+
 if __name__ == "__main__":
 
-    gui()
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description='Fourier Transform')
+    parser.add_argument('--serve', action='store_true', help='run the HTTP analysis service instead of the GUI')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.host, args.port)
+    else:
+        gui()
@@ -1,17 +1,21 @@
 import os
 import sys
+import time
 import matplotlib
+import numpy as np
 
 
-from PySide6.QtCore import Qt, QSize, Slot
+from PySide6.QtCore import Qt, QSize, Slot, QTimer
 from PySide6.QtWidgets import (
     QDialog, QGridLayout, QDialogButtonBox, QLineEdit,
     QHBoxLayout, QLabel, QGroupBox, QComboBox,
-    QWidget, QCheckBox, QFormLayout
+    QWidget, QCheckBox, QFormLayout, QSpinBox,
+    QPushButton, QMessageBox, QTableWidget, QTableWidgetItem, QFileDialog
 )
 
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
+from scipy.fft import rfft
 
 
 DIR = os.path.abspath(os.path.join(
@@ -22,10 +26,27 @@ sys.path.append(DIR)
 matplotlib.use('Qt5Agg')
 
 
-from const import WINDOWS, SPECTRAL_ANALYSIS as SPECTRAL, SOUND_ANALYSIS as SOUND, TMP
+from const import (
+    WINDOWS, SPECTRAL_ANALYSIS as SPECTRAL, SOUND_ANALYSIS as SOUND,
+    SELECTIVE_ANALYSIS as SELECTIVE, CORRELATION_ANALYSIS as CORRELATION,
+    ENVELOPE_ANALYSIS as ENVELOPE,
+    CROSS_ANALYSIS as CROSS, TMP, STREAM_SOURCES, FILTER_TYPES, FILTER_DESIGNS, EVENT_DETECTION
+)
 from gui.widgets import *
+from gui.export import ExportQueue, render_image, file_name
 from models.data import Input
+from models.catalog import Catalog, Indexer
+from models.stream import (
+    Stream, GeneratorSource, StdinSource, PipeSource, SocketSource
+)
+
 
+def number(text: str, name: str) -> float:
+    # Validators let intermediate text such as '1e' or '-' through
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f'{name}: invalid value {text!r}')
 
 
 class NameEdit(QDialog):
@@ -76,10 +97,10 @@ class MpCanvas(FigureCanvasQTAgg):
              xlim=None, ylim=None, 
              xlabel=None, ylabel=None, 
              xtick=None, ytick=None,
-             title=None, linewidth=1.0):
+             title=None, linewidth=1.0, **style):
         
         self.ax.clear()
-        self.ax.plot(x, y, linewidth=linewidth)
+        self.ax.plot(x, y, linewidth=linewidth, **style)
         self.ax.grid(True)
         self.ax.set_title(title if title else 'Graph')
         if xlim:
@@ -95,6 +116,43 @@ class MpCanvas(FigureCanvasQTAgg):
         self.fig.canvas.draw()
         self.flush_events()
 
+    def annotate(self, x, y, labels, marker='v', color='tab:red'):
+        self.ax.plot(x, y, linestyle='', marker=marker, color=color)
+        for xi, yi, label in zip(x, y, labels):
+            self.ax.annotate(label, (xi, yi), textcoords='offset points',
+                             xytext=(0, 6), ha='center', fontsize=7)
+        self.fig.canvas.draw()
+        self.flush_events()
+
+    def image(self, image, extent, *, labels=None, xlabel=None, ylabel=None, title=None, clabel=None):
+        # One AxesImage for the whole array, rows drawn top to bottom
+        self.fig.clear()
+        self.ax = self.fig.add_subplot()
+        artist = self.ax.imshow(image, aspect='auto', origin='upper', interpolation='nearest', extent=extent)
+        if labels is not None and len(labels) <= 40:
+            step = (extent[2] - extent[3]) / len(labels)
+            self.ax.set_yticks(extent[3] + step * (np.arange(len(labels)) + 0.5), labels, fontsize=6)
+        self.fig.colorbar(artist, ax=self.ax, label=clabel)
+        self.ax.set_title(title if title else 'Graph')
+        self.ax.set_xlabel(xlabel if xlabel else 'X')
+        self.ax.set_ylabel(ylabel if ylabel else 'Y')
+        self.fig.canvas.draw()
+        self.flush_events()
+
+    def legend(self, labels, fontsize=6):
+        self.ax.legend(labels, fontsize=fontsize)
+        self.fig.canvas.draw()
+        self.flush_events()
+
+    def set_data(self, x, y):
+        if not self.ax.lines:
+            self.ax.plot(x, y, linewidth=1.0)
+        else:
+            self.ax.lines[0].set_data(x, y)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.fig.canvas.draw_idle()
+
     def save_fig(self, fname, dpi=600):
         self.fig.savefig(fname, dpi=dpi)
 
@@ -142,6 +200,51 @@ class InputLayout(QFormLayout):
         self._sub_mean = QCheckBox()
         self._sub_mean.setCheckState(Qt.CheckState.Unchecked)
 
+        self._filter = QComboBox()
+        self._filter.addItems(['Off'] + list(FILTER_TYPES.keys()))
+        self._filter.setFixedSize(size)
+
+        self._design = QComboBox()
+        self._design.addItems(FILTER_DESIGNS.keys())
+        self._design.setFixedSize(size)
+
+        self._order = QSpinBox()
+        self._order.setRange(1, 2 ** 16)
+        self._order.setValue(4)
+        self._order.setToolTip('Filter order, number of taps for FIR designs')
+        self._order.setFixedSize(QSize(96, 28))
+
+        self._cutoff = QLineEdit()
+        self._cutoff.setPlaceholderText('Cutoff, or low, high for bands')
+        self._cutoff.setValidator(QRegularExpressionValidator(QRegularExpression(r'[0-9eE.,\s+-]*')))
+        self._cutoff.setFixedSize(size)
+
+        self._zero_phase = QCheckBox()
+        self._zero_phase.setCheckState(Qt.CheckState.Checked)
+
+        self._decimation = QSpinBox()
+        self._decimation.setRange(1, 1000)
+        self._decimation.setSpecialValueText('Off')
+        self._decimation.setFixedSize(QSize(96, 28))
+
+        self._auto_decimation = QCheckBox()
+        self._auto_decimation.setCheckState(Qt.CheckState.Unchecked)
+        self._auto_decimation.toggled.connect(lambda: self.suggest(self._fmax))
+        self._fmax = 0.
+
+        self._trigger = QLineEdit()
+        self._trigger.setPlaceholderText(f"STA/LTA trigger ratio, {EVENT_DETECTION['on']:g}")
+        self._trigger.setValidator(QRegularExpressionValidator(QRegularExpression(r'[0-9]*.?[0-9]+')))
+        self._trigger.setFixedSize(size)
+
+        self._detect = QPushButton('Detect')
+        self._detect.setFixedSize(QSize(96, 28))
+        self._detect.clicked.connect(self.detect)
+
+        self._events = QComboBox()
+        self._events.setFixedSize(size)
+        self._events.activated.connect(self.select_event)
+
         self.addRow('Windows', self._windows)
         self.addRow('X label', self._xlabel)
         self.addRow('Y label', self._ylabel)
@@ -152,6 +255,16 @@ class InputLayout(QFormLayout):
         self.addRow(self._xminlb, self._xmin)
         self.addRow(self._xmaxlb, self._xmax)
         self.addRow('Subtrackt mean', self._sub_mean)
+        self.addRow('Filter', self._filter)
+        self.addRow('Filter design', self._design)
+        self.addRow('Order', self._order)
+        self.addRow('Cutoff frequencies', self._cutoff)
+        self.addRow('Zero phase', self._zero_phase)
+        self._decimationlb = QLabel('Decimation')
+        self.addRow(self._decimationlb, self._decimation)
+        self.addRow('Auto decimation', self._auto_decimation)
+        self.addRow('Event trigger', self._trigger)
+        self.addRow(self._detect, self._events)
 
     def sliderValueChanged(self, value):
         objectName = self.sender().objectName()
@@ -171,9 +284,66 @@ class InputLayout(QFormLayout):
             'xlabel': xlabel,
             'ylabel': ylabel,
             'xlim': (self._xmin.value(), self._xmax.value()),
-            'sub_mean': self._sub_mean.isChecked()
+            'sub_mean': self._sub_mean.isChecked(),
+            'filter': self.filter(),
+            'decimation': self._decimation.value()
         }
 
+    @Slot(float)
+    def suggest(self, fmax: float):
+        # Decimation factor that keeps the spectrum range of interest
+        self._fmax = fmax
+        q = Input.suggest_decimation(self.__model.dt, fmax)
+        self._decimationlb.setText(f'Decimation (suggested {q})')
+        if self._auto_decimation.isChecked():
+            self._decimation.setValue(q)
+
+    @Slot()
+    def detect(self):
+        # Event index of the whole record; picking an event crops to it
+        settings = dict(EVENT_DETECTION)
+        try:
+            if self._trigger.text():
+                settings['on'] = float(self._trigger.text())
+            settings['off'] = min(settings['off'], settings['on'])
+            events = self.__model.events(**settings)
+        except ValueError as er:
+            QMessageBox.warning(self.parentWidget(), 'Events', str(er), QMessageBox.StandardButton.Ok)
+            return None
+        self._events.clear()
+        for start, stop, ratio in events:
+            self._events.addItem(f'{start:.6g} ... {stop:.6g} (x{ratio:.1f})', (start, stop))
+        if not events:
+            self._events.addItem('No events')
+
+    @Slot(int)
+    def select_event(self, idx: int):
+        event = self._events.itemData(idx)
+        if not event:
+            return None
+        start, stop = event
+        # Half the event duration either side for context
+        pad = 0.5 * (stop - start)
+        x = self.__model._x
+        self._xmin.setValue(max(start - pad, x[0]))
+        self._xmax.setValue(min(stop + pad, x[-1]))
+
+    def filter(self):
+        if self._filter.currentText() not in FILTER_TYPES.keys():
+            return None
+        try:
+            cutoff = [float(f) for f in self._cutoff.text().split(',') if f.strip()]
+        except ValueError:
+            raise ValueError(f'Invalid cutoff frequencies: {self._cutoff.text()}')
+        if not cutoff:
+            return None
+        btype = FILTER_TYPES[self._filter.currentText()]
+        if btype in ('bandpass', 'bandstop') and len(cutoff) != 2:
+            raise ValueError(f'{self._filter.currentText()} filter needs low and high cutoff frequencies')
+        return (btype, FILTER_DESIGNS[self._design.currentText()],
+                self._order.value(), cutoff[0], cutoff[1] if len(cutoff) > 1 else None,
+                self._zero_phase.isChecked())
+
     def update(self):
         self.__model.update(**self.data())
 
@@ -190,7 +360,8 @@ class FFTLayout(QFormLayout):
         size = QSize(196, 28)
 
         self._analysis = QComboBox()
-        self._analysis.addItems(list(SPECTRAL.keys()) + list(SOUND.keys()))
+        self._analysis.addItems(list(SPECTRAL.keys()) + list(SOUND.keys()) + list(SELECTIVE.keys())
+                                + list(CORRELATION.keys()) + list(ENVELOPE.keys()))
         self._analysis.setFixedSize(size)
 
         self._xlabel = QLineEdit()
@@ -228,6 +399,22 @@ class FFTLayout(QFormLayout):
         self._ref_pressure.setText(str(2e-5))
         self._ref_pressure.setFixedSize(QSize(96, 28))
 
+        self._freqs = QLineEdit()
+        self._freqs.setPlaceholderText('Comma separated frequencies')
+        self._freqs.setValidator(QRegularExpressionValidator(QRegularExpression(r'[0-9eE.,\s+-]*')))
+        self._freqs.setFixedSize(size)
+
+        self._zoom = QSpinBox()
+        self._zoom.setRange(0, 10 ** 6)
+        self._zoom.setSingleStep(100)
+        self._zoom.setSpecialValueText('Off')
+        self._zoom.setFixedSize(QSize(96, 28))
+
+        self._peaks = QSpinBox()
+        self._peaks.setRange(0, 100)
+        self._peaks.setValue(5)
+        self._peaks.setFixedSize(QSize(96, 28))
+
         self.addRow('Plot', self._analysis)
         self.addRow('X label', self._xlabel)
         self.addRow('Y label', self._ylabel)
@@ -236,6 +423,9 @@ class FFTLayout(QFormLayout):
         self.addRow(self._xminlb, self._xmin)
         self.addRow(self._xmaxlb, self._xmax)
         self.addRow('Reference Pressure', self._ref_pressure)
+        self.addRow('Zoom points', self._zoom)
+        self.addRow('Peaks', self._peaks)
+        self.addRow('Target frequencies', self._freqs)
 
     @Slot(float)
     def sliderValueChanged(self, value):
@@ -256,7 +446,10 @@ class FFTLayout(QFormLayout):
             'xlabel': xlabel,
             'ylabel': ylabel,
             'xlim': (self._xmin.value(), self._xmax.value()),
-            'pref': self._ref_pressure.text()
+            'pref': number(self._ref_pressure.text(), 'Reference pressure'),
+            'peaks': self._peaks.value(),
+            'zoom': self._zoom.value(),
+            'freqs': [number(f, 'Target frequencies') for f in self._freqs.text().split(',') if f.strip()]
         }
 
 
@@ -267,8 +460,14 @@ class SignalEditor(QDialog):
 
         self.__in_signal = None
         self.__fft_signal = None
+        self.__peaks = None
+        self.__plots = {}
 
         self._input: Input = kwargs.get('input', None)
+        self._export: ExportQueue = kwargs.get('export', None) or ExportQueue(workers=0)
+        self._destination: str = kwargs.get('destination', None) or TMP
+        self._format: str = kwargs.get('fmt', 'png')
+        self._dpi: int = kwargs.get('dpi', 600)
         self.input = MpCanvas(self, width=5, height=4, dpi=100)
         self.fft= MpCanvas(self, width=5, height=4, dpi=100)
 
@@ -293,6 +492,8 @@ class SignalEditor(QDialog):
 
         self.input_layout = InputLayout(parent=self, model=self._input)
         self.fft_layout = FFTLayout(parent=self, model=self._input)
+        self.fft_layout._xmax.doubleValueChanged.connect(self.input_layout.suggest)
+        self.input_layout.suggest(self.fft_layout._xmax.value())
 
         in_group.setTitle('Input Signal')
         fft_group.setTitle('FFT Signal')
@@ -316,51 +517,146 @@ class SignalEditor(QDialog):
     def fft_signal(self):
         return self.__fft_signal
 
-    def save_csv(self, x, y, fname, header=None):
-        with open(fname, 'w', newline='') as f:
-            if header:
-                f.write(f'{header[0]},{header[1]}\n')
-            for xi, yi in zip(x, y):
-                f.write(f'{xi},{yi}\n')
+    @property
+    def peaks(self):
+        return self.__peaks
 
     @Slot()
     def apply(self):
-        data = self.input_layout.data()
+        try:
+            data = self.input_layout.data()
+        except ValueError as er:
+            QMessageBox.warning(self, 'Filter', str(er), QMessageBox.StandardButton.Ok)
+            return False
         self._input.update(**data)
-        x = self._input.x
-        y = self._input.y if not data['sub_mean'] else Input.subtrackt_mean(self._input.y)  
-        y = self._input.window_signal(y, self._input.window) if self._input.window else y
+        try:
+            x, y = self._input.processed()
+        except ValueError as er:
+            QMessageBox.warning(self, 'Filter', str(er), QMessageBox.StandardButton.Ok)
+            self._input.update(**dict(data, filter=None))
+            x, y = self._input.processed()
         self.input.plot(x, y, xlim=data['xlim'], xlabel=data['xlabel'],
                         ylabel=data['ylabel'], title=self._input.name)
         self.__in_signal = {self._input.xlabel: x, self._input.ylabel: y}
-
-        data = self.fft_layout.data()
-        x = self._input.get_frequency(self._input.N, self._input.dt)
+        self.__plots['input'] = {'xlim': data['xlim'], 'xlabel': data['xlabel'],
+                                 'ylabel': data['ylabel'], 'title': self._input.name}
+
+        try:
+            data = self.fft_layout.data()
+        except ValueError as er:
+            QMessageBox.warning(self, 'FFT settings', str(er), QMessageBox.StandardButton.Ok)
+            return False
+        signal = y
+        spectrum = self._input.transform()
+        dt = self._input.processed_dt
+        x = self._input.get_frequency(signal.size, dt)
+        title = f"{self._input.name} {data['plot']}"
+        if data['zoom'] > 1 and data['plot'] in list(SPECTRAL.keys()) + list(SOUND.keys()):
+            try:
+                x, spectrum = Input.get_zoom_fft(signal, dt, *data['xlim'], data['zoom'])
+                title += f' (zoom, resolution {x[1] - x[0]:.4g})'
+            except ValueError as er:
+                QMessageBox.warning(self, 'Zoom FFT', str(er), QMessageBox.StandardButton.Ok)
+        if (q := self._input.decimation) > 1:
+            # Unnormalized spectra scale with the sample count, keep full rate levels
+            spectrum = spectrum * q
+            title += f' (decimated by {q})'
+        dc = x[0] == 0
         if (plot:=data['plot']) in SPECTRAL.keys():
-            y = SPECTRAL[plot](y)[:x.size]
+            y = SPECTRAL[plot](signal, spectrum=spectrum, dc=dc)[:x.size]
         elif plot in SOUND.keys():
-            y = SOUND[plot](y, float(data['pref']))[:x.size]
+            y = SOUND[plot](signal, data['pref'], spectrum=spectrum, dc=dc)[:x.size]
+        elif plot in ENVELOPE.keys():
+            # Xmin ... Xmax is the demodulated band, modulation frequencies
+            # show up between zero and the band width
+            fmin, fmax = data['xlim']
+            try:
+                x, y = ENVELOPE[plot](self._input, fmin, fmax)
+            except ValueError as er:
+                QMessageBox.warning(self, 'Envelope analysis', str(er), QMessageBox.StandardButton.Ok)
+                return False
+            y = y * q
+            title += f' ({fmin:.4g} ... {fmax:.4g} band)'
+            data['xlim'] = (0., fmax - fmin)
+        elif plot in CORRELATION.keys():
+            if plot == 'Autocorrelation':
+                spectrum = self._input.transform(Input.correlation_length(signal.size))
+            y = CORRELATION[plot](signal, spectrum=spectrum)
+            x = np.arange(y.size) * dt
+            self.__plots['fft'] = {'xlabel': data['xlabel'], 'ylabel': data['ylabel'],
+                                   'title': f'{self._input.name} {plot}'}
+            self.fft.plot(x, y, **self.__plots['fft'])
+            self.__fft_signal = {data['xlabel']: x, data['ylabel']: y}
+            self.__peaks = None
+            return True
+        elif plot in SELECTIVE.keys():
+            method = Input.selective_method(signal.size, len(data['freqs']))
+            try:
+                x, y = SELECTIVE[plot](signal, data['freqs'], dt, method)
+            except ValueError as er:
+                QMessageBox.warning(self, 'Selective analysis', str(er), QMessageBox.StandardButton.Ok)
+                return False
+            y = y * q
+            title = f'{self._input.name} {plot} ({method})'
+            self.fft.plot(x, y, xlim=data['xlim'], xlabel=data['xlabel'], ylabel=data['ylabel'],
+                          title=title, marker='o', linestyle='')
+            self.__plots['fft'] = {'xlim': data['xlim'], 'xlabel': data['xlabel'], 'ylabel': data['ylabel'],
+                                   'title': title, 'style': {'marker': 'o', 'linestyle': ''}}
+            self.__fft_signal = {data['xlabel']: x, data['ylabel']: y}
+            self.__peaks = None
+            return True
+        else:
+            y = SPECTRAL['Amplitude'](signal, spectrum=spectrum, dc=dc)[:x.size]
         self.fft.plot(x, y, xlim=data['xlim'], xlabel=data['xlabel'],
-                      ylabel=data['ylabel'], title=f'{self._input.name} {plot}')
+                      ylabel=data['ylabel'], title=title)
         self.__fft_signal = {data['xlabel']: x, data['ylabel']: y}
+        self.__plots['fft'] = {'xlim': data['xlim'], 'xlabel': data['xlabel'],
+                               'ylabel': data['ylabel'], 'title': title}
+
+        self.__peaks = None
+        if data['peaks']:
+            amplitude = y if plot in ['Amplitude'] + list(ENVELOPE.keys()) \
+                else Input.get_amplitude(signal, spectrum=spectrum, dc=dc)[:x.size]
+            band = (x >= data['xlim'][0]) & (x <= data['xlim'][1])
+            if band.sum() >= 3:
+                freq, amp = Input.get_peaks(x[band], amplitude[band], data['peaks'])
+                group, order = Input.group_harmonics(freq)
+                self.__peaks = {
+                    data['xlabel']: freq,
+                    'Amplitude': amp,
+                    'Fundamental': freq[group],
+                    'Order': order
+                }
+                markers = (freq, np.interp(freq, x, y),
+                           [f'{f:.4g}' if o == 1 else f'{o}x' for f, o in zip(freq, order)])
+                self.fft.annotate(*markers)
+                self.__plots['fft']['markers'] = markers
+        return True
 
     @Slot()
     def accept(self):
 
-        # fname = os.path.splitext(os.path.split(self._input.file)[1])[0]
-        self.apply()
-        fname = self._input.name
-        self.input.save_fig(os.path.abspath(os.path.join(TMP, f'{fname}.png')))
-        x, y = self.__in_signal.values()
-        self.save_csv(x, y, os.path.abspath(os.path.join(TMP, f'{fname}.csv')),
-                       header=tuple(self.__in_signal.keys()))
-
-        data = self.fft_layout.data()
-        x, y = self.__fft_signal.values()
-        xlabel, ylabel = tuple(self.__fft_signal.keys())
-        self.fft.save_fig(os.path.abspath(os.path.join(TMP, f"{data['plot']}_{fname}.png")))
-        self.save_csv(x, y, os.path.abspath(os.path.join(TMP, f"{data['plot']}_{fname}.csv")),
-                      header=(xlabel, ylabel))
+        # Figures and tables are rendered by the export queue straight into
+        # the destination; the dialog does not wait for them.
+        if not self.apply():
+            return None
+        fname = file_name(self._input.name)
+        plot = self.fft_layout._analysis.currentText()
+
+        def path(name):
+            return os.path.abspath(os.path.join(self._destination, name))
+
+        os.makedirs(self._destination, exist_ok=True)
+        self._export.figure(path(f'{fname}.{self._format}'), *self.__in_signal.values(),
+                            fmt=self._format, dpi=self._dpi, **self.__plots['input'])
+        self._export.table(path(f'{fname}.csv'), self.__in_signal)
+
+        self._export.figure(path(f'{plot}_{fname}.{self._format}'), *self.__fft_signal.values(),
+                            fmt=self._format, dpi=self._dpi, **self.__plots['fft'])
+        self._export.table(path(f'{plot}_{fname}.csv'), self.__fft_signal)
+
+        if self.__peaks:
+            self._export.table(path(f'Peaks_{fname}.csv'), self.__peaks)
 
         return super().accept()
 
@@ -370,3 +666,934 @@ class SignalEditor(QDialog):
         self.__in_signal = None
         self.__fft_signal = None
         return super().reject()
+
+
+
+class CrossLayout(QFormLayout):
+
+    def __init__(self, signals: list, parent: QWidget | None = None) -> None:
+        super().__init__()
+
+        self.setSpacing(25)
+        self.setContentsMargins(5, 5, 5, 5)
+        size = QSize(196, 28)
+
+        self._input = QComboBox()
+        self._output = QComboBox()
+        for combo in (self._input, self._output):
+            combo.addItems([str(s) for s in signals])
+            combo.setFixedSize(size)
+        self._output.setCurrentIndex(min(1, len(signals) - 1))
+
+        self._analysis = QComboBox()
+        self._analysis.addItems(list(CROSS.keys()))
+        self._analysis.setFixedSize(size)
+
+        self._nperseg = QComboBox()
+        self._nperseg.addItems([str(2 ** i) for i in range(6, 17)])
+        self._nperseg.setCurrentText('1024')
+        self._nperseg.setFixedSize(QSize(96, 28))
+
+        self._overlap = QSpinBox()
+        self._overlap.setRange(0, 90)
+        self._overlap.setValue(50)
+        self._overlap.setSuffix(' %')
+        self._overlap.setFixedSize(QSize(96, 28))
+
+        self._windows = QComboBox()
+        self._windows.addItems(list(WINDOWS.keys()) + ['None'])
+        self._windows.setFixedSize(size)
+
+        self.addRow('Input signal', self._input)
+        self.addRow('Output signal', self._output)
+        self.addRow('Plot', self._analysis)
+        self.addRow('Segment length', self._nperseg)
+        self.addRow('Overlap', self._overlap)
+        self.addRow('Windows', self._windows)
+
+    def data(self) -> dict:
+        return {
+            'input': self._input.currentIndex(),
+            'output': self._output.currentIndex(),
+            'plot': self._analysis.currentText(),
+            'nperseg': int(self._nperseg.currentText()),
+            'overlap': self._overlap.value() / 100,
+            'window': self._windows.currentText()
+        }
+
+
+class CrossEditor(QDialog):
+
+    def __init__(self, parent = None, f = Qt.WindowType.Dialog, **kwargs) -> None:
+        super().__init__(parent, f)
+
+        self._signals: list = kwargs.get('signals', [])
+        self._export: ExportQueue = kwargs.get('export', None) or ExportQueue(workers=0)
+        self._destination: str = kwargs.get('destination', None) or TMP
+        self._format: str = kwargs.get('fmt', 'png')
+        self._dpi: int = kwargs.get('dpi', 600)
+        self.__result = None
+        self.__plot = None
+
+        self.canvas = MpCanvas(self, width=5, height=4, dpi=100)
+
+        layout = QGridLayout()
+        self.setLayout(layout)
+        self.setWindowTitle('Cross Spectral Analysis')
+        self.setMinimumSize(QSize(1024, 560))
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+
+        buttonBox = QDialogButtonBox(Qt.Orientation.Horizontal)
+        buttonBox.setStandardButtons(
+            QDialogButtonBox.StandardButton.Ok |
+            QDialogButtonBox.StandardButton.Apply |
+            QDialogButtonBox.StandardButton.Cancel
+        )
+        buttonBox.accepted.connect(self.accept)
+        buttonBox.rejected.connect(self.reject)
+        buttonBox.button(QDialogButtonBox.StandardButton.Apply).clicked.connect(self.apply)
+
+        self.cross_layout = CrossLayout(self._signals, parent=self)
+        cross_group = QGroupBox(self)
+        cross_group.setTitle('Signals')
+        cross_group.setLayout(self.cross_layout)
+
+        layout.addWidget(self.canvas, 0, 0)
+        layout.addWidget(cross_group, 0, 1)
+        layout.addWidget(buttonBox, 1, 0)
+        layout.setColumnStretch(0, 1)
+
+    @property
+    def result(self):
+        return self.__result
+
+    @Slot()
+    def apply(self):
+        data = self.cross_layout.data()
+        a, b = self._signals[data['input']], self._signals[data['output']]
+        try:
+            result = Input.get_cross_spectrum(a, b, data['nperseg'], data['overlap'], data['window'])
+        except ValueError as er:
+            QMessageBox.critical(self, 'Cross spectral analysis', f'Analysis failed.\nError: {er}',
+                                 QMessageBox.StandardButton.Ok)
+            return False
+
+        plot = data['plot']
+        y = result[CROSS[plot]]
+        y = y if plot in ('Coherence', 'Phase') else np.abs(y)
+        ylabel = {'Phase': 'Phase, rad', 'Coherence': 'Coherence'}.get(plot, f'|{CROSS[plot]}|')
+        self.__plot = {'xlabel': 'Frequency', 'ylabel': ylabel, 'title': f'{a} / {b} {plot}'}
+        self.canvas.plot(result['freq'], y, **self.__plot)
+        self.__result = {'Frequency': result['freq'], ylabel: y}
+        return True
+
+    @Slot()
+    def accept(self):
+        if not self.apply():
+            return None
+        data = self.cross_layout.data()
+        name = file_name(f"{data['plot']}_{self._signals[data['input']]}_{self._signals[data['output']]}")
+        os.makedirs(self._destination, exist_ok=True)
+        path = os.path.abspath(os.path.join(self._destination, name))
+        self._export.figure(f'{path}.{self._format}', *self.__result.values(),
+                            fmt=self._format, dpi=self._dpi, **self.__plot)
+        self._export.table(f'{path}.csv', self.__result)
+        return super().accept()
+
+
+class SweepLayout(QFormLayout):
+
+    def __init__(self, model: Input, parent: QWidget | None = None) -> None:
+        super().__init__()
+
+        self.setSpacing(25)
+        self.setContentsMargins(5, 5, 5, 5)
+        size = QSize(196, 28)
+
+        self.__model = model
+
+        self._crops = QLineEdit()
+        self._crops.setPlaceholderText('xmin, xmax; xmin, xmax')
+        self._crops.setText(', '.join(f'{float(i):g}' for i in model.xlim))
+        self._crops.setValidator(QRegularExpressionValidator(QRegularExpression(r'[0-9eE.,;\s+-]*')))
+        self._crops.setFixedSize(size)
+
+        self._windows = {}
+        windows_layout = QHBoxLayout()
+        for w in list(WINDOWS.keys()) + ['None']:
+            self._windows[w] = QCheckBox(w)
+            self._windows[w].setCheckState(Qt.CheckState.Checked)
+            windows_layout.addWidget(self._windows[w])
+
+        self._sub_mean = QComboBox()
+        self._sub_mean.addItems(['Both', 'On', 'Off'])
+        self._sub_mean.setFixedSize(QSize(96, 28))
+
+        self._fmax = QLineEdit()
+        self._fmax.setPlaceholderText('Nyquist')
+        self._fmax.setValidator(QRegularExpressionValidator(QRegularExpression(r'[0-9]*e?-?.?[0-9]+')))
+        self._fmax.setFixedSize(QSize(96, 28))
+
+        self.addRow('Crop ranges', self._crops)
+        self.addRow('Windows', windows_layout)
+        self.addRow('Subtrackt mean', self._sub_mean)
+        self.addRow('Fmax', self._fmax)
+
+    def data(self) -> dict:
+        crops = []
+        for crop in self._crops.text().split(';'):
+            limits = [number(i, 'Crops') for i in crop.split(',') if i.strip()]
+            if len(limits) == 2:
+                crops.append(tuple(limits))
+        return {
+            'crops': crops or [tuple(self.__model.xlim)],
+            'windows': [w for w, box in self._windows.items() if box.isChecked()] or ['None'],
+            'sub_means': {'Both': (False, True), 'On': (True, ), 'Off': (False, )}[self._sub_mean.currentText()],
+            'fmax': number(self._fmax.text(), 'Fmax') if self._fmax.text() else None
+        }
+
+
+class SweepEditor(QDialog):
+
+    def __init__(self, parent = None, f = Qt.WindowType.Dialog, **kwargs) -> None:
+        super().__init__(parent, f)
+
+        self._input: Input = kwargs.get('input', None)
+        self._export: ExportQueue = kwargs.get('export', None) or ExportQueue(workers=0)
+        self._destination: str = kwargs.get('destination', None) or TMP
+        self._format: str = kwargs.get('fmt', 'png')
+        self._dpi: int = kwargs.get('dpi', 600)
+        self.__result = None
+        self.__plot = None
+
+        self.canvas = MpCanvas(self, width=5, height=4, dpi=100)
+        self.table = QTableWidget(self)
+
+        layout = QGridLayout()
+        self.setLayout(layout)
+        self.setWindowTitle(f'Parameter Sweep: {self._input}')
+        self.setMinimumSize(QSize(1024, 720))
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+
+        buttonBox = QDialogButtonBox(Qt.Orientation.Horizontal)
+        buttonBox.setStandardButtons(
+            QDialogButtonBox.StandardButton.Ok |
+            QDialogButtonBox.StandardButton.Apply |
+            QDialogButtonBox.StandardButton.Cancel
+        )
+        buttonBox.accepted.connect(self.accept)
+        buttonBox.rejected.connect(self.reject)
+        buttonBox.button(QDialogButtonBox.StandardButton.Apply).clicked.connect(self.apply)
+
+        self.sweep_layout = SweepLayout(self._input, parent=self)
+        sweep_group = QGroupBox(self)
+        sweep_group.setTitle('Settings')
+        sweep_group.setLayout(self.sweep_layout)
+
+        layout.addWidget(self.canvas, 0, 0)
+        layout.addWidget(sweep_group, 0, 1)
+        layout.addWidget(self.table, 1, 0, 1, 2)
+        layout.addWidget(buttonBox, 2, 0)
+        layout.setColumnStretch(0, 1)
+
+    @property
+    def result(self):
+        return self.__result
+
+    @Slot()
+    def apply(self):
+        try:
+            data = self.sweep_layout.data()
+        except ValueError as er:
+            QMessageBox.warning(self, 'Parameter sweep', str(er), QMessageBox.StandardButton.Ok)
+            return False
+        try:
+            result = self._input.sweep(data['crops'], data['windows'], data['sub_means'])
+        except ValueError as er:
+            QMessageBox.critical(self, 'Parameter sweep', f'Sweep failed.\nError: {er}',
+                                 QMessageBox.StandardButton.Ok)
+            return False
+
+        freq, amplitude = result['freq'], result['amplitude']
+        xlim = (freq[0], data['fmax']) if data['fmax'] else None
+        self.__plot = {'xlim': xlim, 'xlabel': 'Frequency', 'ylabel': 'Amplitude',
+                       'title': f'{self._input.name} parameter sweep'}
+        self.canvas.plot(freq, amplitude.T, **self.__plot)
+        self.canvas.legend(result['labels'])
+
+        if data['fmax']:
+            amplitude = amplitude[:, freq <= data['fmax']]
+            freq = freq[freq <= data['fmax']]
+        table = Input.sweep_table(freq, amplitude)
+        self.table.clear()
+        self.table.setRowCount(len(result['labels']))
+        self.table.setColumnCount(len(table))
+        self.table.setHorizontalHeaderLabels(list(table.keys()))
+        self.table.setVerticalHeaderLabels(result['labels'])
+        for j, values in enumerate(table.values()):
+            for i, value in enumerate(values):
+                self.table.setItem(i, j, QTableWidgetItem(f'{value:.6g}'))
+        self.table.resizeColumnsToContents()
+        self.__result = (result, {'Variant': result['labels'], **table})
+        return True
+
+    @Slot()
+    def accept(self):
+        if not self.apply():
+            return None
+        result, table = self.__result
+        os.makedirs(self._destination, exist_ok=True)
+        path = os.path.abspath(os.path.join(self._destination, file_name(f'Sweep_{self._input.name}')))
+        self._export.figure(f'{path}.{self._format}', result['freq'], result['amplitude'].T,
+                            fmt=self._format, dpi=self._dpi, legend=result['labels'], **self.__plot)
+        self._export.table(f'{path}.csv', {'Frequency': result['freq'],
+                                           **dict(zip(result['labels'], result['amplitude']))})
+        self._export.table(f'{path}_summary.csv', table)
+        return super().accept()
+
+
+class WaterfallLayout(QFormLayout):
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__()
+
+        self.setSpacing(25)
+        self.setContentsMargins(5, 5, 5, 5)
+
+        self._fmax = QLineEdit()
+        self._fmax.setPlaceholderText('Nyquist')
+        self._fmax.setValidator(QRegularExpressionValidator(QRegularExpression(r'[0-9]*e?-?.?[0-9]+')))
+        self._fmax.setFixedSize(QSize(96, 28))
+
+        self._bins = QSpinBox()
+        self._bins.setRange(16, 2 ** 16)
+        self._bins.setValue(2048)
+        self._bins.setFixedSize(QSize(96, 28))
+
+        self._scale = QComboBox()
+        self._scale.addItems(['dB', 'Linear'])
+        self._scale.setFixedSize(QSize(96, 28))
+
+        self._normalize = QCheckBox()
+        self._normalize.setCheckState(Qt.CheckState.Unchecked)
+
+        self.addRow('Fmax', self._fmax)
+        self.addRow('Frequency bins', self._bins)
+        self.addRow('Scale', self._scale)
+        self.addRow('Normalize rows', self._normalize)
+
+    def data(self) -> dict:
+        fmax = number(self._fmax.text(), 'Fmax') if self._fmax.text() else None
+        if fmax is not None and fmax <= 0:
+            raise ValueError(f'Fmax must be positive, got {fmax:g}')
+        return {
+            'fmax': fmax,
+            'bins': self._bins.value(),
+            'db': self._scale.currentText() == 'dB',
+            'normalize': self._normalize.isChecked()
+        }
+
+
+class WaterfallEditor(QDialog):
+
+    def __init__(self, parent = None, f = Qt.WindowType.Dialog, **kwargs) -> None:
+        super().__init__(parent, f)
+
+        self._signals: list = kwargs.get('signals', [])
+        self._export: ExportQueue = kwargs.get('export', None) or ExportQueue(workers=0)
+        self._destination: str = kwargs.get('destination', None) or TMP
+        self._format: str = kwargs.get('fmt', 'png')
+        self._dpi: int = kwargs.get('dpi', 600)
+        self.__result = None
+
+        self.canvas = MpCanvas(self, width=5, height=4, dpi=100)
+
+        layout = QGridLayout()
+        self.setLayout(layout)
+        self.setWindowTitle('Waterfall')
+        self.setMinimumSize(QSize(1024, 640))
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+
+        buttonBox = QDialogButtonBox(Qt.Orientation.Horizontal)
+        buttonBox.setStandardButtons(
+            QDialogButtonBox.StandardButton.Ok |
+            QDialogButtonBox.StandardButton.Apply |
+            QDialogButtonBox.StandardButton.Cancel
+        )
+        buttonBox.accepted.connect(self.accept)
+        buttonBox.rejected.connect(self.reject)
+        buttonBox.button(QDialogButtonBox.StandardButton.Apply).clicked.connect(self.apply)
+
+        self.waterfall_layout = WaterfallLayout(parent=self)
+        waterfall_group = QGroupBox(self)
+        waterfall_group.setTitle('Settings')
+        waterfall_group.setLayout(self.waterfall_layout)
+        self.info = QLabel()
+
+        layout.addWidget(self.canvas, 0, 0)
+        layout.addWidget(waterfall_group, 0, 1)
+        layout.addWidget(self.info, 1, 0)
+        layout.addWidget(buttonBox, 2, 0)
+        layout.setColumnStretch(0, 1)
+
+    @property
+    def result(self):
+        return self.__result
+
+    @Slot()
+    def apply(self):
+        # Each signal is analysed with its own settings from the FFT editor
+        try:
+            data = self.waterfall_layout.data()
+        except ValueError as er:
+            QMessageBox.warning(self, 'Waterfall', str(er), QMessageBox.StandardButton.Ok)
+            return False
+        start = time.perf_counter()
+        freq, image = Input.get_waterfall(self._signals, data['bins'], data['fmax'])
+        if data['normalize']:
+            peak = image.max(axis=-1, keepdims=True)
+            image = np.divide(image, peak, out=np.zeros_like(image), where=peak > 0)
+        if data['db']:
+            image = 20 * np.log10(np.maximum(image, image.max() * 1e-6 if image.max() > 0 else 1.))
+        names = [str(s) for s in self._signals]
+        settings = {'extent': (freq[0], freq[-1], len(names), 0), 'xlabel': 'Frequency', 'ylabel': 'Signal',
+                    'title': f'Waterfall of {len(names)} signals',
+                    'clabel': ('Relative ' if data['normalize'] else '') + ('amplitude, dB' if data['db'] else 'amplitude')}
+        self.canvas.image(image, labels=names, **settings)
+        self.info.setText(f'{len(names)} spectra, {freq.size} bins in {time.perf_counter() - start:.2f} s')
+        self.__result = (freq, image, names, settings)
+        return True
+
+    @Slot()
+    def accept(self):
+        if not self.apply():
+            return None
+        freq, image, names, settings = self.__result
+        os.makedirs(self._destination, exist_ok=True)
+        path = os.path.abspath(os.path.join(self._destination, 'Waterfall'))
+        self._export.submit(render_image, f'{path}.{self._format}', image, fmt=self._format, dpi=self._dpi,
+                            labels=names, **settings)
+        self._export.table(f'{path}.csv', {'Frequency': freq, **dict(zip(names, image))})
+        return super().accept()
+
+
+class OrderLayout(QFormLayout):
+
+    def __init__(self, signals: list, parent: QWidget | None = None) -> None:
+        super().__init__()
+
+        self.setSpacing(25)
+        self.setContentsMargins(5, 5, 5, 5)
+        size = QSize(196, 28)
+
+        self._input = QComboBox()
+        self._tacho = QComboBox()
+        for combo in (self._input, self._tacho):
+            combo.addItems([str(s) for s in signals])
+            combo.setFixedSize(size)
+        self._tacho.setCurrentIndex(min(1, len(signals) - 1))
+
+        self._analysis = QComboBox()
+        self._analysis.addItems(['Order Spectrum', 'Order Map', 'Speed Profile'])
+        self._analysis.setFixedSize(size)
+
+        self._ppr = QSpinBox()
+        self._ppr.setRange(1, 4096)
+        self._ppr.setFixedSize(QSize(96, 28))
+
+        self._level = QLineEdit()
+        self._level.setPlaceholderText('Auto')
+        self._level.setValidator(QRegularExpressionValidator(QRegularExpression(r'[0-9]*e?-?.?[0-9]+')))
+        self._level.setFixedSize(QSize(96, 28))
+
+        self._max_order = QSpinBox()
+        self._max_order.setRange(1, 1000)
+        self._max_order.setValue(20)
+        self._max_order.setFixedSize(QSize(96, 28))
+
+        self._revs = QComboBox()
+        self._revs.addItems([str(2 ** i) for i in range(2, 11)])
+        self._revs.setCurrentText('16')
+        self._revs.setFixedSize(QSize(96, 28))
+
+        self.addRow('Signal', self._input)
+        self.addRow('Tacho signal', self._tacho)
+        self.addRow('Plot', self._analysis)
+        self.addRow('Pulses per revolution', self._ppr)
+        self.addRow('Trigger level', self._level)
+        self.addRow('Max order', self._max_order)
+        self.addRow('Revolutions per block', self._revs)
+
+    def data(self) -> dict:
+        level = number(self._level.text(), 'Trigger level') if self._level.text() else None
+        if level is not None and level <= 0:
+            raise ValueError(f'Trigger level must be positive, got {level:g}')
+        return {
+            'input': self._input.currentIndex(),
+            'tacho': self._tacho.currentIndex(),
+            'plot': self._analysis.currentText(),
+            'ppr': self._ppr.value(),
+            'level': level,
+            'max_order': self._max_order.value(),
+            'revs': int(self._revs.currentText())
+        }
+
+
+class OrderEditor(QDialog):
+
+    def __init__(self, parent = None, f = Qt.WindowType.Dialog, **kwargs) -> None:
+        super().__init__(parent, f)
+
+        self._signals: list = kwargs.get('signals', [])
+        self._export: ExportQueue = kwargs.get('export', None) or ExportQueue(workers=0)
+        self._destination: str = kwargs.get('destination', None) or TMP
+        self._format: str = kwargs.get('fmt', 'png')
+        self._dpi: int = kwargs.get('dpi', 600)
+        self.__result = None
+        self.__plot = None
+
+        self.canvas = MpCanvas(self, width=5, height=4, dpi=100)
+
+        layout = QGridLayout()
+        self.setLayout(layout)
+        self.setWindowTitle('Order Tracking')
+        self.setMinimumSize(QSize(1024, 560))
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+
+        buttonBox = QDialogButtonBox(Qt.Orientation.Horizontal)
+        buttonBox.setStandardButtons(
+            QDialogButtonBox.StandardButton.Ok |
+            QDialogButtonBox.StandardButton.Apply |
+            QDialogButtonBox.StandardButton.Cancel
+        )
+        buttonBox.accepted.connect(self.accept)
+        buttonBox.rejected.connect(self.reject)
+        buttonBox.button(QDialogButtonBox.StandardButton.Apply).clicked.connect(self.apply)
+
+        self.order_layout = OrderLayout(self._signals, parent=self)
+        order_group = QGroupBox(self)
+        order_group.setTitle('Signals')
+        order_group.setLayout(self.order_layout)
+
+        layout.addWidget(self.canvas, 0, 0)
+        layout.addWidget(order_group, 0, 1)
+        layout.addWidget(buttonBox, 1, 0)
+        layout.setColumnStretch(0, 1)
+
+    @property
+    def result(self):
+        return self.__result
+
+    @Slot()
+    def apply(self):
+        try:
+            data = self.order_layout.data()
+        except ValueError as er:
+            QMessageBox.warning(self, 'Order tracking', str(er), QMessageBox.StandardButton.Ok)
+            return False
+        signal, tacho = self._signals[data['input']], self._signals[data['tacho']]
+        settings = (data['ppr'], data['max_order'], data['revs'])
+        try:
+            pulses = tacho.cached(tacho.key('pulses', data['level']),
+                                  lambda: Input.get_tacho_pulses(tacho.x, tacho.y, data['level']))
+            result = signal.cached(signal.key('orders', str(tacho), pulses.size) + settings,
+                                   lambda: Input.get_order_tracking(signal.x, signal.y, pulses, *settings))
+        except ValueError as er:
+            QMessageBox.critical(self, 'Order tracking', f'Analysis failed.\nError: {er}',
+                                 QMessageBox.StandardButton.Ok)
+            return False
+
+        plot = data['plot']
+        title = f'{signal} {plot}'
+        if plot == 'Order Map':
+            orders, speed = result['orders'], result['speed']
+            self.__plot = {'extent': (orders[0], orders[-1], speed[0], speed[-1]), 'xlabel': 'Order',
+                           'ylabel': 'Speed, rpm', 'clabel': 'Order amplitude', 'title': title}
+            self.canvas.image(result['speed_map'][::-1], **self.__plot)
+            self.__result = {'Order': orders, **{f'{rpm:.1f} rpm': row for rpm, row in
+                                                 zip(speed, result['speed_map'])}}
+            return True
+        if plot == 'Speed Profile':
+            x, y, labels = result['time'], result['rpm'], ('Time', 'Speed, rpm')
+        else:
+            x, y, labels = result['orders'], result['spectrum'], ('Order', 'Order amplitude')
+        self.__plot = {'xlabel': labels[0], 'ylabel': labels[1], 'title': title}
+        self.canvas.plot(x, y, **self.__plot)
+        self.__result = dict(zip(labels, (x, y)))
+        return True
+
+    @Slot()
+    def accept(self):
+        if not self.apply():
+            return None
+        data = self.order_layout.data()
+        name = file_name(f"{data['plot']}_{self._signals[data['input']]}")
+        os.makedirs(self._destination, exist_ok=True)
+        path = os.path.abspath(os.path.join(self._destination, name))
+        if 'extent' in self.__plot:
+            values = list(self.__result.values())[1:]
+            self._export.submit(render_image, f'{path}.{self._format}', np.array(values)[::-1],
+                                fmt=self._format, dpi=self._dpi, **self.__plot)
+        else:
+            self._export.figure(f'{path}.{self._format}', *self.__result.values(),
+                                fmt=self._format, dpi=self._dpi, **self.__plot)
+        self._export.table(f'{path}.csv', self.__result)
+        return super().accept()
+
+
+class CatalogLayout(QFormLayout):
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__()
+
+        self.setSpacing(25)
+        self.setContentsMargins(5, 5, 5, 5)
+        size = QSize(196, 28)
+        validator = QRegularExpression(r'[0-9]*e?-?.?[0-9]+')
+
+        self._fmin = QLineEdit()
+        self._fmax = QLineEdit()
+        self._min_fs = QLineEdit()
+        for edit, text in ((self._fmin, 'Band from, Hz'), (self._fmax, 'Band to, Hz'), (self._min_fs, 'Any')):
+            edit.setPlaceholderText(text)
+            edit.setValidator(QRegularExpressionValidator(validator))
+            edit.setFixedSize(QSize(96, 28))
+
+        self._name = QLineEdit()
+        self._name.setPlaceholderText('Part of the file or channel name')
+        self._name.setFixedSize(size)
+
+        self._order = QComboBox()
+        self._order.addItems(['Band RMS', 'RMS', 'Peak', 'Crest factor', 'Duration', 'Sample rate'])
+        self._order.setFixedSize(size)
+
+        band_layout = QHBoxLayout()
+        band_layout.addWidget(self._fmin)
+        band_layout.addWidget(self._fmax)
+
+        self.addRow('Band', band_layout)
+        self.addRow('Name', self._name)
+        self.addRow('Min sample rate', self._min_fs)
+        self.addRow('Order by', self._order)
+
+    def data(self) -> dict:
+        values = {}
+        for key, edit, name in (('fmin', self._fmin, 'Band from'), ('fmax', self._fmax, 'Band to'),
+                                ('min_fs', self._min_fs, 'Min sample rate')):
+            values[key] = number(edit.text(), name) if edit.text() else None
+            if values[key] is not None and values[key] < 0:
+                raise ValueError(f'{name} must not be negative, got {values[key]:g}')
+        if values['fmin'] is not None and values['fmax'] is not None and values['fmin'] > values['fmax']:
+            raise ValueError(f'Band from {values["fmin"]:g} Hz is above band to {values["fmax"]:g} Hz')
+
+        return {
+            **values,
+            'name': self._name.text(),
+            'order': {'Band RMS': 'band_rms', 'RMS': 'rms', 'Peak': 'peak', 'Crest factor': 'crest',
+                      'Duration': 'duration', 'Sample rate': 'fs'}[self._order.currentText()]
+        }
+
+
+class CatalogEditor(QDialog):
+
+    # Query the recordings catalog; the indexer belongs to the caller so
+    # indexing carries on in the background after the dialog is closed
+
+    def __init__(self, parent = None, f = Qt.WindowType.Dialog, **kwargs) -> None:
+        super().__init__(parent, f)
+
+        self._catalog: Catalog = kwargs.get('catalog')
+        self._indexer: Indexer = kwargs.get('indexer')
+        self._cdir: str = kwargs.get('cdir', os.sep)
+        self.__rows = []
+        self.__files = []
+
+        self.table = QTableWidget(self)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.status = QLabel()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.update_status)
+
+        layout = QGridLayout()
+        self.setLayout(layout)
+        self.setWindowTitle('Recordings Catalog')
+        self.setMinimumSize(QSize(1024, 560))
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+
+        buttonBox = QDialogButtonBox(Qt.Orientation.Horizontal)
+        buttonBox.setStandardButtons(
+            QDialogButtonBox.StandardButton.Ok |
+            QDialogButtonBox.StandardButton.Apply |
+            QDialogButtonBox.StandardButton.Cancel
+        )
+        buttonBox.button(QDialogButtonBox.StandardButton.Ok).setText('Load selected')
+        buttonBox.accepted.connect(self.accept)
+        buttonBox.rejected.connect(self.reject)
+        buttonBox.button(QDialogButtonBox.StandardButton.Apply).clicked.connect(self.apply)
+        index_btn = QPushButton('Index folder...')
+        index_btn.clicked.connect(self.index)
+
+        self.catalog_layout = CatalogLayout(parent=self)
+        self.catalog_layout.addRow(index_btn, self.status)
+        catalog_group = QGroupBox(self)
+        catalog_group.setTitle('Query')
+        catalog_group.setLayout(self.catalog_layout)
+
+        layout.addWidget(self.table, 0, 0)
+        layout.addWidget(catalog_group, 0, 1)
+        layout.addWidget(buttonBox, 1, 0)
+        layout.setColumnStretch(0, 1)
+        self.update_status()
+        self.apply()
+
+    @property
+    def files(self) -> list:
+        return self.__files
+
+    @Slot()
+    def index(self):
+        directory = QFileDialog.getExistingDirectory(
+            self, 'Index Recordings In', self._cdir,
+            QFileDialog.Option.ShowDirsOnly | QFileDialog.Option.DontResolveSymlinks
+        )
+        if directory:
+            self._indexer.start(directory)
+            self.update_status()
+
+    @Slot()
+    def update_status(self):
+        self._indexer.collect()
+        if self._indexer.running:
+            self.status.setText(f'Indexing {self._indexer.done} / {self._indexer.total} files')
+            self.timer.start(200)
+            return None
+        self.timer.stop()
+        errors = self._indexer.errors
+        self.status.setText(f'Catalog {self._catalog.path} up to date' +
+                            (f', {len(errors)} files could not be read' if errors else ''))
+        self.status.setToolTip('\n'.join(errors))
+        self.apply()
+
+    @Slot()
+    def apply(self):
+        try:
+            data = self.catalog_layout.data()
+        except ValueError as er:
+            QMessageBox.warning(self, 'Recordings catalog', str(er), QMessageBox.StandardButton.Ok)
+            return False
+        self.__rows = self._catalog.query(**data)
+        columns = ['path', 'channel', 'band_rms', 'rms', 'peak', 'crest', 'fs', 'duration', 'samples']
+        self.table.clear()
+        self.table.setRowCount(len(self.__rows))
+        self.table.setColumnCount(len(columns))
+        self.table.setHorizontalHeaderLabels(['File', 'Channel', 'Band RMS', 'RMS', 'Peak', 'Crest',
+                                              'Sample rate', 'Duration', 'Samples'])
+        for i, row in enumerate(self.__rows):
+            for j, column in enumerate(columns):
+                value = row[column]
+                text = os.path.split(value)[1] if column == 'path' else \
+                    '' if value is None else value if isinstance(value, str) else f'{value:.6g}'
+                item = QTableWidgetItem(text)
+                if column == 'path':
+                    item.setToolTip(value)
+                self.table.setItem(i, j, item)
+        self.table.resizeColumnsToContents()
+        return True
+
+    @Slot()
+    def accept(self):
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()})
+        self.__files = list(dict.fromkeys(self.__rows[i]['path'] for i in rows))
+        self.timer.stop()
+        return super().accept()
+
+    @Slot()
+    def reject(self):
+        self.timer.stop()
+        return super().reject()
+
+
+class StreamLayout(QFormLayout):
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__()
+
+        self.setSpacing(25)
+        self.setContentsMargins(5, 5, 5, 5)
+        size = QSize(196, 28)
+
+        self._source = QComboBox()
+        self._source.addItems(STREAM_SOURCES)
+        self._source.setFixedSize(size)
+
+        self._address = QLineEdit()
+        self._address.setPlaceholderText('Frequencies, pipe path or host:port')
+        self._address.setText('1000, 2500')
+        self._address.setFixedSize(size)
+
+        self._fs = QLineEdit()
+        self._fs.setValidator(QRegularExpressionValidator(QRegularExpression(r'[0-9]*e?-?.?[0-9]+')))
+        self._fs.setText(str(20000))
+        self._fs.setFixedSize(QSize(96, 28))
+
+        self._size = QSpinBox()
+        self._size.setRange(64, 2 ** 22)
+        self._size.setValue(8192)
+        self._size.setFixedSize(QSize(96, 28))
+
+        self._refresh = QSpinBox()
+        self._refresh.setRange(1, 60)
+        self._refresh.setValue(10)
+        self._refresh.setSuffix(' Hz')
+        self._refresh.setFixedSize(QSize(96, 28))
+
+        self._windows = QComboBox()
+        self._windows.addItems(list(WINDOWS.keys()) + ['None'])
+        self._windows.setFixedSize(size)
+
+        self.addRow('Source', self._source)
+        self.addRow('Address', self._address)
+        self.addRow('Sample rate', self._fs)
+        self.addRow('Buffer size', self._size)
+        self.addRow('Refresh rate', self._refresh)
+        self.addRow('Windows', self._windows)
+
+    def data(self) -> dict:
+        fs = number(self._fs.text(), 'Sample rate')
+        if fs <= 0:
+            raise ValueError(f'Sample rate must be positive, got {fs:g}')
+        return {
+            'source': self._source.currentText(),
+            'address': self._address.text(),
+            'fs': fs,
+            'size': self._size.value(),
+            'refresh': self._refresh.value(),
+            'window': self._windows.currentText()
+        }
+
+
+class StreamEditor(QDialog):
+
+    def __init__(self, parent = None, f = Qt.WindowType.Dialog) -> None:
+        super().__init__(parent, f)
+
+        self._stream: Stream = None
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+
+        self.input = MpCanvas(self, width=5, height=4, dpi=100)
+        self.fft = MpCanvas(self, width=5, height=4, dpi=100)
+
+        layout = QGridLayout()
+        self.setLayout(layout)
+        self.setWindowTitle('Stream')
+        self.setMinimumSize(QSize(1024, 728))
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+
+        self.stream_layout = StreamLayout(parent=self)
+        self._start = QPushButton('Start')
+        self._start.clicked.connect(self.toggle)
+        self.stream_layout.addRow(self._start)
+
+        stream_group = QGroupBox(self)
+        stream_group.setTitle('Stream Settings')
+        stream_group.setLayout(self.stream_layout)
+
+        buttonBox = QDialogButtonBox(Qt.Orientation.Horizontal)
+        buttonBox.setStandardButtons(QDialogButtonBox.StandardButton.Close)
+        buttonBox.rejected.connect(self.reject)
+
+        layout.addWidget(self.input, 0, 0)
+        layout.addWidget(stream_group, 0, 1, 2, 1)
+        layout.addWidget(self.fft, 1, 0)
+        layout.addWidget(buttonBox, 2, 0)
+        layout.setColumnStretch(0, 1)
+
+    def source(self, data: dict):
+        match data['source']:
+            case 'Generator':
+                freqs = [number(f, 'Frequencies') for f in data['address'].split(',') if f.strip()]
+                return GeneratorSource(data['fs'], freqs or (1000., ))
+            case 'Stdin':
+                return StdinSource()
+            case 'Named pipe':
+                return PipeSource(data['address'])
+            case 'TCP socket':
+                host, port = data['address'].rsplit(':', 1)
+                return SocketSource(host or 'localhost', int(port))
+
+    @Slot()
+    def toggle(self):
+        if self._stream and self._stream.running:
+            self.stop()
+            return None
+
+        try:
+            data = self.stream_layout.data()
+        except ValueError as er:
+            QMessageBox.warning(self, 'Stream settings', str(er), QMessageBox.StandardButton.Ok)
+            return None
+        try:
+            source = self.source(data)
+        except (OSError, ValueError) as er:
+            QMessageBox.critical(self, 'Stream error', f'Unable to open the stream source.\nError: {er}',
+                                 QMessageBox.StandardButton.Ok)
+            return None
+
+        # Every array used by refresh is allocated here once per start
+        n = data['size']
+        dt = 1 / data['fs']
+        self._stream = Stream(source, n, dt)
+        self._frame = np.zeros(n)
+        self._windowed = np.zeros(n)
+        self._window = WINDOWS[data['window']](n) if data['window'] in WINDOWS.keys() else np.ones(n)
+        self._time = np.arange(n) * dt
+        self._freq = Input.get_frequency(n, dt)
+        self._amp = np.zeros(self._freq.size)
+
+        self.input.ax.clear()
+        self.fft.ax.clear()
+        for canvas, title in ((self.input, 'Stream'), (self.fft, 'Rolling Amplitude')):
+            canvas.ax.grid(True)
+            canvas.ax.set_title(title)
+        self.input.set_data(self._time, self._frame)
+        self.fft.set_data(self._freq, self._amp)
+
+        self._stream.start()
+        self._timer.start(int(1000 / data['refresh']))
+        self._start.setText('Stop')
+
+    def stop(self):
+        self._timer.stop()
+        if self._stream:
+            self._stream.stop()
+        self._start.setText('Start')
+
+    @Slot()
+    def refresh(self):
+        if self._stream.error:
+            self.stop()
+            QMessageBox.critical(self, 'Stream error', f'Stream interrupted.\nError: {self._stream.error}',
+                                 QMessageBox.StandardButton.Ok)
+            return None
+
+        n = self._stream.buffer.copy_to(self._frame)
+        if n < self._frame.size:
+            if not self._stream.running:
+                self.stop()
+            return None
+
+        np.multiply(self._frame, self._window, out=self._windowed)
+        np.abs(rfft(self._windowed, overwrite_x=True)[:self._amp.size], out=self._amp)
+        self._amp[1:] *= 2 ** 0.5
+        self.input.set_data(self._time, self._frame)
+        self.fft.set_data(self._freq, self._amp)
+
+        if not self._stream.running:
+            self.stop()
+
+    @Slot()
+    def reject(self):
+        self.stop()
+        return super().reject()
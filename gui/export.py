@@ -0,0 +1,145 @@
+import os
+import time
+import multiprocessing
+import numpy as np
+
+
+from concurrent.futures import ProcessPoolExecutor, Future
+
+from matplotlib.figure import Figure
+
+
+# Rendering runs in worker processes on standalone Figure objects, so this
+# module must not import Qt.
+
+
+def file_name(name: str) -> str:
+    # Signal names such as 'file.csv: channel' are not valid file names on
+    # Windows; reserved characters become '_'
+    name = ''.join('_' if c in '<>:"/\\|?*' or ord(c) < 32 else c for c in str(name))
+    return name.strip().rstrip('.') or '_'
+
+
+def render_figure(fname, x, y, *, fmt='png', dpi=600, title=None, xlabel=None, ylabel=None,
+                  xlim=None, linewidth=1.0, style=None, markers=None, legend=None) -> int:
+    fig = Figure(figsize=(5, 4), dpi=100)
+    ax = fig.add_subplot()
+    ax.plot(x, y, linewidth=linewidth, **(style or {}))
+    ax.grid(True)
+    ax.set_title(title if title else 'Graph')
+    if xlim:
+        ax.set_xlim(xlim)
+    ax.set_xlabel(xlabel if xlabel else 'X')
+    ax.set_ylabel(ylabel if ylabel else 'Y')
+    if legend:
+        ax.legend(legend, fontsize=6)
+    if markers:
+        mx, my, labels = markers
+        ax.plot(mx, my, linestyle='', marker='v', color='tab:red')
+        for xi, yi, label in zip(mx, my, labels):
+            ax.annotate(label, (xi, yi), textcoords='offset points',
+                        xytext=(0, 6), ha='center', fontsize=7)
+    fig.savefig(fname, format=fmt, dpi=dpi)
+    return os.path.getsize(fname)
+
+
+def render_image(fname, image, *, extent, fmt='png', dpi=600, title=None, xlabel=None, ylabel=None,
+                 clabel=None, labels=None) -> int:
+    fig = Figure(figsize=(5, 4), dpi=100)
+    ax = fig.add_subplot()
+    artist = ax.imshow(image, aspect='auto', origin='upper', interpolation='nearest', extent=extent)
+    if labels is not None and len(labels) <= 40:
+        step = (extent[2] - extent[3]) / len(labels)
+        ax.set_yticks(extent[3] + step * (np.arange(len(labels)) + 0.5), labels, fontsize=6)
+    fig.colorbar(artist, ax=ax, label=clabel)
+    ax.set_title(title if title else 'Graph')
+    ax.set_xlabel(xlabel if xlabel else 'X')
+    ax.set_ylabel(ylabel if ylabel else 'Y')
+    fig.savefig(fname, format=fmt, dpi=dpi)
+    return os.path.getsize(fname)
+
+
+def write_table(fname, table: dict) -> int:
+    with open(fname, 'w', newline='') as f:
+        f.write(','.join(table.keys()) + '\n')
+        for row in zip(*table.values()):
+            f.write(','.join(str(v) for v in row) + '\n')
+    return os.path.getsize(fname)
+
+
+class ExportQueue:
+
+    def __init__(self, workers: int | None = None) -> None:
+        # workers=0 exports synchronously in the calling thread
+        self._workers = os.cpu_count() if workers is None else workers
+        self._pool = None
+        self._jobs: list[Future] = []
+        self._files = 0
+        self._bytes = 0
+        self._errors = []
+        self._start = None
+        self._busy = 0.0
+
+    @property
+    def pending(self) -> int:
+        self.collect()
+        return len(self._jobs)
+
+    @property
+    def errors(self) -> list:
+        return self._errors
+
+    def submit(self, func, *args, **kwargs) -> Future:
+        if self._start is None or not self._jobs:
+            self._start = time.perf_counter()
+        if not self._workers:
+            future = Future()
+            try:
+                future.set_result(func(*args, **kwargs))
+            except (OSError, ValueError) as er:
+                future.set_exception(er)
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self._workers, mp_context=multiprocessing.get_context('spawn'))
+            future = self._pool.submit(func, *args, **kwargs)
+        future.fname = args[0]
+        self._jobs.append(future)
+        return future
+
+    def figure(self, fname, x, y, **settings) -> Future:
+        return self.submit(render_figure, fname, np.asarray(x), np.asarray(y), **settings)
+
+    def table(self, fname, table: dict) -> Future:
+        return self.submit(write_table, fname, {k: np.asarray(v) for k, v in table.items()})
+
+    def collect(self) -> None:
+        done = [job for job in self._jobs if job.done()]
+        for job in done:
+            self._jobs.remove(job)
+            try:
+                self._bytes += job.result()
+                self._files += 1
+            except (OSError, ValueError, RuntimeError) as er:
+                self._errors.append(f'{os.path.split(job.fname)[1]}: {er}')
+        if done and self._start is not None:
+            self._busy += time.perf_counter() - self._start
+            self._start = time.perf_counter() if self._jobs else None
+
+    def wait(self) -> None:
+        for job in list(self._jobs):
+            try:
+                job.result()
+            except (OSError, ValueError, RuntimeError):
+                pass
+        self.collect()
+
+    def report(self) -> str:
+        self.collect()
+        rate = self._files / self._busy if self._busy else 0.
+        return f'Exported {self._files} files ({self._bytes / 2 ** 20:.2f} MB), ' \
+               f'{rate:.1f} files/s, {len(self._jobs)} pending, {len(self._errors)} errors'
+
+    def shutdown(self) -> None:
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -1,20 +1,30 @@
 import os
+import time
 import shutil
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor, BrokenExecutor
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QGridLayout, QPushButton,
     QVBoxLayout,QLabel, QGroupBox, QHBoxLayout, 
     QFileDialog, QListView, QDialogButtonBox,
-    QMessageBox
+    QMessageBox, QSpinBox, QProgressDialog, QComboBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QFileSystemWatcher, QTimer
 
 
-from gui.editors import SignalEditor, NameEdit
+from gui.editors import (
+    SignalEditor, StreamEditor, CrossEditor, SweepEditor, CatalogEditor, WaterfallEditor,
+    OrderEditor
+)
 from gui.widgets import SignalList, ButtonGroup
-from tools import get_data
-from models.data import InputSignals, Input
-from const import TMP
+from gui.export import ExportQueue
+from tools import load_file, read_csv
+from models.data import InputSignals, Input, MultiInput
+from models.session import save_session, load_session
+from models.catalog import Catalog, Indexer
+from const import TMP, MEMORY_BUDGET, EXPORT_FORMATS, PRECISIONS
 
 
 class View(QMainWindow):
@@ -25,17 +35,41 @@ class View(QMainWindow):
         self.__signals = []
 
         self.__cdir = os.sep
+        self.__pool = None
+        self.__loading = {}
+        self.__errors = []
+        self.import_timer = QTimer(self)
+        self.import_timer.timeout.connect(self.collect_files)
+        self.progress = None
+        self.__catalog = None
+        self.__indexer = None
+        self.index_timer = QTimer(self)
+        self.index_timer.timeout.connect(self.collect_index)
 
         buttons = [
             {'text': 'Add File', 'name': 'add_file', 'enable': True},
+            {'text': 'Stream', 'name': 'stream', 'enable': True},
+            {'text': 'Catalog', 'name': 'catalog', 'enable': True},
+            {'text': 'Open session', 'name': 'open_session', 'enable': True},
+            {'text': 'Save session', 'name': 'save_session', 'enable': False},
             {'text': 'FFT Analisys', 'name': 'fft_analysis', 'enable': False},
+            {'text': 'Cross Analysis', 'name': 'cross_analysis', 'enable': False},
+            {'text': 'Parameter sweep', 'name': 'sweep', 'enable': False},
+            {'text': 'Waterfall', 'name': 'waterfall', 'enable': False},
+            {'text': 'Order Tracking', 'name': 'order_tracking', 'enable': False},
             {'text': 'Regression Analysis', 'name': 'ergression_analysis', 'enable': False},
+            {'text': 'Watch file', 'name': 'watch', 'enable': False},
+            {'text': 'Precision report', 'name': 'precision_report', 'enable': False},
             {'text': 'Delete file', 'name': 'delete', 'enable': False},
             {'text': 'Delete all files', 'name': 'reset', 'enable': False}
         ]
 
         layout = QGridLayout()
 
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.refresh_file)
+        self.__watched = {}
+
         self.data = InputSignals()
         self.data_model = SignalList(self.data)
         self.signalView = QListView()
@@ -47,11 +81,28 @@ class View(QMainWindow):
         btn_layout = QVBoxLayout()
         self.button_group = ButtonGroup(self, btn_layout)
         self.button_group.addPushButton(*buttons)
+        self.__static = [btn['name'] for btn in buttons if btn['enable']]
         self.button_group.buttonClicked.connect(self.click_btn)
         btn_layout.addWidget(QWidget(), 1)
 
+        self.budget = QSpinBox()
+        self.budget.setRange(1, 2 ** 20)
+        self.budget.setSuffix(' MB')
+        self.budget.setValue(MEMORY_BUDGET // 2 ** 20)
+        self.budget.valueChanged.connect(self.set_budget)
+        self.memory = QLabel()
+        self.precision = QComboBox()
+        self.precision.addItems(PRECISIONS.keys())
+        memory_layout = QHBoxLayout()
+        memory_layout.addWidget(QLabel('Memory budget'))
+        memory_layout.addWidget(self.budget)
+        memory_layout.addWidget(QLabel('Precision'))
+        memory_layout.addWidget(self.precision)
+        memory_layout.addWidget(self.memory, 1)
+
         files_layout = QVBoxLayout()
         files_layout.addWidget(self.signalView)
+        files_layout.addLayout(memory_layout)
 
         settings_layout = QHBoxLayout()
         settings_layout.addLayout(btn_layout)
@@ -59,6 +110,33 @@ class View(QMainWindow):
     
         settings_grp.setLayout(settings_layout)
 
+        # Export group
+        self.export_queue = ExportQueue()
+        self.export_timer = QTimer(self)
+        self.export_timer.timeout.connect(self.update_export)
+        self.__export_dir = None
+        self.export_dir = QLabel(f'Destination: {TMP} (moved on Save)')
+        export_btn = QPushButton('Export to...')
+        export_btn.clicked.connect(self.set_export_dir)
+        self.export_format = QComboBox()
+        self.export_format.addItems(EXPORT_FORMATS)
+        self.export_dpi = QSpinBox()
+        self.export_dpi.setRange(50, 2400)
+        self.export_dpi.setSingleStep(50)
+        self.export_dpi.setValue(600)
+        self.export_dpi.setSuffix(' dpi')
+        self.export_status = QLabel()
+        export_layout = QHBoxLayout()
+        export_layout.addWidget(export_btn)
+        export_layout.addWidget(self.export_dir, 1)
+        export_layout.addWidget(self.export_format)
+        export_layout.addWidget(self.export_dpi)
+        export_status_layout = QVBoxLayout()
+        export_status_layout.addLayout(export_layout)
+        export_status_layout.addWidget(self.export_status)
+        export_grp = QGroupBox('Export')
+        export_grp.setLayout(export_status_layout)
+
         # Info group
         self.info = QLabel()
         info_grp = QGroupBox('Info')
@@ -73,87 +151,385 @@ class View(QMainWindow):
         btn_box.rejected.connect(self.reject)
 
         layout.addWidget(settings_grp, 0, 0)
-        layout.addWidget(info_grp, 1, 0)
-        layout.addWidget(btn_box, 2, 0)
+        layout.addWidget(export_grp, 1, 0)
+        layout.addWidget(info_grp, 2, 0)
+        layout.addWidget(btn_box, 3, 0)
 
         w = QWidget()
         w.setLayout(layout)
         self.setCentralWidget(w)
+        self.update_memory()
 
     @property
     def signals(self):
         return self.__signals
 
+    def set_budget(self, value: int):
+        self.data.budget = value * 2 ** 20
+        self.update_memory()
+
+    def update_memory(self):
+        # Analysis caches grow while editors are open, so the budget is
+        # checked again before reporting
+        self.data.enforce()
+        self.memory.setText(f'Resident: {self.data.resident_size / 2 ** 20:.1f} MB, '
+                            f'spilled: {self.data.spilled_size / 2 ** 20:.1f} MB')
+
+    def data_buttons(self):
+        return [btn for btn in self.button_group.buttons() if btn.objectName() not in self.__static]
+
     def click_btn(self, btn: QPushButton):
         
         match btn.objectName():
             case 'add_file':
                 self.add_file()
+            case 'stream':
+                self.stream()
+            case 'catalog':
+                self.catalog()
             case 'fft_analysis':
                 self.fft_analysis()
+            case 'cross_analysis':
+                self.cross_analysis()
+            case 'sweep':
+                self.sweep()
+            case 'waterfall':
+                self.waterfall()
+            case 'order_tracking':
+                self.order_tracking()
             case 'regression_analysis':
                 self.regression_analysis()
             case 'reset':
                 self.reset()
             case 'delete':
                 self.delete()
+            case 'watch':
+                self.watch()
+            case 'precision_report':
+                self.precision_report()
+            case 'open_session':
+                self.open_session()
+            case 'save_session':
+                self.save_session()
 
     def add_file(self):
 
-        file = QFileDialog.getOpenFileName(
-            self, 'Open Input Signal File', self.__cdir,
-            'Excel File (*.xlsx *.xls);; CSV (*.csv)'
+        files = QFileDialog.getOpenFileNames(
+            self, 'Open Input Signal Files', self.__cdir,
+            'Excel File (*.xlsx);; CSV (*.csv)'
         )[0]
-        
-        if file:
-            name_edit = NameEdit(self)
-            name_edit.show()
-            name_edit.exec()
-            name = name_edit.name if name_edit.name else os.path.split(file)[1]
+
+        if files:
+            self.__cdir = os.path.split(files[0])[0]
+        self.load_files(files)
+
+    def load_files(self, files: list):
+        if not files:
+            return None
+
+        # Files are parsed in worker processes; collect_files picks up the
+        # results on a timer so the GUI stays responsive. Files chosen while
+        # an import runs join it.
+        dtype = PRECISIONS[self.precision.currentText()]
+        try:
+            futures = self.submit_files(files, dtype)
+        except BrokenExecutor:
+            # Workers died since the last import
+            self.__pool = None
+            futures = self.submit_files(files, dtype)
+        if self.__loading and self.progress:
+            self.__loading.update(futures)
+            self.progress.setMaximum(self.progress.maximum() + len(files))
+            return None
+        self.__loading = futures
+        self.__errors = []
+
+        self.progress = QProgressDialog('Importing files...', 'Cancel', 0, len(files), self)
+        self.progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.progress.setMinimumDuration(0)
+        self.progress.canceled.connect(self.cancel_import)
+        self.progress.setValue(0)
+        self.import_timer.start(50)
+
+    def submit_files(self, files: list, dtype) -> dict:
+        if self.__pool is None:
+            self.__pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+        return {self.__pool.submit(load_file, file, dtype): file for file in files}
+
+    def signal_name(self, file: str) -> str:
+        name = os.path.split(file)[1]
+        names = [str(s) for s in self.data.signals]
+        i = 1
+        unique = name
+        while unique in names:
+            i += 1
+            unique = f'{name} ({i})'
+        return unique
+
+    def collect_files(self):
+        broken = False
+        for future in [f for f in self.__loading if f.done()]:
+            file = self.__loading.pop(future)
             try:
-                x, y = get_data(file)
-                signal = Input(x, y, file=file, name=name)
-                self.data_model.add(signal)
-                self.button_group.enable(self.button_group.buttons()[1:])
-                self.data_model.layoutChanged.emit()
-                self.__cdir = os.path.split(file)[0]
-            except (AttributeError, IndexError, TypeError) as er:
-                error = QMessageBox()
-                msg = f'During importing data from the file an error ocurred.\n' \
-                      f'The data file must contain numerical data in (x,y) format ' \
-                      f'and must not contain empty lines.\n' \
-                      f'Please try another data file.\n' \
-                      f'Error: {str(er)}'
-                error.critical(self, 'Data import error', msg,
-                               QMessageBox.StandardButton.Ok)
+                x, y, offset, names = future.result()
+                if y.ndim == 2:
+                    for channel in MultiInput(x, y, file=file, names=names).channels:
+                        channel.name = self.signal_name(channel.name)
+                        self.data_model.add(channel)
+                else:
+                    signal = Input(x, y, file=file, name=self.signal_name(file))
+                    signal.offset = offset
+                    self.data_model.add(signal)
+            except BrokenExecutor as er:
+                broken = True
+                self.__errors.append(f'{os.path.split(file)[1]}: {er}')
+            except Exception as er:
+                # One unreadable file (a corrupt workbook, say) must not end the batch
+                self.__errors.append(f'{os.path.split(file)[1]}: {er}')
+            if self.progress:
+                self.progress.setValue(self.progress.value() + 1)
+        if broken:
+            # A worker died; every pending file fails the same way, and the
+            # next import gets a new pool
+            self.__pool.shutdown(wait=False, cancel_futures=True)
+            self.__pool = None
+
+        if self.__loading:
+            return None
+        self.finish_import()
+
+    def cancel_import(self):
+        for future in self.__loading:
+            future.cancel()
+        self.__loading = {}
+        self.finish_import()
+
+    def finish_import(self):
+        self.import_timer.stop()
+        if self.progress:
+            self.progress.reset()
+            self.progress = None
+        if self.data.signals:
+            self.button_group.enable(self.data_buttons())
+        self.data_model.layoutChanged.emit()
+        self.update_memory()
+        if self.__errors:
+            self.info.setText('Data import errors. The data file must contain numerical data in (x,y) format '
+                              'and must not contain empty lines.\n\t' + '\n\t'.join(self.__errors))
+
+    def catalog(self):
+        if self.__catalog is None:
+            self.__catalog = Catalog()
+            self.__indexer = Indexer(self.__catalog)
+        catalog_editor = CatalogEditor(self, catalog=self.__catalog, indexer=self.__indexer, cdir=self.__cdir)
+        catalog_editor.show()
+        catalog_editor.exec()
+        if self.__indexer.running:
+            self.index_timer.start(500)
+        self.load_files(catalog_editor.files)
+
+    def collect_index(self):
+        # Background indexing results are written to the catalog from the GUI thread
+        self.__indexer.collect()
+        if not self.__indexer.running:
+            self.index_timer.stop()
+
+    def stream(self):
+        stream_editor = StreamEditor(self)
+        stream_editor.show()
+        stream_editor.exec()
 
     def fft_analysis(self):
         idx = self.signalView.currentIndex().row()
-        input_signal: Input = self.data.signals[idx]
-        signal_editor = SignalEditor(self, input=input_signal)
+        input_signal: Input = self.data.select(idx)
+        self.update_memory()
+        signal_editor = SignalEditor(self, input=input_signal, export=self.export_queue,
+                                     destination=self.__export_dir, fmt=self.export_format.currentText(),
+                                     dpi=self.export_dpi.value())
         signal_editor.show()
         signal_editor.exec()
+        self.update_export()
 
         if signal_editor.input_signal:
             self.__signals.append((input_signal, signal_editor.input_signal, signal_editor.fft_signal))
 
+    def cross_analysis(self):
+        cross_editor = CrossEditor(self, signals=self.data.signals, export=self.export_queue,
+                                   destination=self.__export_dir, fmt=self.export_format.currentText(),
+                                   dpi=self.export_dpi.value())
+        cross_editor.show()
+        cross_editor.exec()
+        self.update_export()
+        self.update_memory()
+
+    def sweep(self):
+        idx = self.signalView.currentIndex().row()
+        input_signal: Input = self.data.select(idx)
+        self.update_memory()
+        sweep_editor = SweepEditor(self, input=input_signal, export=self.export_queue,
+                                   destination=self.__export_dir, fmt=self.export_format.currentText(),
+                                   dpi=self.export_dpi.value())
+        sweep_editor.show()
+        sweep_editor.exec()
+        self.update_export()
+        self.update_memory()
+
+    def waterfall(self):
+        waterfall_editor = WaterfallEditor(self, signals=self.data.signals, export=self.export_queue,
+                                           destination=self.__export_dir, fmt=self.export_format.currentText(),
+                                           dpi=self.export_dpi.value())
+        waterfall_editor.show()
+        waterfall_editor.exec()
+        self.update_export()
+        self.update_memory()
+
+    def order_tracking(self):
+        order_editor = OrderEditor(self, signals=self.data.signals, export=self.export_queue,
+                                   destination=self.__export_dir, fmt=self.export_format.currentText(),
+                                   dpi=self.export_dpi.value())
+        order_editor.show()
+        order_editor.exec()
+        self.update_export()
+        self.update_memory()
+
+    def set_export_dir(self):
+        export_dir = QFileDialog.getExistingDirectory(
+            self, 'Export Results To', self.__cdir,
+            QFileDialog.Option.ShowDirsOnly | QFileDialog.Option.DontResolveSymlinks
+        )
+        if export_dir:
+            self.__export_dir = export_dir
+            self.export_dir.setText(f'Destination: {export_dir}')
+
+    def update_export(self):
+        if self.export_queue.pending:
+            self.export_timer.start(200)
+        else:
+            self.export_timer.stop()
+        errors = self.export_queue.errors
+        self.export_status.setText(self.export_queue.report() + (f'\n{errors[-1]}' if errors else ''))
+
+    def save_session(self):
+        file = QFileDialog.getSaveFileName(
+            self, 'Save Session', self.__cdir, 'FFT Session (*.fftsession)'
+        )[0]
+        if not file:
+            return None
+        try:
+            size = save_session(file, self.data.signals, self.__signals)
+            self.info.setText(f'Session saved to {file} ({size / 2 ** 20:.2f} MB)')
+        except OSError as er:
+            QMessageBox.critical(self, 'Saving session', f'Session has not been saved. The error occurred {er}',
+                                 QMessageBox.StandardButton.Ok)
+
+    def open_session(self):
+        file = QFileDialog.getOpenFileName(
+            self, 'Open Session', self.__cdir, 'FFT Session (*.fftsession)'
+        )[0]
+        if not file:
+            return None
+        try:
+            start = time.perf_counter()
+            signals, results = load_session(file)
+        except (OSError, ValueError, KeyError) as er:
+            QMessageBox.critical(self, 'Opening session', f'Session has not been opened. The error occurred {er}',
+                                 QMessageBox.StandardButton.Ok)
+            return None
+        for signal in signals:
+            self.data_model.add(signal)
+        self.__signals.extend(results)
+        if self.data.signals:
+            self.button_group.enable(self.data_buttons())
+        self.data_model.layoutChanged.emit()
+        self.update_memory()
+        self.__cdir = os.path.split(file)[0]
+        self.info.setText(f'Session {file} opened in {time.perf_counter() - start:.3f} s: '
+                          f'{len(signals)} signals, {len(results)} results')
+
+    def watch(self):
+        idx = self.signalView.currentIndex().row()
+        signal: Input = self.data.get(idx)
+        if not signal:
+            return None
+        if signal.offset is None:
+            QMessageBox.warning(self, 'Watch file', 'Only CSV files can be watched for appended data.',
+                                QMessageBox.StandardButton.Ok)
+            return None
+
+        signals = self.__watched.setdefault(signal.file, [])
+        if signal in signals:
+            signals.remove(signal)
+        else:
+            signals.append(signal)
+            self.refresh_file(signal.file)
+        if signals and signal.file not in self.watcher.files():
+            self.watcher.addPath(signal.file)
+        elif not signals:
+            self.watcher.removePath(signal.file)
+            self.__watched.pop(signal.file)
+        self.update_info(self.signalView.currentIndex())
+
+    def refresh_file(self, file: str):
+        if not os.path.exists(file):
+            return None
+        for signal in self.__watched.get(file, []):
+            try:
+                x, y, signal.offset = read_csv(file, signal.offset, partial=False)
+            except OSError:
+                # The writer may hold the file; the next change retries
+                continue
+            signal.extend(x, y)
+        if file not in self.watcher.files():
+            self.watcher.addPath(file)
+        self.data.enforce()
+        self.update_memory()
+        if self.signalView.currentIndex().isValid():
+            self.update_info(self.signalView.currentIndex())
+
     def regression_analysis(self):
         pass
 
     def reset(self):
+        if self.watcher.files():
+            self.watcher.removePaths(self.watcher.files())
+        self.__watched.clear()
         self.data.reset()
         for file in os.listdir(TMP):
             os.remove(os.path.abspath(os.path.join(TMP, file)))
-        self.button_group.disable(self.button_group.buttons()[1:])
+        self.button_group.disable(self.data_buttons())
+        self.update_memory()
 
     def delete(self):
         index = self.signalView.currentIndex()
+        signal = self.data.get(index.row())
+        if signal and signal in (watched:=self.__watched.get(signal.file, [])):
+            watched.remove(signal)
         self.data.delete(index.row())
         if len(self.data.signals) == 0:
-            self.button_group.disable(self.button_group.buttons()[1:])
+            self.button_group.disable(self.data_buttons())
+        self.update_memory()
+
+    def precision_report(self):
+        idx = self.signalView.currentIndex().row()
+        input_signal: Input = self.data.select(idx)
+        report = input_signal.precision_report()
+        QMessageBox.information(
+            self, 'Precision report',
+            f'{input_signal.name}: single vs double precision amplitude spectrum\n'
+            f'Stored as {input_signal.dtype}, window {input_signal.window}\n\n'
+            f'Max error: {report["max_error"]:.3g} of the spectrum peak\n'
+            f'RMS error: {report["rms_error"]:.3g} of the spectrum peak\n'
+            f'Peak amplitude error: {report["peak_error"]:.3g}\n'
+            f'Max level difference above -60 dB: {report["max_error_db"]:.3g} dB\n'
+            f'Speedup: {report["speedup"]:.2f}x, memory: {report["memory_ratio"]:.0%}'
+        )
+        self.update_memory()
 
     def update_info(self, signal):
-        self.info.setText(self.data.signals[signal.row()].info)
+        input_signal = self.data.select(signal.row())
+        watched = input_signal in self.__watched.get(input_signal.file, [])
+        self.info.setText(input_signal.info + ('\n\tWatching file for appended rows' if watched else ''))
+        self.update_memory()
 
     def accept(self):
         save_to = QFileDialog.getExistingDirectory(
@@ -164,6 +540,8 @@ class View(QMainWindow):
         if not save_to:            
             return None
         
+        self.export_queue.wait()
+        self.update_export()
         save_from = os.path.abspath(TMP)
         msg = QMessageBox()
 
@@ -182,6 +560,13 @@ class View(QMainWindow):
                          QMessageBox.StandardButton.Ok)
 
     def reject(self):
+        if self.__pool:
+            self.__pool.shutdown(wait=False, cancel_futures=True)
+        if self.__indexer:
+            self.__indexer.shutdown()
+            self.__catalog.close()
+        self.export_queue.wait()
+        self.export_queue.shutdown()
         self.data.reset()
         for file in os.listdir(TMP):
             os.remove(os.path.abspath(os.path.join(TMP, file)))
@@ -0,0 +1,202 @@
+import os
+import sqlite3
+import multiprocessing
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor, BrokenExecutor
+from scipy.fft import rfft, rfftfreq
+
+
+from const import CATALOG, CATALOG_EXTENSIONS
+from tools import load_file
+
+
+# Third-octave band centres anchored at 1 kHz: fc = 1000 * 2 ** (k / 3)
+BANDS = 1000. * 2. ** (np.arange(-20, 14) / 3)
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, mtime REAL, size INTEGER, error TEXT
+);
+CREATE TABLE IF NOT EXISTS signals (
+    path TEXT, channel TEXT, samples INTEGER, fs REAL, duration REAL,
+    mean REAL, rms REAL, peak REAL, crest REAL,
+    PRIMARY KEY (path, channel)
+);
+CREATE TABLE IF NOT EXISTS bands (
+    path TEXT, channel TEXT, band REAL, level REAL,
+    PRIMARY KEY (path, channel, band)
+);
+CREATE INDEX IF NOT EXISTS bands_band ON bands (band);
+'''
+
+
+def summary(x, y) -> tuple:
+    # Statistics of every channel row of y plus RMS levels of the third
+    # octave bands below Nyquist, from one pass and one batched rfft
+    y = np.atleast_2d(y).astype(float, copy=False)
+    n = y.shape[-1]
+    dt = (x[-1] - x[0]) / (n - 1)
+    mean = y.mean(axis=-1)
+    rms = np.sqrt(np.einsum('ij,ij->i', y, y) / n)
+    peak = np.abs(y).max(axis=-1)
+    # Parseval: band mean square from one-sided power of the mean-removed rows
+    power = np.abs(rfft(y - mean[:, None], axis=-1)) ** 2 * (2 / n ** 2)
+    power[:, 0] /= 2
+    freq = rfftfreq(n, dt)
+    edges = np.searchsorted(freq, BANDS[:, None] * 2. ** np.array([-1 / 6, 1 / 6]))
+    bands = [(fc, np.sqrt(power[:, lo:hi].sum(axis=-1))) for fc, (lo, hi) in zip(BANDS, edges)
+             if fc * 2 ** (1 / 6) <= 0.5 / dt and hi > lo]
+    stats = {
+        'samples': n, 'fs': 1 / dt, 'duration': n * dt,
+        'mean': mean, 'rms': rms, 'peak': peak,
+        'crest': np.divide(peak, rms, out=np.zeros_like(peak), where=rms > 0)
+    }
+    return stats, bands
+
+
+def index_file(file: str) -> tuple:
+    # Worker entry point: rows for the signals and bands tables
+    x, y, offset, names = load_file(file)
+    stats, bands = summary(np.asarray(x), y)
+    signals = [(file, name, stats['samples'], stats['fs'], stats['duration'], stats['mean'][i],
+                stats['rms'][i], stats['peak'][i], stats['crest'][i]) for i, name in enumerate(names)]
+    levels = [(file, name, fc, level[i]) for fc, level in bands for i, name in enumerate(names)]
+    return [tuple(v.item() if isinstance(v, np.generic) else v for v in row) for row in signals], \
+        [tuple(v.item() if isinstance(v, np.generic) else v for v in row) for row in levels]
+
+
+class Catalog:
+
+    def __init__(self, path: str = CATALOG) -> None:
+        self._path = path
+        self._db = sqlite3.connect(path)
+        self._db.executescript(SCHEMA)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def close(self) -> None:
+        self._db.close()
+
+    def changed(self, directory: str) -> list:
+        # Recordings under directory that are new or differ in mtime or size
+        known = {path: (mtime, size) for path, mtime, size in
+                 self._db.execute('SELECT path, mtime, size FROM files')}
+        files = []
+        for root, _, names in os.walk(directory):
+            for name in names:
+                if os.path.splitext(name)[1].lower() not in CATALOG_EXTENSIONS:
+                    continue
+                path = os.path.abspath(os.path.join(root, name))
+                stat = os.stat(path)
+                if known.get(path) != (stat.st_mtime, stat.st_size):
+                    files.append(path)
+        return files
+
+    def store(self, file: str, signals=(), bands=(), error: str = None) -> None:
+        stat = os.stat(file)
+        with self._db:
+            self._db.execute('DELETE FROM signals WHERE path = ?', (file, ))
+            self._db.execute('DELETE FROM bands WHERE path = ?', (file, ))
+            self._db.executemany('INSERT INTO signals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', signals)
+            self._db.executemany('INSERT INTO bands VALUES (?, ?, ?, ?)', bands)
+            self._db.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)',
+                             (file, stat.st_mtime, stat.st_size, error))
+
+    def remove_missing(self) -> int:
+        missing = [(path, ) for path, in self._db.execute('SELECT path FROM files') if not os.path.exists(path)]
+        with self._db:
+            for table in ('files', 'signals', 'bands'):
+                self._db.executemany(f'DELETE FROM {table} WHERE path = ?', missing)
+        return len(missing)
+
+    def query(self, *, fmin: float = None, fmax: float = None, name: str = None, min_fs: float = None,
+              min_duration: float = None, order: str = 'band_rms', limit: int = 500) -> list:
+        # Signals as dicts; band_rms combines the third octave bands whose
+        # centre lies in [fmin, fmax] and is None without a band
+        columns = ['path', 'channel', 'samples', 'fs', 'duration', 'mean', 'rms', 'peak', 'crest']
+        band = fmin is not None or fmax is not None
+        sql = f'SELECT {", ".join("s." + c for c in columns)}, ' \
+              f'{"sqrt(sum(b.level * b.level))" if band else "NULL"} AS band_rms FROM signals s '
+        args = []
+        if band:
+            sql += 'JOIN bands b ON b.path = s.path AND b.channel = s.channel AND b.band BETWEEN ? AND ? '
+            args += [fmin if fmin is not None else 0., fmax if fmax is not None else float('inf')]
+        conditions = []
+        if name:
+            conditions.append('(s.path LIKE ? OR s.channel LIKE ?)')
+            args += [f'%{name}%'] * 2
+        if min_fs:
+            conditions.append('s.fs >= ?')
+            args.append(min_fs)
+        if min_duration:
+            conditions.append('s.duration >= ?')
+            args.append(min_duration)
+        if conditions:
+            sql += 'WHERE ' + ' AND '.join(conditions) + ' '
+        sql += 'GROUP BY s.path, s.channel '
+        if order not in columns + ['band_rms'] or (order == 'band_rms' and not band):
+            order = 'rms'
+        sql += f'ORDER BY {order} DESC LIMIT ?'
+        args.append(limit)
+        return [dict(zip(columns + ['band_rms'], row)) for row in self._db.execute(sql, args)]
+
+
+class Indexer:
+
+    # Summaries are computed in worker processes; results are written to
+    # the catalog by whoever calls collect(), since sqlite connections stay
+    # in the thread that opened them.
+
+    def __init__(self, catalog: Catalog, workers: int | None = None) -> None:
+        self._catalog = catalog
+        self._workers = workers
+        self._pool = None
+        self._jobs = {}
+        self.done = 0
+        self.total = 0
+        self.errors = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._jobs)
+
+    def start(self, directory: str) -> int:
+        files = [file for file in self._catalog.changed(directory) if file not in self._jobs.values()]
+        if files and self._pool is None:
+            self._pool = ProcessPoolExecutor(self._workers, mp_context=multiprocessing.get_context('spawn'))
+        self._jobs.update({self._pool.submit(index_file, file): file for file in files})
+        self.total += len(files)
+        return len(files)
+
+    def collect(self) -> int:
+        done = [job for job in self._jobs if job.done()]
+        for job in done:
+            file = self._jobs.pop(job)
+            try:
+                self._catalog.store(file, *job.result())
+            except (OSError, BrokenExecutor) as er:
+                self.errors.append(f'{os.path.split(file)[1]}: {er}')
+            except (AttributeError, IndexError, TypeError, ValueError, RuntimeError) as er:
+                # Unreadable files are recorded too so they are skipped until they change
+                self._catalog.store(file, error=str(er))
+                self.errors.append(f'{os.path.split(file)[1]}: {er}')
+            self.done += 1
+        if not self._jobs:
+            self.done = self.total = 0
+        return len(done)
+
+    def cancel(self) -> None:
+        for job in self._jobs:
+            job.cancel()
+        self._jobs = {}
+        self.done = self.total = 0
+
+    def shutdown(self) -> None:
+        self.cancel()
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
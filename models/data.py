@@ -1,39 +1,134 @@
+import os
+import time
 import numpy as np
 
-from scipy.fft import fft, fftfreq
+from concurrent.futures import ThreadPoolExecutor
+
+from scipy.fft import fft, ifft, fftfreq, rfft, rfftfreq, next_fast_len
+from scipy.signal import lfilter, zoom_fft, resample_poly
 
 
 from typing import Sequence, Tuple
 from abc import ABCMeta, abstractmethod, abstractproperty
 
 
-from const import WINDOWS as windows
+from const import WINDOWS as windows, MEMORY_BUDGET, SPILL, CACHE_BYTES, ENVELOPE_BLOCK, ORDER_CHUNK, \
+    EVENT_CHUNK
+from models.filters import apply_filter
+
+
+# Default for update() arguments where None is a meaningful value
+UNCHANGED = object()
+
+
+class UniformAxis:
+
+    # Evenly spaced axis stored as (x0, dt, N); values are synthesized on
+    # access so it can stand in for the explicit time array.
+
+    def __init__(self, x0: float, dt: float, n: int) -> None:
+        self._x0 = float(x0)
+        self._dt = float(dt)
+        self._n = int(n)
+
+    @classmethod
+    def detect(cls, x, rtol: float = 1e-2):
+        x = np.asarray(x, dtype=float)
+        if x.ndim != 1 or x.size < 2:
+            return None
+        dt = (x[-1] - x[0]) / (x.size - 1)
+        if dt <= 0:
+            return None
+        if np.abs(x - (x[0] + dt * np.arange(x.size))).max() > rtol * dt:
+            return None
+        return cls(x[0], dt, x.size)
+
+    @property
+    def x0(self) -> float:
+        return self._x0
+
+    @property
+    def dt(self) -> float:
+        return self._dt
+
+    @property
+    def size(self) -> int:
+        return self._n
+
+    @property
+    def shape(self) -> Tuple:
+        return (self._n, )
+
+    @property
+    def ndim(self) -> int:
+        return 1
+
+    @property
+    def dtype(self):
+        return np.dtype(float)
+
+    @property
+    def nbytes(self) -> int:
+        return 0
+
+    @property
+    def values(self):
+        return self._x0 + self._dt * np.arange(self._n)
+
+    def searchsorted(self, value, side='left'):
+        pos = (value - self._x0) / self._dt
+        idx = np.ceil(pos - 1e-2) if side == 'left' else np.floor(pos + 1e-2) + 1
+        return int(np.clip(idx, 0, self._n))
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(self._n)
+            return UniformAxis(self._x0 + start * self._dt, step * self._dt, len(range(start, stop, step)))
+        if isinstance(idx, (int, np.integer)):
+            if not -self._n <= idx < self._n:
+                raise IndexError('Axis index out of range')
+            return self._x0 + (idx % self._n) * self._dt
+        return self._x0 + np.arange(self._n)[idx] * self._dt
+
+    def __iter__(self):
+        return (self._x0 + i * self._dt for i in range(self._n))
+
+    def __array__(self, dtype=None, copy=None):
+        return self.values if dtype is None else self.values.astype(dtype)
+
+    def __repr__(self) -> str:
+        return f'UniformAxis(x0={self._x0}, dt={self._dt}, N={self._n})'
 
 
 class Signal(metaclass=ABCMeta):
     
-    def __init__(self, x, y, *, file, xlabel, ylabel, name, xlim, window=None, sub_mean=False) -> None:
-        self._x: Sequence = np.array(x)
-        self._y: Sequence = np.array(y)
+    def __init__(self, x, y, *, file, xlabel, ylabel, name, xlim, window=None, sub_mean=False, copy=True) -> None:
+        # Memory-mapped arrays and prepared axes are kept as they are;
+        # copy=False shares the given arrays (e.g. channel rows)
+        if isinstance(x, (UniformAxis, np.memmap)) or not copy:
+            self._x: Sequence = x
+        else:
+            self._x: Sequence = UniformAxis.detect(x) or np.array(x)
+        self._y: Sequence = y if isinstance(y, np.memmap) or not copy else np.array(y)
         self._xlabel: str = xlabel
         self._ylabel: str = ylabel
         self._name: str = name
         self._xlim: Tuple = xlim
         self._file: str = file
         self._window: str = window
-        self._sub_mean: bool = False
+        self._sub_mean: bool = sub_mean
+        self._buffers: dict = {}
+        self._spill_files: list = []
+        self.offset: int = None
 
     def __min__(self):
-        try:
-            return np.where(self._xlim[0] >= self._x)[0][-1]
-        except IndexError:
-            return 0
+        return max(self._x.searchsorted(self._xlim[0], 'right') - 1, 0)
         
     def __max__(self):
-        try:
-            return np.where(self._xlim[1] <= self._x)[0][0]
-        except IndexError:
-            return self._x.size - 1
+        return min(self._x.searchsorted(self._xlim[1], 'left'), self._x.size - 1)
 
     @property
     def x(self):
@@ -65,6 +160,46 @@ class Signal(metaclass=ABCMeta):
     def file(self):
         return self._file
 
+    @property
+    def nbytes(self) -> int:
+        return self._x.nbytes + self._y.nbytes
+
+    @property
+    def spilled(self) -> bool:
+        return isinstance(self._y, np.memmap)
+
+    def spill(self, path: str) -> None:
+        # Arrays are written to .npy files and replaced by read-only memory maps
+        if self.spilled:
+            return None
+        self._buffers.clear()
+        for attr in ('_x', '_y'):
+            values = getattr(self, attr)
+            if isinstance(values, np.ndarray):
+                fname = f'{path}{attr}.npy'
+                np.save(fname, values)
+                setattr(self, attr, np.load(fname, mmap_mode='r'))
+                self._spill_files.append(fname)
+
+    def load(self) -> None:
+        if not self.spilled:
+            return None
+        self._buffers.clear()
+        for attr in ('_x', '_y'):
+            values = getattr(self, attr)
+            if isinstance(values, np.memmap):
+                setattr(self, attr, np.array(values))
+        self.remove_spill_files()
+
+    def remove_spill_files(self) -> None:
+        # Only our own spill files are removed, never mapped session files
+        for fname in self._spill_files:
+            try:
+                os.remove(fname)
+            except OSError:
+                pass
+        self._spill_files.clear()
+
     @property
     def window(self):
         return self._window
@@ -90,7 +225,7 @@ class Signal(metaclass=ABCMeta):
     @name.setter
     def name(self, name: str):
         if not isinstance(name, str): raise TypeError('Unsupported type for name')
-        self._xlabel = name
+        self._name = name
 
     @xlim.setter
     def xlim(self, limits: Tuple):
@@ -106,6 +241,42 @@ class Signal(metaclass=ABCMeta):
             raise TypeError('Unsupported type for subtrackt mean. Supported type \'bool\'')
         self._sub_mean = subtrackt
 
+    def _append(self, attr: str, values) -> None:
+        # Arrays live in a buffer with spare capacity that doubles when
+        # full, so repeated appends cost amortized O(1) per sample.
+        current = getattr(self, attr)
+        n, m = current.size, values.size
+        buffer = self._buffers.get(attr)
+        if buffer is None or n + m > buffer.size:
+            buffer = np.empty(max(2 * n, n + m), dtype=np.result_type(current, values))
+            buffer[:n] = current
+            self._buffers[attr] = buffer
+        buffer[n:n + m] = values
+        setattr(self, attr, buffer[:n + m])
+
+    def extend(self, x, y) -> int:
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=self._y.dtype)
+        self.load()
+
+        # Rows at or before the current end were already read
+        keep = x > self._x[-1]
+        x, y = x[keep], y[keep]
+        if not x.size:
+            return 0
+
+        if isinstance(self._x, UniformAxis):
+            n, dt = self._x.size, self._x.dt
+            expected = self._x.x0 + dt * (n + np.arange(x.size))
+            if np.abs(x - expected).max() <= 1e-2 * dt:
+                self._x = UniformAxis(self._x.x0, dt, n + x.size)
+            else:
+                self._x = self._x.values
+        if not isinstance(self._x, UniformAxis):
+            self._append('_x', x)
+        self._append('_y', y)
+        return x.size
+
     @abstractmethod
     def crop(self, xmin, xmax) -> Sequence:
         pass
@@ -149,11 +320,151 @@ class SignalCash(metaclass=ABCMeta):
 
 
 class Input(Signal):
+
+    _selective_cost = None
     
-    def __init__(self, x, y, *, file, xlabel='X', ylabel='Y', name='Plot', xlim=None, window=None) -> None:
-        super().__init__(x, y, file=file, xlabel=xlabel, ylabel=ylabel, name=name, xlim=xlim, window=window)
+    def __init__(self, x, y, *, file, xlabel='X', ylabel='Y', name='Plot', xlim=None, window=None,
+                 sub_mean=False, filter=None, decimation=1, stats=None, copy=True) -> None:
+        super().__init__(x, y, file=file, xlabel=xlabel, ylabel=ylabel, name=name, xlim=xlim,
+                         window=window, sub_mean=sub_mean, copy=copy)
+        self._filter = tuple(filter) if filter else None
+        self._decimation = max(int(decimation), 1)
         if not self.xlim:
             self._xlim = (self._x[0], self._x[-1])
+        self._stats = np.zeros(4)
+        if stats is None:
+            self.update_stats(self._y)
+        else:
+            self._stats[:] = stats
+        self._cache = {}
+        self._cache_bytes = 0
+        self._events = {}
+
+    def cached(self, key, func):
+        # Derived arrays keyed by the settings they depend on; cleared when
+        # the data change or are spilled. Oldest entries are dropped to stay
+        # within CACHE_BYTES, the newest one is always kept.
+        if key not in self._cache:
+            value = func()
+            size = self.sizeof(value)
+            while self._cache and self._cache_bytes + size > CACHE_BYTES:
+                self._cache_bytes -= self._cache.pop(next(iter(self._cache)))[1]
+            self._cache[key] = (value, size)
+            self._cache_bytes += size
+        return self._cache[key][0]
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self._cache_bytes = 0
+
+    @property
+    def cache_bytes(self) -> int:
+        return self._cache_bytes
+
+    @classmethod
+    def sizeof(cls, value) -> int:
+        if isinstance(value, np.memmap):
+            return 0
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, dict):
+            value = value.values()
+        if isinstance(value, (tuple, list, type({}.values()))):
+            return sum(cls.sizeof(v) for v in value)
+        return 0
+
+    @property
+    def nbytes(self) -> int:
+        return super().nbytes + self._cache_bytes
+
+    def spill(self, path: str) -> None:
+        self.clear_cache()
+        super().spill(path)
+
+    def key(self, name: str, *args) -> Tuple:
+        # Cache key for data derived from the current processing settings
+        return (name, tuple(self._xlim), self._sub_mean, self._window, self._filter, self._decimation) + args
+
+    @property
+    def filter(self):
+        return self._filter
+
+    @property
+    def decimation(self) -> int:
+        return self._decimation
+
+    @property
+    def processed_dt(self):
+        return self.dt * self._decimation
+
+    @property
+    def state(self) -> dict:
+        return {
+            'name': self._name,
+            'file': self._file,
+            'xlabel': self._xlabel,
+            'ylabel': self._ylabel,
+            'xlim': [float(i) for i in self._xlim],
+            'window': self._window,
+            'sub_mean': self._sub_mean,
+            'filter': list(self._filter) if self._filter else None,
+            'decimation': self._decimation,
+            'offset': self.offset,
+            'stats': self._stats.tolist()
+        }
+
+    def update_stats(self, y) -> None:
+        # Running count, sum, sum of squares and peak of the whole record
+        if not y.size:
+            return None
+        self._stats += (y.size, y.sum(dtype=np.float64), np.square(y, dtype=np.float64).sum(), 0)
+        self._stats[3] = max(self._stats[3], np.abs(y).max())
+
+    @property
+    def dtype(self):
+        return self._y.dtype
+
+    def precision_report(self) -> dict:
+        # Current settings processed in double and in single precision. For
+        # signals already stored in single precision the double reference
+        # starts from the stored values, so storage rounding is not included.
+        results = {}
+        for dtype in (np.float64, np.float32):
+            y = self.process(self.y.astype(dtype), self.dt, filter=self._filter, decimation=self._decimation,
+                             sub_mean=self._sub_mean, window=self._window)
+            start = time.perf_counter()
+            amplitude = self.get_amplitude(y)[:y.size // 2]
+            results[dtype] = (amplitude, time.perf_counter() - start, y.nbytes)
+        (double, t64, b64), (single, t32, b32) = results[np.float64], results[np.float32]
+        error = np.abs(single - double)
+        scale = double.max() or 1.
+        top = np.argmax(double)
+        with np.errstate(divide='ignore'):
+            db = np.abs(20 * np.log10(single / double))[double >= 1e-3 * scale]
+        return {
+            'max_error': float(error.max() / scale),
+            'rms_error': float(np.sqrt((error ** 2).mean()) / scale),
+            'max_error_db': float(np.nanmax(db)) if db.size else 0.,
+            'peak_error': float(abs(single[top] - double[top]) / scale),
+            'speedup': t64 / t32 if t32 else float('nan'),
+            'memory_ratio': b32 / b64
+        }
+
+    @property
+    def stats(self) -> dict:
+        n, total, squares, peak = self._stats
+        return {'mean': total / n, 'rms': (squares / n) ** 0.5, 'peak': peak}
+
+    def extend(self, x, y) -> int:
+        follow = self._xlim[1] >= self._x[-1]
+        n = super().extend(x, y)
+        if n:
+            self.clear_cache()
+            self._events.clear()
+            self.update_stats(self._y[-n:])
+            if follow:
+                self._xlim = (self._xlim[0], self._x[-1])
+        return n
 
     @property
     def dt(self):
@@ -168,51 +479,573 @@ class Input(Signal):
         return f'Input Signal Name: {self.name}\n\tInput file: {self.file}\n' \
         f'\t{self._xlabel}: step = {self.dt} Interval: {self.x[0]} ... {self.x[-1]}\n' \
         f'\tInterval boundaries: xmin = {self._xlim[0]}, xmax = {self._xlim[1]}\n' \
-        f'\twindow function {self._window}'
+        f'\twindow function {self._window}, filter {self._filter}, decimation {self._decimation}\n' \
+        f'\tMean = {self.stats["mean"]:.6g}, RMS = {self.stats["rms"]:.6g}, Peak = {self.stats["peak"]:.6g}\n' \
+        f'\tMemory: {self.nbytes / 2 ** 20:.2f} MB, {self.dtype} samples ' \
+        f'({"uniform" if isinstance(self._x, UniformAxis) else "explicit"} time axis)'
 
     def crop(self, xmin, xmax):
-        imin, imax = np.where(xmin >= self._x)[0][-1], np.where(xmax <= self._x)[0][0]
+        imin, imax = self._x.searchsorted(xmin, 'right') - 1, self._x.searchsorted(xmax, 'left')
+        if imin < 0 or imax >= self._x.size:
+            raise IndexError('Crop limits are out of the signal range')
         self.xlim = (self._x[imin], self._x[imax])
         return (imin, imax)
 
     @classmethod
     def get_frequency(cls, n, dt):
         fs = 1 / dt
-        return np.array([j * fs / n for j in range(int(n / 2))])
+        return np.arange(int(n / 2)) * fs / n
     
     @classmethod
-    def get_spectral_density(cls, signal):
-        return np.array([abs(phi) ** 2 if i == 0 else 2 * abs(phi) ** 2 for i, phi in enumerate(cls.get_fft(signal))])
+    def get_spectral_density(cls, signal, spectrum=None, dc: bool = True):
+        # dc tells whether spectrum[0] is the zero frequency bin
+        spectrum = cls.get_fft(signal) if spectrum is None else spectrum
+        density = 2 * np.abs(spectrum) ** 2
+        if dc:
+            density[0] /= 2
+        return density
 
     @classmethod
-    def get_amplitude(cls, signal):
-        density = cls.get_spectral_density(signal)
+    def get_amplitude(cls, signal, spectrum=None, dc: bool = True):
+        density = cls.get_spectral_density(signal, spectrum, dc)
         return density ** 0.5
     
     @classmethod
-    def get_sound_pressure_level(cls, signal, pref: float = 2e-5):
-        density = cls.get_spectral_density(signal)
+    def get_sound_pressure_level(cls, signal, pref: float = 2e-5, spectrum=None, dc: bool = True):
+        density = cls.get_spectral_density(signal, spectrum, dc)
         return 10 * np.log((density ** 2) / (pref ** 2))
 
     @classmethod
-    def get_sound_amplitude(cls, signal, pref: float = 2e-5):
-        density = cls.get_spectral_density(signal)
+    def get_sound_amplitude(cls, signal, pref: float = 2e-5, spectrum=None, dc: bool = True):
+        density = cls.get_spectral_density(signal, spectrum, dc)
         return 10 * np.log(((density ** 2) / (pref ** 2)) ** 0.5)
 
     @classmethod
-    def get_fft(cls, signal):
-        return fft(signal)
+    def get_analytic(cls, signal, dt, fmin: float, fmax: float, spectrum=None):
+        # Band limited analytic signal: negative frequencies and bins outside
+        # [fmin, fmax] are zeroed, positive ones doubled. A precomputed
+        # spectrum may be zero padded, the result is cut to the signal length.
+        spectrum = fft(signal) if spectrum is None else spectrum
+        freq = fftfreq(spectrum.size, dt)
+        gain = np.where((freq >= fmin) & (freq <= fmax), 2., 0.)
+        gain[0] = 1. if fmin <= 0 else 0.
+        return ifft(spectrum * gain)[:signal.size]
+
+    @classmethod
+    def get_envelope_spectrum(cls, signal, dt, fmin: float, fmax: float, spectrum=None, window: str = None,
+                              block: int = ENVELOPE_BLOCK):
+        # Amplitude spectrum of the mean-removed envelope of the [fmin, fmax]
+        # band, the window tapers the envelope. Records longer than block are
+        # split into half overlapping blocks whose tapered (Hann by default)
+        # envelope densities are averaged and scaled to the level of a single
+        # full-length transform.
+        if not 0 <= fmin < fmax <= 0.5 / dt:
+            raise ValueError('Envelope band must lie between 0 and the Nyquist frequency')
+        n = signal.size
+        if n <= block:
+            envelope = np.abs(cls.get_analytic(signal, dt, fmin, fmax, spectrum))
+            envelope = envelope - envelope.mean()
+            envelope = cls.window_signal(envelope, window) if window in windows.keys() else envelope
+            freq = cls.get_frequency(n, dt)
+            return freq, cls.get_amplitude(envelope)[:freq.size]
+
+        taper = windows[window if window in windows.keys() else 'Hanning'](block)
+        starts = list(range(0, n - block + 1, block // 2))
+        if starts[-1] != n - block:
+            starts.append(n - block)
+        density = np.zeros(block // 2 + 1)
+        for start in starts:
+            envelope = np.abs(cls.get_analytic(signal[start:start + block], dt, fmin, fmax))
+            density += np.abs(rfft((envelope - envelope.mean()) * taper)) ** 2
+        freq = cls.get_frequency(block, dt)
+        # A full-length transform tapered by the same window loses its coherent gain
+        gain = taper.mean() if window in windows.keys() else 1.
+        amplitude = np.sqrt(2 * density[:freq.size] / len(starts)) * (n * gain / taper.sum())
+        amplitude[0] /= 2 ** 0.5
+        return freq, amplitude
+
+    @classmethod
+    def get_zoom_fft(cls, signal, dt, fmin: float, fmax: float, m: int):
+        # Chirp-z evaluation of m equally spaced bins in [fmin, fmax]. Costs
+        # about one FFT of length N + m instead of a zero padded FFT of
+        # length 1 / (dt * resolution).
+        if not 0 <= fmin < fmax <= 0.5 / dt:
+            raise ValueError('Zoom band must lie between 0 and the Nyquist frequency')
+        freq = np.linspace(fmin, fmax, m)
+        return freq, zoom_fft(signal, [fmin, fmax], m=m, fs=1 / dt, endpoint=True)
+
+    @classmethod
+    def correlation_length(cls, n: int) -> int:
+        # Zero padding to at least 2N - 1 keeps the circular wrap out of the result
+        return next_fast_len(2 * n - 1)
 
     @classmethod
-    def window_signal(cls, signal, w: str) -> Sequence:
+    def get_autocorrelation(cls, signal, spectrum=None):
         n = signal.size
-        return signal * windows[w](n)
+        spectrum = fft(signal, cls.correlation_length(n)) if spectrum is None else spectrum
+        r = ifft(np.abs(spectrum) ** 2).real[:n]
+        return r / r[0] if r[0] else r
 
     @classmethod
-    def subtrackt_mean(cls, signal):
-        return signal - signal.mean()
+    def get_cepstrum(cls, signal, spectrum=None):
+        spectrum = cls.get_fft(signal) if spectrum is None else spectrum
+        magnitude = np.abs(spectrum)
+        return ifft(np.log(np.maximum(magnitude, np.finfo(float).tiny * magnitude.max()))).real[:signal.size // 2]
 
-    def update(self, *, xlabel=None, ylabel=None, xlim=None, window=None, sub_mean=None) -> None:
+    @classmethod
+    def get_fft(cls, signal, axis: int = -1):
+        return fft(signal, axis=axis)
+
+    @classmethod
+    def get_goertzel(cls, signal, freqs, dt, state=None):
+        # Goertzel recurrence run through lfilter for each target frequency.
+        # The returned state can be passed back in with the next chunk of a
+        # long signal; values always refer to all samples seen so far.
+        w = 2 * np.pi * np.asarray(freqs, dtype=float) * dt
+        zi, n = state if state else (np.zeros((w.size, 2)), 0)
+        zf = np.empty_like(zi)
+        for i, wi in enumerate(w):
+            _, zf[i] = lfilter([1.], [1., -2 * np.cos(wi), 1.], signal, zi=zi[i])
+        n += signal.size
+        s1 = -zf[:, 1]
+        s2 = 2 * np.cos(w) * s1 - zf[:, 0]
+        values = np.exp(-1j * w * (n - 1)) * (s1 - np.exp(-1j * w) * s2)
+        return values, (zf, n)
+
+    @classmethod
+    def selective_method(cls, n: int, k: int) -> str:
+        if not cls._selective_cost:
+            x = np.random.default_rng(0).standard_normal(2 ** 14)
+            freqs = np.arange(8) / x.size
+            t0 = time.perf_counter()
+            cls.get_fft(x)
+            t1 = time.perf_counter()
+            cls.get_goertzel(x, freqs, 1.0)
+            t2 = time.perf_counter()
+            cls._selective_cost = ((t1 - t0) / (x.size * np.log2(x.size)), (t2 - t1) / (x.size * freqs.size))
+        fft_cost, goertzel_cost = cls._selective_cost
+        return 'goertzel' if goertzel_cost * n * k < fft_cost * n * np.log2(max(n, 2)) else 'fft'
+
+    @classmethod
+    def get_selective_fft(cls, signal, freqs, dt, method: str = 'auto'):
+        # Target frequencies are snapped to the signal's FFT bins so both
+        # methods return the same values as the full spectrum.
+        n = signal.size
+        freqs = np.asarray(freqs, dtype=float)
+        if not freqs.size:
+            raise ValueError('No target frequencies')
+        if np.any((freqs < 0) | (freqs > 0.5 / dt)):
+            raise ValueError(f'Target frequencies must lie between 0 and the Nyquist frequency {0.5 / dt:g}')
+        bins = np.clip(np.rint(freqs * n * dt).astype(int), 0, n // 2 - 1)
+        freq = bins / (n * dt)
+        if method == 'auto':
+            method = cls.selective_method(n, bins.size)
+        if method == 'fft':
+            return freq, cls.get_fft(signal)[bins]
+        elif method == 'goertzel':
+            return freq, cls.get_goertzel(signal, freq, dt)[0]
+        raise ValueError(f'Unsupported selective method {method}')
+
+    @classmethod
+    def get_selective_amplitude(cls, signal, freqs, dt, method: str = 'auto'):
+        freq, values = cls.get_selective_fft(signal, freqs, dt, method)
+        amplitude = np.abs(values)
+        amplitude[freq != 0] *= 2 ** 0.5
+        return freq, amplitude
+
+    @classmethod
+    def get_peaks(cls, freq, spectrum, k: int = 10):
+        # Top-k local maxima along the last axis. argpartition keeps the
+        # selection O(n); only the k winners are sorted.
+        spectrum = np.asarray(spectrum, dtype=float)
+        if spectrum.shape[-1] < 3 or k < 1:
+            raise ValueError('Spectrum must contain at least 3 points and k must be positive')
+        left, mid, right = spectrum[..., :-2], spectrum[..., 1:-1], spectrum[..., 2:]
+        candidates = np.where((mid > left) & (mid >= right), mid, -np.inf)
+        k = min(k, candidates.shape[-1])
+        top = np.argpartition(-candidates, k - 1, axis=-1)[..., :k]
+        top = np.take_along_axis(top, np.argsort(-np.take_along_axis(candidates, top, axis=-1), axis=-1), axis=-1)
+        found = np.isfinite(np.take_along_axis(candidates, top, axis=-1))
+
+        # Quadratic interpolation on log amplitude around each maximum
+        idx = top + 1
+        a, b, c = (np.log(np.maximum(np.take_along_axis(spectrum, idx + i, axis=-1), np.finfo(float).tiny))
+                   for i in (-1, 0, 1))
+        denom = a - 2 * b + c
+        p = np.divide(0.5 * (a - c), denom, out=np.zeros_like(denom), where=denom != 0)
+        df = freq[1] - freq[0]
+        peak_freq = np.where(found, freq[0] + (idx + p) * df, np.nan)
+        peak_amp = np.where(found, np.exp(b - 0.25 * (a - c) * p), np.nan)
+
+        if peak_freq.ndim == 1:
+            return peak_freq[found], peak_amp[found]
+        return peak_freq, peak_amp
+
+    @classmethod
+    def group_harmonics(cls, freq, tol: float = 0.02):
+        # Each peak is assigned to the lowest peak it is an integer multiple of
+        freq = np.asarray(freq, dtype=float)
+        ratio = freq[:, None] / freq[None, :]
+        order = np.rint(ratio)
+        harmonic = (order >= 1) & (np.abs(ratio - order) <= tol * order)
+        fundamental = np.arange(freq.size)
+        for j in np.argsort(freq):
+            if fundamental[j] != j:
+                continue
+            members = harmonic[:, j] & (fundamental == np.arange(freq.size))
+            fundamental[members] = j
+        return fundamental, order[np.arange(freq.size), fundamental].astype(int)
+
+    @classmethod
+    def window_signal(cls, signal, w: str, axis: int = -1) -> Sequence:
+        n = signal.shape[axis]
+        shape = [1] * signal.ndim
+        shape[axis] = n
+        return signal * windows[w](n).astype(signal.dtype, copy=False).reshape(shape)
+
+    @classmethod
+    def filter_signal(cls, signal, spec: Tuple, dt: float):
+        # spec as described in models.filters; filters along the last axis
+        return apply_filter(signal, spec, dt)
+
+    @classmethod
+    def decimate(cls, signal, q: int):
+        # Polyphase resampling by 1/q with resample_poly's anti-aliasing FIR;
+        # output samples sit on every q-th input sample
+        return resample_poly(signal, 1, q, axis=-1).astype(signal.dtype, copy=False)
+
+    @classmethod
+    def suggest_decimation(cls, dt: float, fmax: float, margin: float = 1.25) -> int:
+        # Largest factor that keeps fmax below the new Nyquist frequency with
+        # room for the anti-aliasing filter transition band
+        if fmax <= 0:
+            return 1
+        return max(int(1 / (2 * dt * fmax * margin)), 1)
+
+    @classmethod
+    def process(cls, signal, dt: float, *, filter=None, decimation: int = 1, sub_mean=False, window=None):
+        # Processing chain along the last axis: filter, decimate, mean, window
+        y = cls.filter_signal(signal, filter, dt) if filter else signal
+        y = cls.decimate(y, decimation) if decimation > 1 else y
+        y = cls.subtrackt_mean(y) if sub_mean else y
+        return cls.window_signal(y, window) if window else y
+
+    @classmethod
+    def subtrackt_mean(cls, signal, axis: int = -1):
+        return signal - signal.mean(axis=axis, keepdims=True)
+
+    def processed(self):
+        # Cropped signal after the filter, decimation, mean subtraction and
+        # window selected in update(); x follows the decimated sample grid
+        def compute():
+            return self.process(self.y, self.dt, filter=self._filter, decimation=self._decimation,
+                                sub_mean=self._sub_mean, window=self._window)
+
+        return self.x[::self._decimation], self.cached(self.key('processed'), compute)
+
+    def transform(self, n: int = None):
+        # FFT of the processed signal, optionally zero padded to n points.
+        # Spectrum, cepstrum and autocorrelation share it when settings match.
+        return self.cached(self.key('fft', n), lambda: fft(self.processed()[1], n))
+
+    def grid(self) -> Tuple:
+        x = self.x
+        return (float(x[0]), float(self.dt), int(x.size))
+
+    def segments(self, nperseg: int, noverlap: int, window: str = None, grid: Tuple = None):
+        # rfft of every mean-removed, windowed Welch segment, shape (segments, bins).
+        # With a grid (x0, dt, n) the signal is first interpolated onto it.
+        grid = grid or self.grid()
+
+        def compute():
+            if grid == self.grid():
+                y = self.y
+            else:
+                x0, dt, n = grid
+                y = np.interp(x0 + dt * np.arange(n), np.asarray(self.x), self.y)
+            if y.size < nperseg:
+                raise ValueError('Signal is shorter than the segment length')
+            frames = np.lib.stride_tricks.sliding_window_view(y, nperseg)[::nperseg - noverlap]
+            frames = frames - frames.mean(axis=-1, keepdims=True)
+            if window in windows.keys():
+                frames *= windows[window](nperseg, sym=False)
+            return rfft(frames, axis=-1)
+
+        return self.cached(('segments', tuple(self._xlim), nperseg, noverlap, window, grid), compute)
+
+    @classmethod
+    def get_events(cls, signal, dt, sta: float = 0.05, lta: float = 1., on: float = 4., off: float = 1.5,
+                   gap: float = None, mean: float = 0., chunk: int = EVENT_CHUNK) -> dict:
+        # STA/LTA trigger on the signal energy: short and long trailing means
+        # are differences of one cumulative sum per chunk, chunks overlapping
+        # by the long window. An event starts where the ratio exceeds on and
+        # stops where it falls below off; events closer than gap are merged.
+        ns, nl = max(int(round(sta / dt)), 1), max(int(round(lta / dt)), 2)
+        if nl <= ns:
+            raise ValueError('Long window must be longer than the short one')
+        if signal.size <= nl:
+            raise ValueError('Signal is shorter than the long window')
+        starts, stops, ratios = [], [], []
+        state = False
+        for start in range(nl, signal.size, chunk):
+            y = np.asarray(signal[start - nl:start + chunk], dtype=np.float64) - mean
+            c = np.concatenate(([0.], np.cumsum(y * y)))
+            short = (c[nl + 1:] - c[nl + 1 - ns:-ns]) / ns
+            long = (c[nl + 1:] - c[1:-nl]) / nl
+            ratio = np.divide(short, long, out=np.zeros_like(short), where=long > 0)
+            # Hysteresis: the state at each sample is set by the last crossing
+            last = np.where((ratio > on) | (ratio < off), np.arange(ratio.size), -1)
+            last = np.maximum.accumulate(last)
+            trigger = np.where(last >= 0, ratio[last] > on, state)
+            edges = np.flatnonzero(np.diff(np.concatenate(([state], trigger)).astype(np.int8)))
+            for i in edges:
+                (starts if trigger[i] else stops).append(start + i)
+            ratios.append(ratio)
+            state = bool(trigger[-1])
+        if state:
+            stops.append(signal.size - 1)
+        starts, stops = np.array(starts, dtype=int), np.array(stops, dtype=int)
+        if gap and starts.size > 1:
+            keep = np.concatenate(([True], starts[1:] - stops[:-1] > gap / dt))
+            starts, stops = starts[keep], stops[np.concatenate((keep[1:], [True]))]
+        ratio = np.concatenate(ratios)
+        peaks = np.array([ratio[i - nl:j - nl + 1].max() for i, j in zip(starts, stops)])
+        return {'start': starts, 'stop': stops, 'ratio': peaks.reshape(-1)}
+
+    @classmethod
+    def get_tacho_pulses(cls, x, tacho, level: float = None, chunk: int = ORDER_CHUNK):
+        # Times of rising crossings of level (midway between the extremes by
+        # default), linearly interpolated between samples. The record is
+        # scanned in chunks overlapping by one sample.
+        if level is None:
+            level = 0.5 * (float(np.min(tacho)) + float(np.max(tacho)))
+        pulses = []
+        for start in range(0, tacho.size - 1, chunk):
+            y = np.asarray(tacho[start:start + chunk + 1], dtype=float)
+            i = np.flatnonzero((y[:-1] < level) & (y[1:] >= level))
+            t = np.asarray(x[start:start + chunk + 1], dtype=float)
+            frac = (level - y[i]) / (y[i + 1] - y[i])
+            pulses.append(t[i] + frac * (t[i + 1] - t[i]))
+        return np.concatenate(pulses) if pulses else np.empty(0)
+
+    @classmethod
+    def sample_at(cls, x, y, t):
+        # Linear interpolation of y at times t (sorted), reading only the
+        # span of samples that t covers
+        if isinstance(x, UniformAxis):
+            pos = np.clip((t - x.x0) / x.dt, 0, x.size - 1)
+            i = np.minimum(pos.astype(int), x.size - 2)
+            lo = i[0]
+            block = np.asarray(y[lo:i[-1] + 2], dtype=float)
+            frac = pos - i
+            return block[i - lo] * (1 - frac) + block[i - lo + 1] * frac
+        lo = max(np.searchsorted(x, t[0], 'right') - 1, 0)
+        hi = np.searchsorted(x, t[-1], 'left') + 1
+        return np.interp(t, x[lo:hi], y[lo:hi])
+
+    @classmethod
+    def get_order_tracking(cls, x, y, pulses, ppr: int = 1, max_order: float = 20., revs: int = 16,
+                           overlap: float = 0.5, speed_bins: int = 200) -> dict:
+        # Resamples y to a uniform shaft angle grid between the first and last
+        # tacho pulse and takes Hann windowed order spectra of blocks of revs
+        # revolutions, so only one block is held at a time. Amplitudes are
+        # scaled by the window sum to read as order amplitudes.
+        if pulses.size < 2 * ppr:
+            raise ValueError('Not enough tacho pulses for order tracking')
+        spr = 2 ** int(np.ceil(np.log2(2.56 * max_order)))
+        n = revs * spr
+        step = max(int(n * (1 - overlap)), 1)
+        angle = np.arange(pulses.size) / ppr
+        total = int(np.floor(angle[-1] * spr))
+        if total < n:
+            raise ValueError(f'Record holds less than {revs} revolutions')
+        taper = windows['Hanning'](n)
+        orders = rfftfreq(n, 1 / spr)
+        keep = orders <= max_order
+        rows, rpm, centres = [], [], []
+        for start in range(0, total - n + 1, step):
+            t = np.interp((start + np.arange(n)) / spr, angle, pulses)
+            block = cls.sample_at(x, y, t)
+            rows.append(np.abs(rfft((block - block.mean()) * taper)[keep]) * (2 / taper.sum()))
+            rpm.append(60 * revs / (t[-1] - t[0]))
+            centres.append(0.5 * (t[0] + t[-1]))
+        rows, rpm = np.array(rows), np.array(rpm)
+
+        # Order map on a uniform speed axis, each speed taking the block
+        # nearest in speed
+        order = np.argsort(rpm)
+        speed = np.linspace(rpm.min(), rpm.max(), min(speed_bins, rpm.size))
+        nearest = np.clip(np.searchsorted(rpm[order], speed), 0, rpm.size - 1)
+        previous = np.maximum(nearest - 1, 0)
+        closer = np.abs(rpm[order][previous] - speed) < np.abs(rpm[order][nearest] - speed)
+        nearest[closer] = previous[closer]
+        return {
+            'orders': orders[keep],
+            'spectrum': np.sqrt((rows ** 2).mean(axis=0)),
+            'map': rows,
+            'rpm': rpm,
+            'time': np.array(centres),
+            'speed': speed,
+            'speed_map': rows[order][nearest]
+        }
+
+    def amplitude(self):
+        # Amplitude spectrum of the processed signal at full rate levels
+        def compute():
+            x, y = self.processed()
+            freq = self.get_frequency(y.size, self.processed_dt)
+            return freq, self.get_amplitude(y, spectrum=self.transform())[:freq.size] * self._decimation
+
+        return self.cached(self.key('amplitude'), compute)
+
+    @classmethod
+    def get_waterfall(cls, signals: Sequence, bins: int = 2048, fmax: float = None, workers: int = None):
+        # Amplitude spectra of all signals interpolated onto one frequency
+        # grid up to the lowest Nyquist (or fmax), shape (signals, bins).
+        # Spectra come from each signal's cache; missing ones are computed in
+        # threads, scipy.fft releases the GIL. Uncached channels of one file
+        # with the same settings share a batched transform.
+        signals = list(signals)
+        groups = {}
+        for s in signals:
+            if isinstance(s, Channel) and s.key('fft', None) not in s._cache:
+                groups.setdefault((id(s.group), ) + s.key('fft'), []).append(s)
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(lambda channels: channels[0].group.transform_all(channels), groups.values()))
+            spectra = list(pool.map(lambda s: s.amplitude(), signals))
+        nyquist = min(freq[-1] for freq, _ in spectra)
+        grid = np.linspace(0., min(fmax, nyquist) if fmax else nyquist, bins)
+        image = np.empty((len(signals), bins))
+        for row, (freq, amplitude) in zip(image, spectra):
+            row[:] = np.interp(grid, freq, amplitude)
+        return grid, image
+
+    def envelope_spectrum(self, fmin: float, fmax: float, block: int = ENVELOPE_BLOCK):
+        # The window selected in update() tapers the envelope rather than the
+        # carrier, so the main transform is reused only when there is none
+        def compute():
+            if self._window is None:
+                y = self.processed()[1]
+                spectrum = self.transform() if y.size <= block else None
+            else:
+                y = self.process(self.y, self.dt, filter=self._filter, decimation=self._decimation,
+                                 sub_mean=self._sub_mean)
+                spectrum = None
+            return self.get_envelope_spectrum(y, self.processed_dt, fmin, fmax, spectrum, self._window, block)
+
+        return self.cached(self.key('envelope', fmin, fmax, block), compute)
+
+    def events(self, sta: float = 0.05, lta: float = 1., on: float = 4., off: float = 1.5, gap: float = None):
+        # Event index of the whole record, kept apart from the processing
+        # cache so that it survives crops; times are (start, stop, peak ratio)
+        key = (sta, lta, on, off, gap)
+        if key not in self._events:
+            events = self.get_events(self._y, self.dt, sta, lta, on, off, gap, self.stats['mean'])
+            x = self._x
+            self._events[key] = [(float(x[i]), float(x[j]), float(r)) for i, j, r in
+                                 zip(events['start'], events['stop'], events['ratio'])]
+        return self._events[key]
+
+    def sweep(self, crops: Sequence, windows_: Sequence, sub_means: Sequence = (False, True)) -> dict:
+        # Every (crop, mean subtraction, window) variant as one row of a 2D
+        # batch, zero padded to the longest crop and transformed together.
+        # Amplitudes are divided by the window sum so that variants of
+        # different length and window are directly comparable. The filter
+        # and decimation of the signal apply to every variant.
+        crops = [tuple(float(i) for i in crop) for crop in crops]
+
+        def compute():
+            bases = []
+            for xmin, xmax in crops:
+                imin = max(self._x.searchsorted(xmin, 'right') - 1, 0)
+                imax = min(self._x.searchsorted(xmax, 'left'), self._x.size - 1)
+                if imax - imin < 2:
+                    raise ValueError(f'Crop {xmin:g} ... {xmax:g} holds less than two samples')
+                bases.append(self.process(self._y[imin:imax], self.dt, filter=self._filter,
+                                          decimation=self._decimation))
+            n = max(base.size for base in bases)
+            batch = np.zeros((len(bases) * len(sub_means) * len(windows_), n), dtype=bases[0].dtype)
+            gain = np.empty(batch.shape[0])
+            labels, row = [], 0
+            for (xmin, xmax), base in zip(crops, bases):
+                for sub_mean in sub_means:
+                    y = self.subtrackt_mean(base) if sub_mean else base
+                    for w in windows_:
+                        shape = windows[w](y.size) if w in windows.keys() else np.ones(y.size)
+                        batch[row, :y.size] = y * shape.astype(y.dtype, copy=False)
+                        gain[row] = shape.sum()
+                        labels.append(f'{xmin:g}...{xmax:g}, {w if w in windows.keys() else "None"}'
+                                      f'{", mean removed" if sub_mean else ""}')
+                        row += 1
+            freq = self.get_frequency(n, self.processed_dt)
+            amplitude = np.abs(rfft(batch, axis=-1)[:, :freq.size]) * (2 / gain[:, None])
+            amplitude[:, 0] /= 2
+            return {'labels': labels, 'freq': freq, 'amplitude': amplitude}
+
+        return self.cached(self.key('sweep', tuple(crops), tuple(windows_), tuple(sub_means)), compute)
+
+    @classmethod
+    def sweep_table(cls, freq, amplitude) -> dict:
+        # Per variant comparison figures for rows of a sweep amplitude batch
+        peak = np.argmax(amplitude[:, 1:], axis=-1) + 1
+        rows = np.arange(amplitude.shape[0])
+        level = amplitude[rows, peak]
+        floor = np.median(amplitude, axis=-1)
+        # -3 dB width of the main lobe around the peak, in bins
+        above = amplitude >= level[:, None] / 2 ** 0.5
+        bins = np.arange(amplitude.shape[1])
+        lower = np.where(~above & (bins < peak[:, None]), bins, -1).max(axis=-1) + 1
+        upper = np.where(~above & (bins > peak[:, None]), bins, bins.size).min(axis=-1) - 1
+        with np.errstate(divide='ignore'):
+            return {
+                'Peak frequency': freq[peak],
+                'Peak amplitude': level,
+                'Median level': floor,
+                'Peak to median, dB': 20 * np.log10(level / floor),
+                '-3 dB width': (upper - lower + 1) * (freq[1] - freq[0])
+            }
+
+    @classmethod
+    def common_grid(cls, a, b) -> Tuple:
+        # a's sample grid restricted to the time span covered by both signals
+        xa, xb = a.x, b.x
+        start, stop = max(xa[0], xb[0]), min(xa[-1], xb[-1])
+        if start >= stop:
+            raise ValueError('Signals do not overlap in time')
+        imin, imax = xa.searchsorted(start, 'left'), xa.searchsorted(stop, 'right')
+        return (float(xa[imin]), float(a.dt), int(imax - imin))
+
+    @classmethod
+    def get_cross_spectrum(cls, a, b, nperseg: int = 1024, overlap: float = 0.5, window: str = 'Hanning'):
+        grid = cls.common_grid(a, b)
+        nperseg = min(nperseg, grid[2])
+        noverlap = min(int(nperseg * overlap), nperseg - 1)
+        sa = a.segments(nperseg, noverlap, window, grid)
+        sb = b.segments(nperseg, noverlap, window, grid)
+
+        w = windows[window](nperseg, sym=False) if window in windows.keys() else np.ones(nperseg)
+        scale = np.full(sa.shape[-1], 2 * grid[1] / (w ** 2).sum())
+        scale[0] /= 2
+        if nperseg % 2 == 0:
+            scale[-1] /= 2
+        pxx = (np.abs(sa) ** 2).mean(axis=0) * scale
+        pyy = (np.abs(sb) ** 2).mean(axis=0) * scale
+        pxy = (np.conj(sa) * sb).mean(axis=0) * scale
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return {
+                'freq': rfftfreq(nperseg, grid[1]),
+                'Pxx': pxx,
+                'Pyy': pyy,
+                'Pxy': pxy,
+                'coherence': np.abs(pxy) ** 2 / (pxx * pyy),
+                'phase': np.angle(pxy),
+                'H1': pxy / pxx,
+                'H2': pyy / np.conj(pxy)
+            }
+
+    def update(self, *, xlabel=None, ylabel=None, xlim=None, window=None, sub_mean=None, filter=UNCHANGED,
+               decimation=None) -> None:
         if xlabel:
             self._xlabel = xlabel
         if ylabel:
@@ -223,8 +1056,12 @@ class Input(Signal):
             self._window = window
         else:
             self._window = None
-        if sub_mean:
+        if sub_mean is not None:
             self.sub_mean = sub_mean
+        if filter is not UNCHANGED:
+            self._filter = tuple(filter) if filter else None
+        if decimation:
+            self._decimation = max(int(decimation), 1)
         
     def reset(self):
         self.xlabel = 'X'
@@ -236,25 +1073,212 @@ class Input(Signal):
         return self._name
 
 
+class Channel(Input):
+
+    # One column of a multi-channel file: shares the time axis and a row of
+    # the parent's (channel, sample) array without copying
+
+    def __init__(self, group, idx: int, *, file, name) -> None:
+        super().__init__(group.x, group.data[idx], file=file, name=name, copy=False)
+        self._group = group
+        self._idx = idx
+
+    @property
+    def group(self):
+        return self._group
+
+    @property
+    def nbytes(self) -> int:
+        # Samples belong to the group and are counted there
+        return self._cache_bytes
+
+    def spill(self, path: str) -> None:
+        # Rows are views into the shared array, so the whole group is spilled
+        self._group.spill(path)
+
+    def load(self) -> None:
+        self._group.load()
+
+    def extend(self, x, y) -> int:
+        raise TypeError('Multi-channel signals can not be extended')
+
+
+class MultiInput:
+
+    def __init__(self, x, data, *, file, names: Sequence) -> None:
+        self._x = UniformAxis.detect(x) or np.array(x)
+        self._data = np.ascontiguousarray(data)
+        if self._data.ndim != 2 or self._data.shape[1] != self._x.size:
+            raise ValueError('Channel data must be a (channels, samples) array matching the x axis')
+        base = os.path.split(file)[1]
+        # Repeated column names get their column number
+        names = [f'{name} [{i + 1}]' if list(names).count(name) > 1 else name for i, name in enumerate(names)]
+        self._channels = [Channel(self, i, file=file, name=f'{base}: {name}') for i, name in enumerate(names)]
+
+        self._spill_files = []
+
+    @property
+    def x(self):
+        return self._x
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def channels(self) -> list:
+        return self._channels
+
+    @property
+    def nbytes(self) -> int:
+        return self._x.nbytes + self._data.nbytes
+
+    @property
+    def spilled(self) -> bool:
+        return isinstance(self._data, np.memmap)
+
+    def spill(self, path: str) -> None:
+        if self.spilled:
+            return None
+        for attr in ('_x', '_data'):
+            values = getattr(self, attr)
+            if isinstance(values, np.ndarray):
+                fname = f'{path}{attr}.npy'
+                np.save(fname, values)
+                setattr(self, attr, np.load(fname, mmap_mode='r'))
+                self._spill_files.append(fname)
+        self.rebind()
+
+    def load(self) -> None:
+        if not self.spilled:
+            return None
+        for attr in ('_x', '_data'):
+            values = getattr(self, attr)
+            if isinstance(values, np.memmap):
+                setattr(self, attr, np.array(values))
+        self.rebind()
+        self.remove_spill_files()
+
+    def remove_spill_files(self) -> None:
+        for fname in self._spill_files:
+            try:
+                os.remove(fname)
+            except OSError:
+                pass
+        self._spill_files.clear()
+
+    def rebind(self) -> None:
+        # Channels view the current arrays; cached results are dropped with them
+        for i, channel in enumerate(self._channels):
+            channel._x, channel._y = self._x, self._data[i]
+            channel.clear_cache()
+
+    def transform_all(self, channels: Sequence, n: int = None):
+        # The given channels, which must share processing settings, are
+        # processed and transformed with one batched call along the sample
+        # axis; each channel's cache is seeded under its own transform() key.
+        settings = channels[0]
+        xlim = settings.xlim
+        imin = max(self._x.searchsorted(xlim[0], 'right') - 1, 0)
+        imax = min(self._x.searchsorted(xlim[1], 'left'), self._x.size - 1)
+        rows = [self._channels.index(channel) for channel in channels]
+        y = Input.process(self._data[rows, imin:imax], settings.dt, filter=settings.filter,
+                          decimation=settings.decimation, sub_mean=settings.sub_mean, window=settings.window)
+        spectra = fft(y, n, axis=-1)
+        key = settings.key('processed')
+        for channel, processed, spectrum in zip(channels, y, spectra):
+            channel.cached(key, lambda: processed)
+            channel.cached(('fft', ) + key[1:] + (n, ), lambda: spectrum)
+        return spectra
+
+
 class InputSignals(SignalCash):
 
-    def __init__(self) -> None:
+    def __init__(self, budget: int = MEMORY_BUDGET, spill_dir: str = SPILL) -> None:
         super(InputSignals, self).__init__()
         self.__cash = []
+        self.__used = []
+        self._budget = budget
+        self._spill_dir = spill_dir
 
     @property
     def signals(self):
         return self.__cash
 
+    @property
+    def budget(self) -> int:
+        return self._budget
+
+    @budget.setter
+    def budget(self, budget: int):
+        if not isinstance(budget, int) or budget < 0:
+            raise ValueError('Memory budget must be non negative integer')
+        self._budget = budget
+        self.enforce()
+
+    @classmethod
+    def owner(cls, signal: Input):
+        # Channels of one file are spilled, loaded and counted as a group
+        return signal.group if isinstance(signal, Channel) else signal
+
+    def units(self) -> list:
+        return list({id(self.owner(s)): self.owner(s) for s in self.__cash}.values())
+
+    @property
+    def resident_size(self) -> int:
+        channels = sum(s.cache_bytes for s in self.__cash if isinstance(s, Channel))
+        return sum(u.nbytes for u in self.units() if not u.spilled) + channels
+
+    @property
+    def spilled_size(self) -> int:
+        return sum(u.nbytes for u in self.units() if u.spilled)
+
+    def touch(self, signal: Input) -> None:
+        if signal in self.__used:
+            self.__used.remove(signal)
+        self.__used.append(signal)
+
+    def enforce(self) -> None:
+        # Spill least recently used signals (whole files for channels) until
+        # the resident set fits. The most recently used one always stays.
+        if not self.__used:
+            return None
+        keep = self.owner(self.__used[-1])
+        for signal in self.__used[:-1]:
+            if self.resident_size <= self._budget:
+                break
+            unit = self.owner(signal)
+            if unit is keep or unit.spilled:
+                continue
+            os.makedirs(self._spill_dir, exist_ok=True)
+            unit.spill(os.path.join(self._spill_dir, f'{id(unit)}'))
+
+    def select(self, idx: int) -> Input:
+        signal = self.get(idx)
+        if not signal:
+            return signal
+        signal.load()
+        self.touch(signal)
+        self.enforce()
+        return signal
+
     def add(self, signal: Input) -> bool:
         if not isinstance(signal, Input): return False
         self.__cash.append(signal)
+        self.touch(signal)
+        self.enforce()
         return True
 
     def delete(self, idx: int) -> bool:
         if not isinstance(idx, int): return False
         try:
-            self.__cash.pop(idx)
+            signal = self.__cash.pop(idx)
+            if signal in self.__used:
+                self.__used.remove(signal)
+            # Spill files go with the last signal that maps them
+            unit = self.owner(signal)
+            if unit not in self.units():
+                unit.remove_spill_files()
             return True
         except IndexError:
             return False
@@ -264,11 +1288,20 @@ class InputSignals(SignalCash):
         if not isinstance(signal, Input): return False
         try:
             self.__cash.insert(idx, signal)
+            self.touch(signal)
+            self.enforce()
         except IndexError:
             return False
         
     def reset(self):
         self.__cash.clear()
+        self.__used.clear()
+        if os.path.isdir(self._spill_dir):
+            for file in os.listdir(self._spill_dir):
+                try:
+                    os.remove(os.path.join(self._spill_dir, file))
+                except OSError:
+                    pass
 
     def get(self, idx: int) -> Input:
         try:
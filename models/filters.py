@@ -0,0 +1,59 @@
+import numpy as np
+
+from functools import lru_cache
+
+from scipy.fft import rfft, irfft, next_fast_len
+from scipy.signal import firwin, iirfilter, sosfilt, sosfiltfilt
+
+
+from const import FILTER_BLOCK
+
+
+# A filter is described by a flat tuple (btype, design, order, low, high,
+# zero_phase) so it can be hashed into cache keys and stored in sessions.
+# btype is a scipy band type, design is 'fir' or an iirfilter ftype; high is
+# only used by band-pass and band-stop filters. For FIR designs order is
+# the number of taps.
+
+
+@lru_cache(maxsize=32)
+def design_filter(btype: str, design: str, order: int, low: float, high: float, fs: float):
+    if btype in ('bandpass', 'bandstop') and high is None:
+        raise ValueError('Band filters need a low and a high cutoff frequency')
+    cutoff = (low, high) if btype in ('bandpass', 'bandstop') else low
+    edges = np.atleast_1d(cutoff)
+    if np.any(edges <= 0) or np.any(edges >= fs / 2) or np.any(np.diff(edges) <= 0):
+        raise ValueError(f'Cutoff frequencies must increase within (0, {fs / 2:.6g})')
+    if design == 'fir':
+        # High-pass and band-stop FIR filters need an odd number of taps
+        return firwin(int(order) | 1, cutoff, pass_zero=btype, fs=fs)
+    return iirfilter(int(order), cutoff, rp=1, rs=60, btype=btype, ftype=design, output='sos', fs=fs)
+
+
+def overlap_add(signal, h, delay: int = 0, block: int = FILTER_BLOCK):
+    # Block FFT convolution along the last axis. Output has the input length
+    # and starts `delay` samples into the full convolution; memory beyond the
+    # output is one block transform, whatever the signal length.
+    n, m = signal.shape[-1], h.size
+    block = max(block, 4 * m)
+    nfft = next_fast_len(block + m - 1, True)
+    kernel = rfft(h.astype(signal.dtype, copy=False), nfft)
+    out = np.zeros(signal.shape, dtype=np.result_type(signal.dtype, np.float32))
+    for start in range(0, n, block):
+        chunk = signal[..., start:start + block]
+        part = irfft(rfft(chunk, nfft) * kernel, nfft)[..., :chunk.shape[-1] + m - 1]
+        lo = start - delay
+        a, b = max(lo, 0), min(lo + part.shape[-1], n)
+        if b > a:
+            out[..., a:b] += part[..., a - lo:b - lo]
+    return out
+
+
+def apply_filter(signal, spec, dt: float):
+    btype, design, order, low, high, zero_phase = spec
+    coefficients = design_filter(btype, design, order, low, high, 1 / dt)
+    if design == 'fir':
+        # Linear phase: compensating the group delay gives a zero-phase output
+        return overlap_add(signal, coefficients, (coefficients.size - 1) // 2 if zero_phase else 0)
+    y = sosfiltfilt(coefficients, signal, axis=-1) if zero_phase else sosfilt(coefficients, signal, axis=-1)
+    return y.astype(signal.dtype, copy=False)
@@ -0,0 +1,115 @@
+import os
+import json
+import numpy as np
+
+
+from models.data import Input, UniformAxis
+
+
+MAGIC = b'FFTSESS1'
+ALIGN = 64
+
+
+# Session file layout: MAGIC, uint64 header size, JSON header, then raw
+# arrays aligned to 64 bytes. The header stores dtype, shape and offset of
+# every array so they can be memory-mapped without reading the file.
+
+
+def _align(n: int) -> int:
+    return -n % ALIGN
+
+
+def _table(table: dict, arrays: list) -> dict:
+    refs = {}
+    for key, values in table.items():
+        refs[key] = len(arrays)
+        arrays.append(np.ascontiguousarray(np.asarray(values)))
+    return refs
+
+
+def save_session(path: str, signals, results=()) -> int:
+
+    arrays = []
+    header = {'version': 1, 'signals': [], 'results': []}
+    signals = list(signals)
+
+    for signal in signals:
+        entry = signal.state
+        if isinstance(signal._x, UniformAxis):
+            entry['axis'] = [signal._x.x0, signal._x.dt, signal._x.size]
+        else:
+            entry['x'] = len(arrays)
+            arrays.append(np.ascontiguousarray(signal._x))
+        entry['y'] = len(arrays)
+        arrays.append(np.ascontiguousarray(signal._y))
+        header['signals'].append(entry)
+
+    for signal, in_signal, fft_signal in results:
+        header['results'].append({
+            'signal': signals.index(signal) if signal in signals else -1,
+            'input': _table(in_signal, arrays),
+            'fft': _table(fft_signal, arrays)
+        })
+
+    # Offsets are relative to the start of the data section
+    position = 0
+    header['arrays'] = []
+    for values in arrays:
+        position += _align(position)
+        header['arrays'].append({'offset': position, 'dtype': values.dtype.str, 'shape': values.shape})
+        position += values.nbytes
+
+    raw = json.dumps(header).encode()
+    raw += b' ' * _align(len(MAGIC) + 8 + len(raw))
+
+    tmp = f'{path}.part'
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(raw)).tobytes())
+        f.write(raw)
+        start = f.tell()
+        for values, ref in zip(arrays, header['arrays']):
+            f.write(b'\0' * (start + ref['offset'] - f.tell()))
+            f.write(memoryview(values).cast('B') if values.size else b'')
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+def load_session(path: str):
+
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError('Unsupported session file format')
+        size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        header = json.loads(f.read(size))
+        start = f.tell()
+
+    def array(idx):
+        ref = header['arrays'][idx]
+        if not np.prod(ref['shape']):
+            return np.empty(ref['shape'], dtype=ref['dtype'])
+        # Copy-on-write maps: pages are read on first access only
+        return np.memmap(path, dtype=ref['dtype'], mode='c', offset=start + ref['offset'],
+                         shape=tuple(ref['shape']))
+
+    signals = []
+    for entry in header['signals']:
+        x = UniformAxis(*entry['axis']) if 'axis' in entry else array(entry['x'])
+        signal = Input(x, array(entry['y']), file=entry['file'], xlabel=entry['xlabel'],
+                       ylabel=entry['ylabel'], name=entry['name'], xlim=tuple(entry['xlim']),
+                       window=entry['window'], sub_mean=entry['sub_mean'], filter=entry.get('filter'),
+                       decimation=entry.get('decimation', 1),
+                       stats=entry['stats'])
+        signal.offset = entry['offset']
+        signals.append(signal)
+
+    results = []
+    for entry in header['results']:
+        signal = signals[entry['signal']] if entry['signal'] >= 0 else None
+        results.append((
+            signal,
+            {key: array(idx) for key, idx in entry['input'].items()},
+            {key: array(idx) for key, idx in entry['fft'].items()}
+        ))
+
+    return signals, results
@@ -0,0 +1,219 @@
+import os
+import sys
+import time
+import socket
+import threading
+import numpy as np
+
+
+from abc import ABCMeta, abstractmethod
+
+
+class RingBuffer:
+
+    def __init__(self, size: int, dtype=float) -> None:
+        if not isinstance(size, int) or size < 2:
+            raise ValueError('Ring buffer size must be integer greater than 1')
+        self._data = np.zeros(size, dtype=dtype)
+        self._index = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._data.size
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def extend(self, values) -> None:
+        values = np.asarray(values, dtype=self._data.dtype)[-self.size:]
+        n = values.size
+        with self._lock:
+            head = min(n, self.size - self._index)
+            self._data[self._index:self._index + head] = values[:head]
+            self._data[:n - head] = values[head:]
+            self._index = (self._index + n) % self.size
+            self._count = min(self._count + n, self.size)
+
+    def copy_to(self, out) -> int:
+        # Oldest sample first; out must hold at least `count` values
+        with self._lock:
+            n = self._count
+            start = (self._index - n) % self.size
+            head = min(n, self.size - start)
+            out[:head] = self._data[start:start + head]
+            out[head:n] = self._data[:n - head]
+        return n
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index = 0
+            self._count = 0
+
+
+class Source(metaclass=ABCMeta):
+
+    @abstractmethod
+    def read(self):
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class TextSource(Source):
+
+    # One sample per line, either "y" or "x,y"; the last column is taken
+
+    def __init__(self, stream, chunk: int = 256) -> None:
+        self._stream = stream
+        self._chunk = chunk
+
+    def read(self):
+        values = []
+        for _ in range(self._chunk):
+            line = self._stream.readline()
+            if not line:
+                break
+            try:
+                values.append(float(line.strip().split(',')[-1]))
+            except ValueError:
+                continue
+        if not values and not line:
+            return None
+        return np.array(values)
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+class StdinSource(TextSource):
+
+    def __init__(self, chunk: int = 256) -> None:
+        super().__init__(sys.stdin, chunk)
+
+    def close(self) -> None:
+        pass
+
+
+class PipeSource(TextSource):
+
+    # Opening a FIFO blocks until a writer connects, so the pipe is opened
+    # on the first read, in the stream thread
+
+    def __init__(self, path: str, chunk: int = 256) -> None:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'No such pipe: {path}')
+        super().__init__(None, chunk)
+        self._path = path
+        self._closed = False
+
+    def read(self):
+        if self._closed:
+            return None
+        if self._stream is None:
+            self._stream = open(self._path, 'r')
+        if self._closed:
+            return None
+        return super().read()
+
+    def close(self) -> None:
+        self._closed = True
+        if self._stream is not None:
+            super().close()
+            return None
+        # Release a reader still waiting in open(); fails if there is none.
+        # Platforms without O_NONBLOCK have no FIFOs to wait on either
+        if not hasattr(os, 'O_NONBLOCK'):
+            return None
+        try:
+            os.close(os.open(self._path, os.O_WRONLY | os.O_NONBLOCK))
+        except OSError:
+            pass
+
+
+class SocketSource(TextSource):
+
+    def __init__(self, host: str, port: int, chunk: int = 256) -> None:
+        self._socket = socket.create_connection((host, port))
+        super().__init__(self._socket.makefile('r'), chunk)
+
+    def close(self) -> None:
+        super().close()
+        self._socket.close()
+
+
+class GeneratorSource(Source):
+
+    # Local stand-in for a rig: sum of sines plus noise, paced in real time
+
+    def __init__(self, fs: float, freqs=(1000., ), amplitude: float = 1.0,
+                 noise: float = 0.1, chunk: int = 1024) -> None:
+        self._fs = fs
+        self._freqs = np.array(freqs, dtype=float)[:, None]
+        self._amplitude = amplitude
+        self._noise = noise
+        self._chunk = chunk
+        self._n = 0
+        self._rng = np.random.default_rng()
+
+    def read(self):
+        t = (self._n + np.arange(self._chunk)) / self._fs
+        self._n += self._chunk
+        y = self._amplitude * np.sin(2 * np.pi * self._freqs * t).sum(axis=0)
+        y += self._noise * self._rng.standard_normal(self._chunk)
+        time.sleep(self._chunk / self._fs)
+        return y
+
+
+class Stream:
+
+    def __init__(self, source: Source, size: int, dt: float) -> None:
+        if not isinstance(source, Source):
+            raise TypeError('Unsupported type for stream source')
+        self._source = source
+        self._dt = dt
+        self.buffer = RingBuffer(size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._error = None
+
+    @property
+    def dt(self) -> float:
+        return self._dt
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def error(self):
+        return self._error
+
+    def start(self) -> None:
+        if self.running:
+            return None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        try:
+            self._source.close()
+        except OSError:
+            pass
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                chunk = self._source.read()
+                if chunk is None:
+                    break
+                if chunk.size:
+                    self.buffer.extend(chunk)
+        except (OSError, ValueError) as er:
+            if not self._stop.is_set():
+                self._error = er
@@ -0,0 +1,242 @@
+import os
+import json
+import importlib.util
+import numpy as np
+
+from bottle import Bottle, request, response, HTTPError
+
+
+from const import (
+    SPECTRAL_ANALYSIS as SPECTRAL, SOUND_ANALYSIS as SOUND,
+    CORRELATION_ANALYSIS as CORRELATION, PRECISIONS, TMP, EXPORT_FORMATS,
+    WINDOWS, FILTER_TYPES, FILTER_DESIGNS
+)
+from gui.export import ExportQueue, file_name
+from models.data import InputSignals, Input, MultiInput, UniformAxis
+from tools import load_file
+
+
+# Long-lived analysis process: signals, their processing caches and computed
+# plots stay in memory between requests.
+#
+#   GET    /signals                       loaded signals and their settings
+#   POST   /signals                       JSON {"file": path, "precision": "Single"}
+#                                         or raw samples with ?dt=&x0=&name=&dtype=
+#   DELETE /signals/<name>
+#   POST   /signals/<name>/analyse        JSON settings, see settings() below
+#   POST   /signals/<name>/export         JSON settings plus destination, fmt, dpi
+#   GET    /status
+#
+# Analysis results are JSON lists unless the request accepts
+# application/octet-stream: then the body is a little-endian (2, n) array
+# of frequency (or lag) and values, described by X-Shape and X-Dtype headers.
+
+
+class AnalysisServer:
+
+    def __init__(self, workers: int | None = None) -> None:
+        self.data = InputSignals()
+        self.export_queue = ExportQueue(workers)
+        self.requests = 0
+        self.app = Bottle()
+        self.app.route('/signals', 'GET', self.list_signals)
+        self.app.route('/signals', 'POST', self.load)
+        self.app.route('/signals/<name>', 'DELETE', self.delete)
+        self.app.route('/signals/<name>/analyse', 'POST', self.analyse)
+        self.app.route('/signals/<name>/export', 'POST', self.export)
+        self.app.route('/status', 'GET', self.status)
+        self.app.add_hook('before_request', self.count)
+        for code in (400, 404, 405, 500):
+            self.app.error(code)(self.error)
+
+    def count(self):
+        self.requests += 1
+
+    def error(self, er):
+        response.content_type = 'application/json'
+        return json.dumps({'error': er.body, 'status': er.status_code})
+
+    def find(self, name: str) -> Input:
+        names = [str(s) for s in self.data.signals]
+        if name not in names:
+            raise HTTPError(404, f'Signal {name} is not loaded')
+        return self.data.select(names.index(name))
+
+    def unique(self, name: str) -> str:
+        names = [str(s) for s in self.data.signals]
+        i, unique = 1, name
+        while unique in names:
+            i += 1
+            unique = f'{name} ({i})'
+        return unique
+
+    def describe(self, signal: Input) -> dict:
+        return dict(signal.state, dt=float(signal.dt), samples=int(signal._x.size),
+                    dtype=str(signal.dtype), spilled=signal.spilled)
+
+    def list_signals(self):
+        return {'signals': [self.describe(s) for s in self.data.signals]}
+
+    def load(self):
+        try:
+            if request.content_type.startswith('application/json'):
+                body = request.json or {}
+                file = body.get('file')
+                if not file:
+                    raise ValueError('A file path is required')
+                x, y, offset, names = load_file(file, PRECISIONS[body.get('precision', 'Double')])
+                if y.ndim == 2:
+                    signals = MultiInput(x, y, file=file, names=names).channels
+                    for signal in signals:
+                        signal.name = self.unique(signal.name)
+                else:
+                    signals = [Input(x, y, file=file, name=self.unique(os.path.split(file)[1]))]
+                    signals[0].offset = offset
+            else:
+                y = np.frombuffer(request.body.read(), dtype=np.dtype(request.query.dtype or '<f8'))
+                x = UniformAxis(float(request.query.x0 or 0.), float(request.query.dt), y.size)
+                signals = [Input(x, y, file='', name=self.unique(request.query.name or 'signal'))]
+        except (KeyError, TypeError, ValueError, IndexError, OSError) as er:
+            raise HTTPError(400, f'Data import error: {er}')
+        for signal in signals:
+            self.data.add(signal)
+        return {'signals': [self.describe(s) for s in signals]}
+
+    def delete(self, name: str):
+        signal = self.find(name)
+        self.data.delete(self.data.signals.index(signal))
+        return {'deleted': name}
+
+    def body(self) -> dict:
+        # Parsed outside the analysis error handling, so a malformed body
+        # is reported as the client error it is
+        try:
+            body = request.json or {}
+        except ValueError as er:
+            raise HTTPError(400, f'Invalid JSON: {er}')
+        if not isinstance(body, dict):
+            raise HTTPError(400, 'Request body must be a JSON object')
+        return body
+
+    def settings(self, signal: Input, body: dict) -> dict:
+        # Processing settings default to the ones the signal already has and
+        # are validated into plain scalars before anything touches the signal
+        xlim = tuple(float(v) for v in body.get('xlim', signal.xlim))
+        if len(xlim) != 2 or not xlim[0] < xlim[1]:
+            raise ValueError('xlim must be two increasing numbers')
+        window = body.get('window', signal.window)
+        if window is not None and window not in WINDOWS.keys():
+            raise ValueError(f'Unknown window {window}')
+        spec = body.get('filter', signal.filter)
+        if spec:
+            if len(spec) != 6:
+                raise ValueError('filter must be [type, design, order, low, high, zero_phase]')
+            btype, design, order, low, high, zero_phase = spec
+            if btype not in FILTER_TYPES.values() or design not in FILTER_DESIGNS.values():
+                raise ValueError(f'Unknown filter {btype} {design}')
+            spec = (btype, design, int(order), float(low), None if high is None else float(high),
+                    bool(zero_phase))
+        decimation = int(body.get('decimation', signal.decimation))
+        if decimation < 1:
+            raise ValueError('decimation must be a positive integer')
+        x = signal._x
+        imin = max(x.searchsorted(xlim[0], 'right') - 1, 0)
+        imax = min(x.searchsorted(xlim[1], 'left'), x.size - 1)
+        if -(-(imax - imin) // decimation) < 2:
+            raise ValueError('xlim must keep at least two (decimated) samples')
+        return {
+            'xlim': xlim,
+            'window': window,
+            'sub_mean': bool(body.get('sub_mean', signal.sub_mean)),
+            'filter': spec or None,
+            'decimation': decimation
+        }
+
+    def compute(self, signal: Input, body: dict):
+        plot = body.get('plot', 'Amplitude')
+        pref = float(body.get('pref', 2e-5))
+        settings = self.settings(signal, body)
+        previous = {key: signal.state[key] for key in settings}
+
+        def compute():
+            x, y = signal.processed()
+            dt = signal.processed_dt
+            if plot in CORRELATION.keys():
+                spectrum = signal.transform(Input.correlation_length(y.size)) \
+                    if plot == 'Autocorrelation' else signal.transform()
+                values = CORRELATION[plot](y, spectrum=spectrum)
+                return np.arange(values.size) * dt, values
+            freq = Input.get_frequency(y.size, dt)
+            spectrum = signal.transform() * signal.decimation
+            if plot in SPECTRAL.keys():
+                return freq, SPECTRAL[plot](y, spectrum=spectrum)[:freq.size]
+            if plot in SOUND.keys():
+                return freq, SOUND[plot](y, pref, spectrum=spectrum)[:freq.size]
+            raise ValueError(f'Unknown analysis {plot}')
+
+        # Settings are kept only if the analysis succeeds
+        signal.update(**settings)
+        try:
+            return plot, signal.cached(signal.key('plot', plot, pref), compute)
+        except BaseException:
+            signal.update(**previous)
+            raise
+
+    def analyse(self, name: str):
+        signal = self.find(name)
+        body = self.body()
+        try:
+            plot, (x, y) = self.compute(signal, body)
+        except (TypeError, ValueError, IndexError, KeyError) as er:
+            raise HTTPError(400, f'Analysis failed: {er}')
+        except HTTPError:
+            raise
+        except Exception as er:
+            raise HTTPError(500, f'Analysis failed: {er}')
+        if 'application/octet-stream' in request.headers.get('Accept', ''):
+            values = np.vstack([x, y]).astype('<f8')
+            response.content_type = 'application/octet-stream'
+            response.set_header('X-Shape', ','.join(str(i) for i in values.shape))
+            response.set_header('X-Dtype', values.dtype.str)
+            return values.tobytes()
+        return {'name': name, 'plot': plot, 'x': x.tolist(), 'y': y.tolist()}
+
+    def export(self, name: str):
+        signal = self.find(name)
+        body = self.body()
+        fmt = body.get('fmt', EXPORT_FORMATS[0])
+        destination = body.get('destination', TMP)
+        try:
+            plot, (x, y) = self.compute(signal, body)
+            os.makedirs(destination, exist_ok=True)
+        except (TypeError, ValueError, IndexError, KeyError, OSError) as er:
+            raise HTTPError(400, f'Export failed: {er}')
+        except HTTPError:
+            raise
+        except Exception as er:
+            raise HTTPError(500, f'Export failed: {er}')
+        base = os.path.join(destination, file_name(f'{name} {plot}'))
+        self.export_queue.figure(f'{base}.{fmt}', x, y, fmt=fmt, dpi=int(body.get('dpi', 600)),
+                                 title=f'{name} {plot}', xlabel=body.get('xlabel', 'Frequency'),
+                                 ylabel=body.get('ylabel', plot))
+        self.export_queue.table(f'{base}.csv', {'x': x, 'y': y})
+        if body.get('wait', True):
+            self.export_queue.wait()
+        return {'files': [f'{base}.{fmt}', f'{base}.csv'], 'errors': self.export_queue.errors}
+
+    def status(self):
+        return {
+            'signals': len(self.data.signals),
+            'resident': self.data.resident_size,
+            'spilled': self.data.spilled_size,
+            'requests': self.requests,
+            'export': self.export_queue.report()
+        }
+
+    def run(self, host: str = '127.0.0.1', port: int = 8080, **kwargs) -> None:
+        server = 'gevent' if importlib.util.find_spec('gevent') else 'wsgiref'
+        try:
+            self.app.run(host=host, port=port, server=server, **kwargs)
+        finally:
+            self.export_queue.wait()
+            self.export_queue.shutdown()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+# const must be imported before models.data, which it imports at its end
+import const  # noqa: E402,F401
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from models.data import UniformAxis, Input
+
+
+def test_detect_uniform_axis():
+    axis = UniformAxis.detect(0.5 + np.arange(100) * 0.01)
+    assert isinstance(axis, UniformAxis)
+    assert axis.size == 100 and axis.nbytes == 0
+    assert np.isclose(axis.dt, 0.01) and np.isclose(axis.x0, 0.5)
+
+
+def test_detect_rejects_irregular_axis():
+    x = np.arange(100) * 0.01
+    x[50] += 0.005
+    assert UniformAxis.detect(x) is None
+    assert UniformAxis.detect(x[::-1]) is None
+    assert UniformAxis.detect([1.]) is None
+
+
+def test_indexing_matches_values():
+    axis = UniformAxis(1., 0.25, 20)
+    values = np.asarray(axis)
+    assert axis[0] == values[0] and axis[-1] == values[-1] and axis[7] == values[7]
+    assert np.array_equal(axis[[1, 3, 5]], values[[1, 3, 5]])
+    assert np.array_equal(axis[values > 3], values[values > 3])
+    with pytest.raises(IndexError):
+        axis[20]
+
+
+@pytest.mark.parametrize('idx', [slice(2, 10), slice(None, None, 3), slice(-5, None), slice(5, 2)])
+def test_slicing_returns_axis(idx):
+    axis = UniformAxis(0., 0.1, 50)
+    part = axis[idx]
+    assert isinstance(part, UniformAxis)
+    assert np.allclose(np.asarray(part), np.asarray(axis)[idx])
+    assert len(part) == len(np.asarray(axis)[idx])
+
+
+def test_searchsorted_tolerates_rounding():
+    # Grid points are found even where dt * i rounds past the requested value
+    axis = UniformAxis(0., 0.1, 50)
+    for value in (0., 0.3, 1.2, 4.9):
+        idx = round(value / 0.1)
+        assert axis.searchsorted(value, 'left') == idx
+        assert axis.searchsorted(value, 'right') == idx + 1
+    values = np.asarray(axis)
+    for value in (-1., 0.35, 2.01, 10.):
+        for side in ('left', 'right'):
+            assert axis.searchsorted(value, side) == np.searchsorted(values, value, side)
+
+
+def test_input_keeps_uniform_axis():
+    signal = Input(np.arange(1000) * 1e-3, np.ones(1000), file='', name='s')
+    assert isinstance(signal._x, UniformAxis)
+    signal.crop(0.1, 0.2)
+    assert np.isclose(signal.dt, 1e-3)
+    assert np.isclose(signal.x[0], 0.1) and signal.x.size == signal.y.size == 100
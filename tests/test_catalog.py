@@ -0,0 +1,73 @@
+import os
+import time
+
+import numpy as np
+
+from models.catalog import Catalog, Indexer, summary, index_file, BANDS
+
+
+def write_csv(path, f=100., n=2000, dt=1e-3, amp=1.):
+    x = np.arange(n) * dt
+    y = amp * np.sin(2 * np.pi * f * x)
+    path.write_text(''.join(f'{a:.17g},{b:.17g}\n' for a, b in zip(x, y)))
+    return str(path)
+
+
+def test_summary_statistics_and_bands():
+    x = np.arange(2000) * 1e-3
+    y = np.stack([np.sin(2 * np.pi * 125. * x), 2 + 0 * x])
+    stats, bands = summary(x, y)
+    assert np.isclose(stats['fs'], 1000.) and stats['samples'] == 2000
+    assert np.allclose(stats['rms'], [2 ** -0.5, 2.], atol=1e-3)
+    assert np.allclose(stats['crest'], [2 ** 0.5, 1.], atol=1e-3)
+    # The sine's power falls in the 125 Hz band, a constant row has none
+    centres = np.array([fc for fc, _ in bands])
+    levels = np.array([level for _, level in bands])
+    k = np.argmin(np.abs(centres - 125.))
+    assert np.isclose(levels[k, 0], 2 ** -0.5, rtol=1e-2)
+    assert np.allclose(levels[:, 1], 0.)
+    assert centres.max() * 2 ** (1 / 6) <= 500.
+
+
+def test_query_filters_and_orders(tmp_path):
+    catalog = Catalog(str(tmp_path / 'catalog.sqlite'))
+    loud = write_csv(tmp_path / 'loud.csv', f=100., amp=3.)
+    quiet = write_csv(tmp_path / 'quiet.csv', f=1000., dt=1e-4, amp=1.)
+    for file in (loud, quiet):
+        catalog.store(file, *index_file(file))
+    assert [row['path'] for row in catalog.query()] == [loud, quiet]
+    # Signals without a band in the range (here above loud's Nyquist) drop out
+    assert [row['path'] for row in catalog.query(fmin=800., fmax=1200.)] == [quiet]
+    assert [row['path'] for row in catalog.query(fmin=80., fmax=120.)] == [loud, quiet]
+    assert [row['path'] for row in catalog.query(min_fs=5000.)] == [quiet]
+    assert [row['path'] for row in catalog.query(name='loud')] == [loud]
+    catalog.close()
+
+
+def test_changed_and_remove_missing(tmp_path):
+    catalog = Catalog(str(tmp_path / 'catalog.sqlite'))
+    file = write_csv(tmp_path / 'a.csv')
+    assert catalog.changed(str(tmp_path)) == [file]
+    catalog.store(file, *index_file(file))
+    assert catalog.changed(str(tmp_path)) == []
+    os.remove(file)
+    assert catalog.remove_missing() == 1
+    assert catalog.query() == []
+    catalog.close()
+
+
+def test_indexer_records_unreadable_files(tmp_path):
+    catalog = Catalog(str(tmp_path / 'catalog.sqlite'))
+    write_csv(tmp_path / 'good.csv')
+    (tmp_path / 'bad.csv').write_text('time,value\n')
+    indexer = Indexer(catalog, workers=1)
+    assert indexer.start(str(tmp_path)) == 2
+    deadline = time.time() + 60
+    while indexer.running and time.time() < deadline:
+        indexer.collect()
+        time.sleep(0.05)
+    indexer.shutdown()
+    assert len(catalog.query()) == 1 and len(indexer.errors) == 1
+    # Both files are known now, so nothing is indexed again until they change
+    assert catalog.changed(str(tmp_path)) == []
+    catalog.close()
@@ -0,0 +1,53 @@
+import numpy as np
+
+from gui.export import file_name
+from models.data import Input, MultiInput
+
+
+def group(names=('a', 'b', 'c')):
+    rng = np.random.default_rng(0)
+    return MultiInput(np.arange(1000) * 1e-3, rng.standard_normal((len(names), 1000)), file='dir/m.csv',
+                      names=list(names))
+
+
+def single(channel):
+    return Input(np.asarray(channel._x), np.array(channel._y), file='', name='single', xlim=channel.xlim,
+                 window=channel.window, sub_mean=channel.sub_mean, filter=channel.filter,
+                 decimation=channel.decimation)
+
+
+def test_channels_share_data():
+    m = group()
+    assert [str(c) for c in m.channels] == ['m.csv: a', 'm.csv: b', 'm.csv: c']
+    assert all(np.shares_memory(c._y, m.data) for c in m.channels)
+
+
+def test_batched_transform_matches_single_channels():
+    m = group()
+    for channel in m.channels:
+        channel.update(xlim=(0.1, 0.8), window='Hanning', sub_mean=True,
+                       filter=('lowpass', 'butter', 4, 100., None, True), decimation=2)
+    spectra = m.transform_all(m.channels)
+    for channel, spectrum in zip(m.channels, spectra):
+        expected = single(channel).transform()
+        assert np.allclose(spectrum, expected)
+        assert np.allclose(channel.transform(), expected)
+
+
+def test_channel_transform_is_per_channel():
+    m = group()
+    first, second = m.channels[:2]
+    first.transform()
+    assert first.cache_bytes and not second.cache_bytes
+    assert np.allclose(first.transform(), single(first).transform())
+
+
+def test_repeated_column_names_are_unique():
+    m = group(('p', 'p', 'q'))
+    assert [str(c) for c in m.channels] == ['m.csv: p [1]', 'm.csv: p [2]', 'm.csv: q']
+
+
+def test_export_file_names():
+    assert file_name('m.csv: a') == 'm.csv_ a'
+    assert file_name('Cross Spectral Density_a_m.csv: b?') == 'Cross Spectral Density_a_m.csv_ b_'
+    assert file_name('a/b\\c. ') == 'a_b_c'
@@ -0,0 +1,41 @@
+import numpy as np
+
+import models.data
+from models.data import Input
+
+
+def test_autocorrelation_matches_direct_sum():
+    y = np.random.default_rng(0).standard_normal(500)
+    direct = np.correlate(y, y, 'full')[y.size - 1:]
+    assert np.allclose(Input.get_autocorrelation(y), direct / direct[0])
+
+
+def test_autocorrelation_peaks_at_period():
+    t = np.arange(4000) * 1e-3
+    r = Input.get_autocorrelation(np.sin(2 * np.pi * 20 * t))
+    lag = np.argmax(r[10:]) + 10
+    assert lag == 50
+
+
+def test_cepstrum_finds_echo_delay():
+    rng = np.random.default_rng(1)
+    y = rng.standard_normal(4096)
+    delay = 120
+    echo = y.copy()
+    echo[delay:] += 0.5 * y[:-delay]
+    cepstrum = Input.get_cepstrum(echo)
+    assert cepstrum.size == echo.size // 2
+    assert np.argmax(cepstrum[10:]) + 10 == delay
+
+
+def test_cache_is_capped_by_bytes(monkeypatch):
+    monkeypatch.setattr(models.data, 'CACHE_BYTES', 2000)
+    signal = Input(np.arange(100) * 1e-3, np.ones(100), file='', name='s')
+    for i in range(3):
+        signal.cached(('block', i), lambda: np.zeros(100))
+    # Oldest entries go first; the newest is kept even when over the cap
+    assert list(signal._cache) == [('block', 1), ('block', 2)] and signal.cache_bytes == 1600
+    signal.cached('large', lambda: {'a': np.zeros(500), 'b': (np.zeros(10), 'text')})
+    assert list(signal._cache) == ['large'] and signal.cache_bytes == 4080
+    signal.clear_cache()
+    assert signal.cache_bytes == 0
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from scipy.signal import csd, coherence, welch
+
+from models.data import Input
+
+
+def pair(n=8192, dt=1e-3, lag=5):
+    rng = np.random.default_rng(0)
+    x = np.arange(n) * dt
+    a = rng.standard_normal(n)
+    b = 0.5 * np.roll(a, lag) + 0.2 * rng.standard_normal(n)
+    return Input(x, a, file='', name='a'), Input(x, b, file='', name='b')
+
+
+def test_cross_spectrum_matches_scipy():
+    a, b = pair()
+    result = Input.get_cross_spectrum(a, b, nperseg=256, overlap=0.5)
+    kwargs = dict(fs=1 / a.dt, window='hann', nperseg=256, noverlap=128)
+    freq, pxy = csd(a.y, b.y, **kwargs)
+    assert np.allclose(result['freq'], freq)
+    assert np.allclose(result['Pxy'], pxy)
+    assert np.allclose(result['Pxx'], welch(a.y, **kwargs)[1])
+    assert np.allclose(result['coherence'], coherence(a.y, b.y, **kwargs)[1])
+
+
+def test_transfer_function_recovers_gain_and_delay():
+    a, b = pair(lag=5)
+    result = Input.get_cross_spectrum(a, b, nperseg=512)
+    freq, h1 = result['freq'], result['H1']
+    band = (freq > 10) & (freq < 200)
+    assert np.allclose(np.abs(h1[band]), 0.5, atol=0.1)
+    # A delay of 5 samples is a linear phase of -2 pi f tau
+    slope = np.polyfit(freq[band], np.unwrap(np.angle(h1[band])), 1)[0]
+    assert np.isclose(slope, -2 * np.pi * 5 * a.dt, rtol=0.05)
+
+
+def test_cross_spectrum_needs_overlap_in_time():
+    a, _ = pair()
+    later = Input(np.arange(100) * 1e-3 + 100., np.ones(100), file='', name='later')
+    with pytest.raises(ValueError):
+        Input.get_cross_spectrum(a, later)
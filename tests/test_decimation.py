@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from scipy.signal import resample_poly
+
+from models.data import Input
+
+
+def test_decimate_matches_resample_poly():
+    y = np.random.default_rng(0).standard_normal(10000)
+    assert np.allclose(Input.decimate(y, 4), resample_poly(y, 1, 4))
+    assert Input.decimate(y.astype(np.float32), 4).dtype == np.float32
+
+
+def test_decimation_rejects_aliases():
+    dt = 1e-4
+    t = np.arange(20000) * dt
+    # 3.9 kHz would fold onto 1.1 kHz after decimating 10 kHz by 4
+    signal = Input(t, np.sin(2 * np.pi * 300 * t) + np.sin(2 * np.pi * 3900 * t), file='', name='s')
+    signal.update(decimation=4)
+    freq, amplitude = signal.amplitude()
+    assert np.isclose(signal.processed_dt, 4 * dt) and freq[-1] <= 1250.
+    assert np.isclose(freq[np.argmax(amplitude)], 300., atol=1.)
+    assert amplitude[np.argmin(np.abs(freq - 1100.))] < 1e-3 * amplitude.max()
+
+
+def test_decimated_spectrum_keeps_band_levels():
+    dt = 1e-4
+    t = np.arange(20000) * dt
+    signal = Input(t, np.sin(2 * np.pi * 500 * t), file='', name='s')
+    full = signal.amplitude()[1].max()
+    signal.update(decimation=5)
+    assert np.isclose(signal.amplitude()[1].max(), full, rtol=0.02)
+
+
+@pytest.mark.parametrize('fmax, q', [(100., 40), (1000., 4), (4000., 1), (0., 1)])
+def test_suggest_decimation(fmax, q):
+    assert Input.suggest_decimation(1e-4, fmax) == q
+    if fmax:
+        assert fmax * 1.25 <= 0.5 / (1e-4 * q)
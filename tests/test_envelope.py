@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from models.data import Input
+
+
+DT = 1e-4
+
+
+def am(n=2 ** 14, fc=2000., fm=37., depth=0.5):
+    t = np.arange(n) * DT
+    return (1 + depth * np.cos(2 * np.pi * fm * t)) * np.sin(2 * np.pi * fc * t)
+
+
+def test_envelope_spectrum_shows_modulation_frequency():
+    freq, amplitude = Input.get_envelope_spectrum(am(), DT, 1500., 2500.)
+    band = freq > 5
+    assert np.isclose(freq[band][np.argmax(amplitude[band])], 37., atol=freq[1])
+    # The mean-removed envelope leaves no DC line
+    assert amplitude[0] < 1e-3 * amplitude.max()
+
+
+@pytest.mark.parametrize('window', [None, 'Hanning', 'Blackman'])
+def test_blocked_envelope_agrees_with_single_transform(window):
+    y = am(n=2 ** 15, fm=40.)
+    full_freq, full = Input.get_envelope_spectrum(y, DT, 1500., 2500., window=window)
+    freq, blocked = Input.get_envelope_spectrum(y, DT, 1500., 2500., window=window, block=2 ** 13)
+    assert freq.size < full_freq.size
+    assert np.isclose(freq[np.argmax(blocked)], 40., atol=freq[1])
+    assert np.isclose(blocked.max(), full.max(), rtol=0.1)
+
+
+def test_envelope_spectrum_is_cached_per_band():
+    signal = Input(np.arange(2 ** 14) * DT, am(), file='', name='am')
+    first = signal.envelope_spectrum(1500., 2500.)
+    assert signal.envelope_spectrum(1500., 2500.) is first
+    assert signal.envelope_spectrum(1000., 3000.) is not first
+
+
+@pytest.mark.parametrize('band', [(-1., 100.), (300., 200.), (1000., 6000.)])
+def test_envelope_band_must_fit_below_nyquist(band):
+    with pytest.raises(ValueError):
+        Input.get_envelope_spectrum(am(), DT, *band)
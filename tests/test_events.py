@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from models.data import Input, UniformAxis
+
+
+FS = 1000.
+
+
+def record(times, seconds=60., seed=0):
+    rng = np.random.default_rng(seed)
+    n = int(seconds * FS)
+    y = 0.1 * rng.standard_normal(n) + 1.
+    k = np.arange(200)
+    for t0 in times:
+        i = int(t0 * FS)
+        y[i:i + k.size] += 3 * np.exp(-k / 40) * np.sin(2 * np.pi * 100 * k / FS)
+    return y
+
+
+def test_events_found_at_bursts():
+    y = record([12.3, 40.])
+    events = Input.get_events(y, 1 / FS, mean=1.)
+    assert np.allclose(events['start'] / FS, [12.3, 40.], atol=0.01)
+    assert np.all(events['stop'] > events['start'])
+    assert np.all(events['ratio'] > 4.)
+
+
+def test_events_independent_of_chunk():
+    y = record([5., 20.5, 33.3])
+    whole = Input.get_events(y, 1 / FS, mean=1.)
+    chunked = Input.get_events(y, 1 / FS, mean=1., chunk=997)
+    for key in whole:
+        assert np.allclose(whole[key], chunked[key])
+
+
+def test_close_events_merged():
+    y = record([10., 10.4])
+    assert Input.get_events(y, 1 / FS, mean=1.)['start'].size == 2
+    merged = Input.get_events(y, 1 / FS, mean=1., gap=1.)
+    assert merged['start'].size == 1
+    assert merged['stop'][0] / FS > 10.4
+
+
+def test_quiet_record_has_no_events():
+    events = Input.get_events(record([]), 1 / FS, mean=1.)
+    assert events['start'].size == 0 and events['ratio'].size == 0
+
+
+def test_windows_validated():
+    with pytest.raises(ValueError):
+        Input.get_events(record([]), 1 / FS, sta=1., lta=0.5)
+    with pytest.raises(ValueError):
+        Input.get_events(np.ones(10), 1 / FS)
+
+
+def test_event_index_built_once_per_signal():
+    signal = Input(UniformAxis(0., 1 / FS, 60000), record([30.]), file='', name='s')
+    events = signal.events(gap=1.)
+    assert len(events) == 1 and abs(events[0][0] - 30.) < 0.01
+    signal.crop(29., 31.)
+    assert signal.events(gap=1.) is events
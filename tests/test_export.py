@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from gui.export import ExportQueue, write_table, render_image
+
+
+def test_write_table(tmp_path):
+    path = tmp_path / 'table.csv'
+    size = write_table(str(path), {'Frequency': np.array([1., 2.]), 'Amplitude': np.array([0.5, 0.25])})
+    assert path.read_text() == 'Frequency,Amplitude\n1.0,0.5\n2.0,0.25\n'
+    assert size == path.stat().st_size
+
+
+@pytest.mark.parametrize('fmt', ['png', 'svg', 'pdf'])
+def test_synchronous_figure_export(tmp_path, fmt):
+    queue = ExportQueue(workers=0)
+    path = tmp_path / f'figure.{fmt}'
+    x = np.linspace(0, 1, 100)
+    future = queue.figure(str(path), x, np.sin(x), fmt=fmt, dpi=50, title='Sine',
+                          markers=([0.5], [np.sin(0.5)], ['peak']))
+    assert future.done() and path.stat().st_size == future.result()
+    assert queue.pending == 0 and 'Exported 1 files' in queue.report()
+
+
+def test_render_image(tmp_path):
+    path = tmp_path / 'image.png'
+    size = render_image(str(path), np.random.default_rng(0).random((3, 50)), extent=(0, 10, 3, 0),
+                        dpi=50, labels=['a', 'b', 'c'])
+    assert size == path.stat().st_size > 0
+
+
+def test_failed_export_is_reported(tmp_path):
+    queue = ExportQueue(workers=0)
+    queue.table(str(tmp_path / 'missing' / 'table.csv'), {'x': [1.]})
+    queue.table(str(tmp_path / 'table.csv'), {'x': [1.]})
+    assert queue.pending == 0
+    assert len(queue.errors) == 1 and queue.errors[0].startswith('table.csv')
+    assert 'Exported 1 files' in queue.report()
+
+
+def test_worker_export(tmp_path):
+    queue = ExportQueue(workers=1)
+    try:
+        for i in range(3):
+            queue.table(str(tmp_path / f'{i}.csv'), {'x': np.arange(10.)})
+        queue.figure(str(tmp_path / 'figure.png'), np.arange(10.), np.arange(10.), dpi=50)
+        queue.wait()
+        assert queue.pending == 0 and not queue.errors
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['0.csv', '1.csv', '2.csv', 'figure.png']
+    finally:
+        queue.shutdown()
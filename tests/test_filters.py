@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from models.data import Input
+from models.filters import overlap_add, design_filter, apply_filter
+
+
+@pytest.mark.parametrize('n, m, block', [(1000, 31, 64), (5000, 101, 512), (300, 7, 2 ** 16)])
+def test_overlap_add_matches_convolve(n, m, block):
+    rng = np.random.default_rng(0)
+    signal, h = rng.standard_normal(n), rng.standard_normal(m)
+    full = np.convolve(signal, h)
+    assert np.allclose(overlap_add(signal, h, block=block), full[:n])
+    delay = (m - 1) // 2
+    assert np.allclose(overlap_add(signal, h, delay, block=block), full[delay:delay + n])
+
+
+def test_overlap_add_rows():
+    rng = np.random.default_rng(1)
+    signals, h = rng.standard_normal((3, 2000)), rng.standard_normal(15)
+    out = overlap_add(signals, h, block=256)
+    for row, signal in zip(out, signals):
+        assert np.allclose(row, np.convolve(signal, h)[:2000])
+
+
+def test_overlap_add_keeps_single_precision():
+    signal = np.ones(100, dtype=np.float32)
+    assert overlap_add(signal, np.ones(5)).dtype == np.float32
+
+
+def test_zero_phase_fir_keeps_tone():
+    dt = 1e-3
+    t = np.arange(4000) * dt
+    tone = np.sin(2 * np.pi * 20 * t)
+    y = apply_filter(tone + np.sin(2 * np.pi * 300 * t), ('lowpass', 'fir', 201, 100., None, True), dt)
+    assert np.abs(y - tone)[300:-300].max() < 1e-2
+
+
+@pytest.mark.parametrize('btype', ['bandpass', 'bandstop'])
+def test_band_filter_needs_two_cutoffs(btype):
+    with pytest.raises(ValueError):
+        design_filter(btype, 'butter', 4, 10., None, 1000.)
+
+
+def test_cutoff_above_nyquist():
+    with pytest.raises(ValueError):
+        design_filter('lowpass', 'fir', 11, 600., None, 1000.)
+
+
+def test_update_keeps_filter_unless_given():
+    spec = ('lowpass', 'butter', 4, 100., None, True)
+    signal = Input(np.arange(1000) * 1e-3, np.ones(1000), file='', name='s', filter=spec)
+    signal.update(window='Hanning', decimation=2)
+    assert signal.filter == spec and signal.decimation == 2
+    signal.update(filter=None)
+    assert signal.filter is None
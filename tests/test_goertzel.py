@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from scipy.fft import fft
+
+from models.data import Input
+
+
+def test_goertzel_matches_fft_bins():
+    rng = np.random.default_rng(0)
+    n, dt = 1000, 1e-3
+    y = rng.standard_normal(n)
+    bins = np.array([0, 3, 50, 499])
+    values, _ = Input.get_goertzel(y, bins / (n * dt), dt)
+    assert np.allclose(values, fft(y)[bins], rtol=1e-9, atol=1e-9)
+
+
+def test_goertzel_chunked_state():
+    rng = np.random.default_rng(1)
+    n, dt = 4096, 1e-3
+    y = rng.standard_normal(n)
+    freqs = [12.5, 100., 333.]
+    whole, _ = Input.get_goertzel(y, freqs, dt)
+    state = None
+    for chunk in np.array_split(y, 7):
+        values, state = Input.get_goertzel(chunk, freqs, dt, state)
+    assert state[1] == n
+    assert np.allclose(values, whole)
+
+
+def test_selective_methods_agree():
+    rng = np.random.default_rng(2)
+    n, dt = 2048, 1e-3
+    y = rng.standard_normal(n)
+    freqs = [10., 250., 400.5]
+    results = [Input.get_selective_amplitude(y, freqs, dt, method)[1] for method in ('goertzel', 'fft')]
+    assert np.allclose(*results)
+
+
+def test_selective_method_cost_model(monkeypatch):
+    # Goertzel costs n * k against n * log2(n) for the full transform
+    monkeypatch.setattr(Input, '_selective_cost', (1., 1.))
+    assert Input.selective_method(2 ** 16, 4) == 'goertzel'
+    assert Input.selective_method(2 ** 16, 32) == 'fft'
+
+
+def test_selective_rejects_missing_or_out_of_band_frequencies():
+    y = np.zeros(1000)
+    with pytest.raises(ValueError):
+        Input.get_selective_amplitude(y, [], 1e-3)
+    with pytest.raises(ValueError):
+        Input.get_selective_amplitude(y, [100., 600.], 1e-3)
+    with pytest.raises(ValueError):
+        Input.get_selective_amplitude(y, [-1.], 1e-3)
+    freq, _ = Input.get_selective_amplitude(y, [500.], 1e-3)
+    assert freq[0] <= 500.
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from tools import load_file, read_table
+
+
+def test_multi_column_csv(tmp_path):
+    path = tmp_path / 'multi.csv'
+    path.write_text('t,a,b\n0,1,2\n1,3,4\n2,5,6\n')
+    x, y, offset, names = load_file(str(path), np.float32)
+    assert x.tolist() == [0., 1., 2.] and names == ['a', 'b']
+    assert y.dtype == np.float32 and y.tolist() == [[1., 3., 5.], [2., 4., 6.]]
+    assert offset == path.stat().st_size
+
+
+def test_single_column_is_one_dimensional(tmp_path):
+    path = tmp_path / 'single.csv'
+    path.write_text('0,1\n1,2\n')
+    x, y, _, names = load_file(str(path))
+    assert y.ndim == 1 and names == ['Y1']
+
+
+def test_xlsx(tmp_path):
+    from openpyxl import Workbook
+    wb = Workbook()
+    for row in (['t', 'p'], [0, 1.5], [1, 2.5]):
+        wb.active.append(row)
+    wb.save(tmp_path / 'book.xlsx')
+    x, y, offset, names = load_file(str(tmp_path / 'book.xlsx'))
+    assert x.tolist() == [0., 1.] and y.tolist() == [1.5, 2.5] and names == ['p'] and offset is None
+
+
+@pytest.mark.parametrize('name, content', [
+    ('legacy.xls', b'\xd0\xcf\x11\xe0'),
+    ('corrupt.xlsx', b'not a zip file'),
+    ('data.txt', b'0,1\n'),
+])
+def test_unreadable_files_raise_value_error(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        read_table(str(path))
+
+
+def test_empty_line_rejected(tmp_path):
+    path = tmp_path / 'gap.csv'
+    path.write_text('0,1\n\n1,2\n')
+    with pytest.raises(IndexError):
+        read_table(str(path))
@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+
+from models.data import Input, InputSignals, MultiInput
+
+
+MB = 2 ** 20
+N = 2 ** 17
+
+
+def signal(name: str) -> Input:
+    # 1 MB of samples on an implicit axis
+    return Input(np.arange(N) * 1e-3, np.random.default_rng(0).random(N), file='', name=name)
+
+
+def resident(store: InputSignals) -> int:
+    # Bytes actually held in memory: data of unspilled signals and groups, plus caches
+    groups = {id(s.group): s.group for s in store.signals if hasattr(s, 'group')}
+    data = sum(g.nbytes for g in groups.values() if not g.spilled)
+    data += sum(s._x.nbytes + s._y.nbytes for s in store.signals if not hasattr(s, 'group') and not s.spilled)
+    return data + sum(s.cache_bytes for s in store.signals)
+
+
+def test_budget_spills_least_recently_used(tmp_path):
+    store = InputSignals(budget=2 * MB, spill_dir=str(tmp_path))
+    signals = [signal(f's{i}') for i in range(4)]
+    for s in signals:
+        store.add(s)
+    assert [s.spilled for s in signals] == [True, True, False, False]
+    assert store.resident_size == resident(store) == 2 * MB
+    assert store.spilled_size == 2 * MB
+    store.select(0)
+    assert not signals[0].spilled and signals[1].spilled
+    assert store.resident_size <= 2 * MB
+
+
+def test_caches_count_towards_budget(tmp_path):
+    store = InputSignals(budget=3 * MB, spill_dir=str(tmp_path))
+    signals = [signal(f's{i}') for i in range(3)]
+    for s in signals:
+        store.add(s)
+    for s in signals:
+        s.transform()
+    assert signals[0].cache_bytes > 0
+    assert store.resident_size == resident(store) > 3 * MB
+    store.enforce()
+    assert store.resident_size == resident(store)
+    assert signals[0].spilled and signals[0].cache_bytes == 0
+    assert store.resident_size <= 3 * MB or [s.spilled for s in signals] == [True, True, False]
+
+
+def test_groups_counted_once_and_spilled_whole(tmp_path):
+    store = InputSignals(budget=3 * MB, spill_dir=str(tmp_path))
+    group = MultiInput(np.arange(N) * 1e-3, np.random.default_rng(1).random((2, N)), file='m.csv', names=['a', 'b'])
+    for channel in group.channels:
+        store.add(channel)
+    assert store.resident_size == resident(store) == 2 * MB
+    single = signal('single')
+    store.add(single)
+    store.add(signal('other'))
+    assert group.spilled and all(c.spilled for c in group.channels)
+    assert not single.spilled
+    assert store.resident_size == resident(store) == 2 * MB
+    assert store.spilled_size == 2 * MB
+
+    channel = store.select(0)
+    assert not group.spilled and np.array_equal(channel._y, group.data[0])
+
+
+def test_delete_removes_spill_files(tmp_path):
+    store = InputSignals(budget=MB, spill_dir=str(tmp_path))
+    for i in range(3):
+        store.add(signal(f's{i}'))
+    assert len(os.listdir(tmp_path)) == 2
+    store.delete(0)
+    store.delete(0)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from models.data import Input, UniformAxis
+
+
+def run_up(fs=5000., seconds=20., f0=5., f1=40., orders=((3., 1.), (7.5, 0.5)), ppr=1):
+    n = int(fs * seconds)
+    t = np.arange(n) / fs
+    phase = 2 * np.pi * np.cumsum(f0 + (f1 - f0) * t / seconds) / fs
+    y = sum(a * np.sin(o * phase) for o, a in orders)
+    tacho = (np.sin(ppr * phase) > 0.99).astype(float)
+    return UniformAxis(0., 1 / fs, n), y, tacho
+
+
+def test_tacho_pulses_chunked():
+    x, _, tacho = run_up()
+    pulses = Input.get_tacho_pulses(x, tacho)
+    assert np.allclose(pulses, Input.get_tacho_pulses(x, tacho, chunk=1000), rtol=0, atol=1e-9)
+    assert np.all(np.diff(pulses) > 0)
+    assert abs(pulses.size - 450) <= 1
+
+
+def test_order_amplitudes():
+    x, y, tacho = run_up()
+    result = Input.get_order_tracking(x, y, Input.get_tacho_pulses(x, tacho), max_order=10)
+    orders, spectrum = result['orders'], result['spectrum']
+    for order, amplitude in ((3., 1.), (7.5, 0.5)):
+        i = np.argmin(np.abs(orders - order))
+        assert orders[i] == order
+        assert spectrum[i] == pytest.approx(amplitude, rel=0.02)
+    assert spectrum[np.abs(orders - 5.) < 0.5].max() < 0.05
+
+
+def test_speed_profile():
+    x, y, tacho = run_up()
+    result = Input.get_order_tracking(x, y, Input.get_tacho_pulses(x, tacho), max_order=10)
+    assert np.all(np.diff(result['time']) > 0)
+    assert np.allclose(result['rpm'], 60 * (5. + 35. * result['time'] / 20.), rtol=0.02)
+    assert np.all(np.diff(result['speed']) > 0)
+    assert result['speed_map'].shape == (result['speed'].size, result['orders'].size)
+
+
+def test_pulses_per_revolution():
+    x, y, tacho = run_up(ppr=4)
+    pulses = Input.get_tacho_pulses(x, tacho)
+    result = Input.get_order_tracking(x, y, pulses, ppr=4, max_order=10)
+    assert result['spectrum'][np.argmin(np.abs(result['orders'] - 3.))] == pytest.approx(1., rel=0.02)
+
+
+def test_too_few_pulses():
+    with pytest.raises(ValueError):
+        Input.get_order_tracking(np.arange(10.), np.zeros(10), np.array([1.]))
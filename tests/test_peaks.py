@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from models.data import Input
+
+
+def spectrum(freqs, amps, n=4096, dt=1e-3, window='Hanning'):
+    t = np.arange(n) * dt
+    y = sum(a * np.sin(2 * np.pi * f * t) for f, a in zip(freqs, amps))
+    y = Input.window_signal(y, window)
+    freq = Input.get_frequency(n, dt)
+    return freq, Input.get_amplitude(y)[:freq.size]
+
+
+def test_peaks_interpolate_between_bins():
+    freq, amplitude = spectrum([50.3, 123.7], [1., 0.5])
+    peaks, amps = Input.get_peaks(freq, amplitude, 2)
+    df = freq[1] - freq[0]
+    assert np.allclose(peaks, [50.3, 123.7], atol=0.05 * df)
+    assert amps[0] > amps[1]
+
+
+def test_peaks_sorted_by_amplitude():
+    freq, amplitude = spectrum([40., 80., 160.], [0.2, 1., 0.5])
+    peaks, amps = Input.get_peaks(freq, amplitude, 3)
+    assert np.allclose(peaks, [80., 160., 40.], atol=0.1)
+    assert np.all(np.diff(amps) < 0)
+
+
+def test_peaks_batched_rows_pad_with_nan():
+    rows = np.array([[0., 1., 0., 2., 0.], [0., 0., 1., 0., 0.]])
+    peaks, amps = Input.get_peaks(np.arange(5.), rows, 2)
+    assert peaks.shape == (2, 2)
+    assert np.isnan(peaks[1, 1]) and np.isnan(amps[1, 1])
+
+
+def test_peaks_reject_short_spectrum():
+    with pytest.raises(ValueError):
+        Input.get_peaks(np.arange(2.), np.ones(2), 1)
+
+
+def test_group_harmonics():
+    fundamental, order = Input.group_harmonics([150., 50., 101., 70., 210.])
+    assert fundamental.tolist() == [1, 1, 1, 3, 3]
+    assert order.tolist() == [3, 1, 2, 1, 3]
+
+
+def test_group_harmonics_tolerance():
+    fundamental, order = Input.group_harmonics([100., 215.], tol=0.02)
+    assert fundamental.tolist() == [0, 1]
+    assert order.tolist() == [1, 1]
@@ -0,0 +1,35 @@
+import numpy as np
+
+from models.data import Input
+
+
+def tone(dtype, n=8192, dt=1e-4):
+    x = np.arange(n) * dt
+    y = np.sin(2 * np.pi * 440. * x) + 0.01 * np.random.default_rng(0).standard_normal(n)
+    return Input(x, y.astype(dtype), file='', name='tone')
+
+
+def test_single_precision_stays_single():
+    signal = tone(np.float32)
+    signal.update(window='Hanning', sub_mean=True, filter=('lowpass', 'butter', 4, 2000., None, True),
+                  decimation=2)
+    assert signal.dtype == np.float32
+    assert signal.processed()[1].dtype == np.float32
+    assert signal.transform().dtype == np.complex64
+
+
+def test_single_precision_spectrum_agrees_with_double():
+    single, double = tone(np.float32), tone(np.float64)
+    for signal in (single, double):
+        signal.update(window='Hanning')
+    a32, a64 = single.amplitude()[1], double.amplitude()[1]
+    assert np.abs(a32 - a64).max() < 1e-4 * a64.max()
+
+
+def test_precision_report():
+    signal = tone(np.float64)
+    signal.update(window='Hanning')
+    report = signal.precision_report()
+    assert report['memory_ratio'] == 0.5
+    assert report['max_error'] < 1e-5 and report['rms_error'] <= report['max_error']
+    assert report['peak_error'] < 1e-5
@@ -0,0 +1,104 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from wsgiref.util import setup_testing_defaults
+
+from server import AnalysisServer
+
+
+class Client:
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    def __call__(self, method, path, body=b'', content_type='application/json', query='', accept='*/*'):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+        environ = {}
+        setup_testing_defaults(environ)
+        environ.update({
+            'REQUEST_METHOD': method, 'PATH_INFO': path, 'QUERY_STRING': query,
+            'CONTENT_TYPE': content_type, 'CONTENT_LENGTH': str(len(body)),
+            'HTTP_ACCEPT': accept, 'wsgi.input': io.BytesIO(body)
+        })
+        status, headers = [], {}
+
+        def start_response(code, header, exc_info=None):
+            status.append(int(code.split()[0]))
+            headers.update(header)
+
+        raw = b''.join(self.app(environ, start_response))
+        if headers.get('Content-Type', '').startswith('application/json'):
+            return status[0], json.loads(raw)
+        return status[0], (raw, headers)
+
+
+@pytest.fixture
+def client():
+    server = AnalysisServer(workers=0)
+    client = Client(server.app)
+    t = np.arange(4096) * 1e-3
+    y = np.sin(2 * np.pi * 50 * t).astype('<f8')
+    status, body = client('POST', '/signals', y.tobytes(), 'application/octet-stream', 'dt=0.001&name=s')
+    assert status == 200 and body['signals'][0]['name'] == 's'
+    yield client
+    server.export_queue.shutdown()
+
+
+def test_analyse_json_and_binary(client):
+    status, body = client('POST', '/signals/s/analyse', {'plot': 'Amplitude'})
+    assert status == 200
+    x, y = np.array(body['x']), np.array(body['y'])
+    assert abs(x[np.argmax(y)] - 50.) < 0.5
+    status, (raw, headers) = client('POST', '/signals/s/analyse', {'plot': 'Amplitude'},
+                                    accept='application/octet-stream')
+    shape = tuple(int(i) for i in headers['X-Shape'].split(','))
+    values = np.frombuffer(raw, dtype=headers['X-Dtype']).reshape(shape)
+    assert np.allclose(values, [x, y])
+
+
+@pytest.mark.parametrize('body', [
+    {'filter': ['lowpass', 'fir', 11, [1], None, True]},
+    {'filter': ['bandpass', 'fir', 11, 10, None, True]},
+    {'filter': ['lowpass', 'fir']},
+    {'xlim': [0.1]},
+    {'xlim': [0.005, 0.00501]},
+    {'window': 'Unknown'},
+    {'decimation': 0},
+    {'plot': 'Unknown'},
+])
+def test_bad_settings_rejected_and_not_kept(client, body):
+    _, before = client('GET', '/signals')
+    status, error = client('POST', '/signals/s/analyse', body)
+    assert status == 400 and error['status'] == 400
+    _, after = client('GET', '/signals')
+    assert after == before
+    assert client('POST', '/signals/s/analyse', {})[0] == 200
+
+
+def test_malformed_body_is_client_error(client):
+    assert client('POST', '/signals/s/analyse', b'{not json')[0] == 400
+    assert client('POST', '/signals/s/analyse', [1, 2])[0] == 400
+
+
+def test_settings_kept_after_success(client):
+    status, _ = client('POST', '/signals/s/analyse', {'window': 'Hanning', 'xlim': [0.5, 2.]})
+    assert status == 200
+    _, body = client('GET', '/signals')
+    assert body['signals'][0]['window'] == 'Hanning'
+    assert body['signals'][0]['xlim'] == [0.5, 2.]
+
+
+def test_unknown_signal_and_delete(client):
+    assert client('POST', '/signals/x/analyse', {})[0] == 404
+    assert client('DELETE', '/signals/s') == (200, {'deleted': 's'})
+    assert client('GET', '/status')[1]['signals'] == 0
+
+
+def test_export_writes_files(client, tmp_path):
+    status, body = client('POST', '/signals/s/export', {'destination': str(tmp_path), 'fmt': 'png', 'dpi': 50})
+    assert status == 200 and not body['errors']
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['s Amplitude.csv', 's Amplitude.png']
@@ -0,0 +1,43 @@
+import numpy as np
+
+from models.data import Input, UniformAxis
+from models.session import save_session, load_session
+
+
+def test_session_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    uniform = Input(np.arange(500) * 1e-3, rng.standard_normal(500), file='a.csv', name='a',
+                    xlim=(0.1, 0.4), window='Hanning', sub_mean=True,
+                    filter=('lowpass', 'fir', 11, 100., None, True), decimation=2)
+    uniform.offset = 123
+    x = np.cumsum(rng.uniform(0.5, 1.5, 300))
+    explicit = Input(x, rng.standard_normal(300).astype(np.float32), file='b.csv', name='b')
+    results = [(uniform, {'X': np.arange(3.), 'Y': np.ones(3)}, {'F': np.arange(2.), 'A': np.zeros(2)})]
+
+    path = str(tmp_path / 'session.fft')
+    assert save_session(path, [uniform, explicit], results) > 0
+    signals, loaded = load_session(path)
+
+    a, b = signals
+    assert isinstance(a._x, UniformAxis) and not isinstance(b._x, UniformAxis)
+    assert np.array_equal(np.asarray(a._x), np.asarray(uniform._x))
+    assert np.array_equal(a._y, uniform._y) and np.array_equal(b._x, x) and np.array_equal(b._y, explicit._y)
+    assert b.dtype == np.float32
+    for key in ('name', 'file', 'xlim', 'window', 'sub_mean', 'filter', 'decimation', 'offset', 'stats'):
+        assert a.state[key] == uniform.state[key]
+    assert np.allclose(a.processed()[1], uniform.processed()[1])
+
+    signal, in_signal, fft_signal = loaded[0]
+    assert signal is a
+    assert np.array_equal(in_signal['Y'], np.ones(3)) and np.array_equal(fft_signal['F'], np.arange(2.))
+
+
+def test_loaded_arrays_are_copy_on_write(tmp_path):
+    signal = Input(np.arange(100) * 0.1, np.arange(100.), file='', name='s')
+    path = str(tmp_path / 'session.fft')
+    save_session(path, [signal])
+    loaded, = load_session(path)[0]
+    assert loaded.spilled
+    loaded._y[0] = -1.
+    again, = load_session(path)[0]
+    assert again._y[0] == 0.
@@ -0,0 +1,84 @@
+import io
+import os
+import time
+import threading
+
+import numpy as np
+import pytest
+
+from models.stream import RingBuffer, TextSource, PipeSource, GeneratorSource, Stream
+
+
+def contents(buffer):
+    out = np.empty(buffer.size)
+    return out[:buffer.copy_to(out)]
+
+
+def test_ring_buffer_fills_then_wraps():
+    buffer = RingBuffer(5)
+    buffer.extend([1, 2, 3])
+    assert contents(buffer).tolist() == [1, 2, 3]
+    buffer.extend([4, 5, 6, 7])
+    assert buffer.count == 5
+    assert contents(buffer).tolist() == [3, 4, 5, 6, 7]
+
+
+def test_ring_buffer_keeps_tail_of_long_chunk():
+    buffer = RingBuffer(4)
+    buffer.extend([1])
+    buffer.extend(np.arange(10))
+    assert contents(buffer).tolist() == [6, 7, 8, 9]
+    buffer.clear()
+    assert buffer.count == 0 and contents(buffer).size == 0
+
+
+def test_ring_buffer_size():
+    with pytest.raises(ValueError):
+        RingBuffer(1)
+    with pytest.raises(ValueError):
+        RingBuffer(4.)
+
+
+def test_text_source_takes_last_column_and_skips_bad_lines():
+    source = TextSource(io.StringIO('1.5\n0.1,2.5\nheader\n\n3e-1\n'), chunk=3)
+    assert source.read().tolist() == [1.5, 2.5]
+    assert source.read().tolist() == [0.3]
+    assert source.read() is None
+
+
+def test_generator_source_is_continuous():
+    source = GeneratorSource(1e6, (1000., ), noise=0., chunk=500)
+    y = np.concatenate([source.read(), source.read()])
+    t = np.arange(1000) / 1e6
+    assert np.allclose(y, np.sin(2 * np.pi * 1000. * t))
+
+
+def test_stream_reads_source_into_buffer():
+    values = np.arange(20.)
+    stream = Stream(TextSource(io.StringIO(''.join(f'{v}\n' for v in values)), chunk=3), 8, 1e-3)
+    stream.start()
+    stream._thread.join(5)
+    assert not stream.running and stream.error is None
+    assert contents(stream.buffer).tolist() == values[-8:].tolist()
+    with pytest.raises(TypeError):
+        Stream(None, 8, 1e-3)
+
+
+def test_pipe_source_missing_path():
+    with pytest.raises(FileNotFoundError):
+        PipeSource('no such pipe')
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason='FIFOs are not available')
+def test_pipe_source_close_releases_waiting_reader(tmp_path):
+    path = str(tmp_path / 'fifo')
+    os.mkfifo(path)
+    source = PipeSource(path)
+    result = []
+    reader = threading.Thread(target=lambda: result.append(source.read()), daemon=True)
+    reader.start()
+    # Let the reader block in open()
+    time.sleep(0.2)
+    source.close()
+    reader.join(5)
+    assert not reader.is_alive() and result == [None]
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from models.data import Input
+
+
+def sine(f=50., n=4000, dt=1e-3, offset=0.):
+    x = np.arange(n) * dt
+    return Input(x, offset + np.sin(2 * np.pi * f * x), file='', name='sine')
+
+
+def test_sweep_rows_cover_every_variant():
+    signal = sine()
+    result = signal.sweep([(0., 1.), (0., 2.)], ['Hanning', 'None'], (False, True))
+    assert len(result['labels']) == 8
+    assert result['amplitude'].shape == (8, result['freq'].size)
+
+
+def test_sweep_amplitude_is_window_corrected():
+    signal = sine(offset=2.)
+    result = signal.sweep([(0., 2.)], ['Hanning', 'Blackman', 'None'], (True, ))
+    freq, amplitude = result['freq'], result['amplitude']
+    peak = np.argmin(np.abs(freq - 50.))
+    assert np.allclose(amplitude[:, peak], 1., atol=0.02)
+    # Mean removed before windowing
+    assert np.all(amplitude[:, 0] < 0.05)
+
+
+def test_sweep_table_peak():
+    result = sine().sweep([(0., 2.)], ['Hanning'], (False, ))
+    table = Input.sweep_table(result['freq'], result['amplitude'])
+    assert np.allclose(table['Peak frequency'], 50., atol=result['freq'][1])
+    assert np.all(table['Peak to median, dB'] > 20)
+
+
+def test_sweep_rejects_short_crop():
+    with pytest.raises(ValueError):
+        sine().sweep([(0., 0.001)], ['Hanning'])
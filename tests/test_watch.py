@@ -0,0 +1,54 @@
+import numpy as np
+
+from models.data import Input, UniformAxis
+from tools import load_file, read_csv
+
+
+def write(path, text, mode='a'):
+    with open(path, mode, newline='') as f:
+        f.write(text)
+
+
+def test_partial_line_left_for_next_read(tmp_path):
+    path = str(tmp_path / 'watch.csv')
+    write(path, '0,1\n1,2\n2,', 'w')
+    x, y, offset = read_csv(path)
+    assert x.tolist() == [0., 1.] and y.tolist() == [1., 2.]
+    assert offset == len(b'0,1\n1,2\n')
+    write(path, '3\n')
+    x, y, offset = read_csv(path, offset)
+    assert x.tolist() == [2.] and y.tolist() == [3.]
+
+
+def test_bad_lines_are_skipped_and_passed(tmp_path):
+    path = str(tmp_path / 'watch.csv')
+    write(path, '0,1\n', 'w')
+    _, _, offset = read_csv(path)
+    write(path, '\n5\nabc,def\n1,2\n')
+    x, y, offset = read_csv(path, offset)
+    assert x.tolist() == [1.] and y.tolist() == [2.]
+    assert offset == len(open(path, 'rb').read())
+    x, _, again = read_csv(path, offset)
+    assert x.size == 0 and again == offset
+
+
+def test_extend_follows_appended_rows(tmp_path):
+    path = str(tmp_path / 'watch.csv')
+    write(path, 'x,y\n' + ''.join(f'{i * 0.1:.1f},{i}\n' for i in range(10)) + '1.0,', 'w')
+    x, y, offset, _ = load_file(path)
+    signal = Input(x, y, file=path, name='watch')
+    signal.offset = offset
+    assert isinstance(signal._x, UniformAxis) and signal._x.size == 10
+
+    write(path, '10\n\n1.1,11\n1.2,12\n')
+    x, y, signal.offset = read_csv(path, signal.offset)
+    assert signal.extend(x, y) == 3
+    assert isinstance(signal._x, UniformAxis) and signal._x.size == 13
+    assert signal._y[-3:].tolist() == [10., 11., 12.]
+    assert signal.stats['peak'] == 12.
+    assert signal.xlim[1] == signal._x[-1]
+
+    # Rows at or before the current end are ignored, a gap keeps an explicit axis
+    assert signal.extend([1.2, 1.3], [0., 13.]) == 1
+    assert signal.extend([2.0], [20.]) == 1
+    assert not isinstance(signal._x, UniformAxis) and signal._x[-1] == 2.
@@ -0,0 +1,38 @@
+import numpy as np
+
+from models.data import Input, MultiInput
+
+
+def sine(f, n=4000, dt=1e-3):
+    x = np.arange(n) * dt
+    return Input(x, np.sin(2 * np.pi * f * x), file='', name=f'{f:g} Hz')
+
+
+def test_waterfall_rows_peak_at_signal_frequency():
+    signals = [sine(f) for f in (50., 120., 300.)]
+    for s in signals:
+        s.update(window='Hanning')
+    freq, image = Input.get_waterfall(signals, bins=1001)
+    assert image.shape == (3, 1001)
+    assert np.isclose(freq[-1], 500., atol=1.)
+    assert np.allclose(freq[np.argmax(image, axis=-1)], [50., 120., 300.], atol=1.)
+
+
+def test_waterfall_grid_stops_at_lowest_nyquist_or_fmax():
+    x = np.arange(2000) * 2e-3
+    slow = Input(x, np.sin(2 * np.pi * 50 * x), file='', name='slow')
+    freq, _ = Input.get_waterfall([sine(50.), slow], bins=64)
+    assert np.isclose(freq[-1], 250., atol=1.)
+    freq, image = Input.get_waterfall([sine(50.), slow], bins=64, fmax=100.)
+    assert np.isclose(freq[-1], 100.) and image.shape == (2, 64)
+
+
+def test_waterfall_batched_channels_match_single_spectra():
+    x = np.arange(4000) * 1e-3
+    y = np.stack([np.sin(2 * np.pi * f * x) for f in (40., 80.)])
+    group = MultiInput(x, y, file='', names=['a', 'b'])
+    freq, image = Input.get_waterfall(group.channels, bins=501)
+    for row, channel in zip(image, group.channels):
+        single = Input(x, np.array(channel._y), file='', name='s')
+        f, amplitude = single.amplitude()
+        assert np.allclose(row, np.interp(freq, f, amplitude))
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from models.data import Input
+
+
+def test_zoom_fft_matches_zero_padded_fft():
+    dt, n, pad = 1e-3, 2000, 100000
+    t = np.arange(n) * dt
+    y = np.sin(2 * np.pi * 50.03 * t) + 0.5 * np.sin(2 * np.pi * 50.41 * t)
+    # 0.01 Hz bins between 49 and 51 Hz sit on the padded FFT grid
+    freq, spectrum = Input.get_zoom_fft(y, dt, 49., 51., 201)
+    padded = np.fft.fft(y, pad)[4900:5101]
+    assert np.allclose(freq, np.arange(4900, 5101) / (pad * dt))
+    assert np.allclose(spectrum, padded)
+
+
+def test_zoom_fft_resolves_close_tones():
+    dt, n = 1e-3, 20000
+    t = np.arange(n) * dt
+    y = np.sin(2 * np.pi * 100.0 * t) + np.sin(2 * np.pi * 100.2 * t)
+    freq, spectrum = Input.get_zoom_fft(y, dt, 99.5, 100.7, 1201)
+    peaks, _ = Input.get_peaks(freq, np.abs(spectrum), 2)
+    assert np.allclose(sorted(peaks), [100.0, 100.2], atol=0.01)
+
+
+@pytest.mark.parametrize('band', [(-1., 10.), (10., 10.), (100., 600.)])
+def test_zoom_fft_band_must_fit_below_nyquist(band):
+    with pytest.raises(ValueError):
+        Input.get_zoom_fft(np.zeros(100), 1e-3, *band, 64)
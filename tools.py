@@ -1,8 +1,9 @@
 import os
-import csv
+import zipfile
 import numpy as np
 
 from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
 
 
 def get_data(file: str):
@@ -11,38 +12,125 @@ def get_data(file: str):
     y = []
     ext = os.path.splitext(os.path.split(file)[1])[1]
 
-    with open(file, 'r', newline='') as f:
-
-        if ext == '.csv':
-            reader = csv.reader(f, delimiter=',')
-            for row in reader:
-                try:
-                    xi, yi = float(row[0]), float(row[1])
-                    x.append(xi)
-                    y.append(yi)
-                except ValueError:
-                    continue
-                except AttributeError:
-                    return AttributeError('Unsupported value type')
-                except IndexError:
-                    return IndexError('Unsupported value type')
-
-        elif ext in ['.xlsx', '.xls']:
-            wb = load_workbook(filename=file)
-            sheet_name = wb.sheetnames[0]
-            rows = list(wb[sheet_name].values)
-
-            for row in rows:
-                try:
-                    xi = float(row[0])
-                    yi = float(row[1])
-                    x.append(xi)
-                    y.append(yi)
-                except ValueError:
-                    continue
-                except AttributeError:
-                    return AttributeError('Unsupported value type')
-                except IndexError:
-                    return IndexError('Unsupported data type')
-    
+    if ext == '.csv':
+        try:
+            x, y, _ = read_csv(file)
+        except AttributeError:
+            return AttributeError('Unsupported value type')
+        except IndexError:
+            return IndexError('Unsupported value type')
+
+    elif ext in ['.xlsx', '.xls']:
+        wb = load_workbook(filename=file)
+        sheet_name = wb.sheetnames[0]
+        rows = list(wb[sheet_name].values)
+
+        for row in rows:
+            try:
+                xi = float(row[0])
+                yi = float(row[1])
+                x.append(xi)
+                y.append(yi)
+            except ValueError:
+                continue
+            except AttributeError:
+                return AttributeError('Unsupported value type')
+            except IndexError:
+                return IndexError('Unsupported data type')
+
     return np.array(x), np.array(y)
+
+
+def load_file(file: str, dtype=np.float64):
+
+    # Worker entry point for parallel imports: errors are raised, not returned.
+    # Returns x, y, tail offset and channel names; y is 2D (channel, sample)
+    # for files with more than one data column. Samples are cast to dtype
+    # here so single precision data cross the process boundary at half size.
+    x, y, names, offset = read_table(file)
+    y = y.astype(dtype, copy=False)
+    return x, y[0] if len(y) == 1 else y, offset, names
+
+
+def read_table(file: str):
+
+    # All numeric columns of a CSV or Excel file: column 0 is the shared x
+    # axis, the others are returned as rows of a (channels, samples) array.
+    # A leading non-numeric row is used for channel names.
+    ext = os.path.splitext(os.path.split(file)[1])[1]
+    offset = None
+
+    if ext == '.csv':
+        with open(file, 'rb') as f:
+            lines = f.read()
+        # An unterminated last line may still be being written; it is left
+        # for the tail reader, which continues from offset
+        offset = lines.rfind(b'\n') + 1
+        rows = [line.strip().split(',') for line in lines[:offset].decode().splitlines()]
+    elif ext == '.xlsx':
+        try:
+            wb = load_workbook(filename=file, read_only=True)
+        except (zipfile.BadZipFile, InvalidFileException, KeyError) as er:
+            raise ValueError(f'Unreadable workbook: {er}')
+        rows = [list(row) for row in wb[wb.sheetnames[0]].values]
+    elif ext == '.xls':
+        raise ValueError('Legacy .xls workbooks are not supported, save the file as .xlsx')
+    else:
+        raise ValueError(f'Unsupported file type {ext}')
+
+    header = None
+    values = []
+    lines = []
+    for i, row in enumerate(rows, 1):
+        if not row or row == ['']:
+            raise IndexError('Empty line')
+        try:
+            values.append([float(v) for v in row])
+            lines.append(i)
+        except (ValueError, TypeError):
+            if not values and header is None:
+                header = [str(v).strip() for v in row]
+            continue
+
+    if not values:
+        raise IndexError('No numerical data')
+    width = len(values[0])
+    if width < 2:
+        raise IndexError('At least two columns are required')
+    ragged = [i for i, v in zip(lines, values) if len(v) != width]
+    if ragged:
+        raise ValueError(f'{len(ragged)} rows do not have {width} columns, '
+                         f'first at line {ragged[0]}')
+    data = np.array(values).T
+    names = header[1:width] if header and len(header) >= width else [f'Y{i}' for i in range(1, width)]
+    return data[0], np.ascontiguousarray(data[1:]), names, offset
+
+
+def read_csv(file: str, offset: int = 0, partial: bool = False):
+
+    # Parses (x, y) rows starting at byte `offset`. The returned offset
+    # points past the last complete line, so a growing file can be read
+    # again from there. An unterminated last line is left for the next
+    # call unless partial is set.
+    x = []
+    y = []
+
+    with open(file, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            complete = line.endswith(b'\n')
+            if not complete and not partial:
+                break
+            if complete:
+                offset += len(line)
+            # Blank, short and non-numeric lines are skipped; the offset still
+            # moves past them so a watch never stalls on one bad line
+            row = line.decode(errors='replace').strip().split(',')
+            try:
+                xi, yi = float(row[0]), float(row[1])
+                x.append(xi)
+                y.append(yi)
+            except (ValueError, IndexError):
+                continue
+
+    return np.array(x), np.array(y), offset